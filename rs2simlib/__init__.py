@@ -1,9 +1,17 @@
-from pathlib import Path as _Path
+import importlib as _importlib
+import typing as _typing
 
-from . import dataio
-from . import drag
-from . import fast
-from . import models
+from ._version import __version__
+from ._version import __version_tuple__
+
+if _typing.TYPE_CHECKING:
+    from . import dataio
+    from . import drag
+    from . import fast
+    from . import jitcache
+    from . import models
+    from . import query
+    from . import sweep
 
 __all__ = [
     "version",
@@ -12,13 +20,27 @@ __all__ = [
     "dataio",
     "drag",
     "fast",
+    "jitcache",
     "models",
+    "query",
+    "sweep",
 ]
 
-_version = {}  # type: ignore[var-annotated]
-with open(f"{_Path(__file__).parent}/_version.py") as _fp:
-    exec(_fp.read(), _version)
+# Submodules are imported on first attribute access, so that
+# e.g. parsing with dataio does not load numba through fast.
+_SUBMODULES = frozenset((
+    "dataio", "drag", "fast", "jitcache", "models", "query", "sweep"))
 
-__version__ = _version["__version__"]
-__version_tuple__ = _version["__version_tuple__"]
 version = __version__
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        # Also sets the module as an attribute of this package,
+        # so this is only called once per submodule.
+        return _importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -1,5 +1,6 @@
 import pickle
 import re
+import sys
 from pathlib import Path
 from typing import Dict
 from typing import List
@@ -25,6 +26,14 @@ INSTANT_DAMAGE_PATTERN = re.compile(
     r"^\s*InstantHitDamage\(([\w_]+)\)\s*=\s*(\d+).*$",
     flags=re.IGNORECASE,
 )
+NUM_PROJECTILES_PATTERN = re.compile(
+    r"^\s*NumProjectiles(?:\(([\w_]+)\))?\s*=\s*(\d+).*$",
+    flags=re.IGNORECASE,
+)
+SPREAD_PATTERN = re.compile(
+    r"^\s*Spread(?:\(([\w_]+)\))?\s*=\s*([\d.]+).*$",
+    flags=re.IGNORECASE,
+)
 PRE_FIRE_PATTERN = re.compile(
     r"^\s*PreFireTraceLength\s*=\s*(\d+).*$",
     flags=re.IGNORECASE,
@@ -89,6 +98,18 @@ def parse_interp_curve(curve: str) -> npt.NDArray[np.float64]:
     return np.array(values, dtype=np.float64)
 
 
+def parse_fire_mode(fire_mode: Optional[str]) -> int:
+    """Index of an array property fire mode, e.g. the
+    `ALTERNATE_FIREMODE` in `Spread(ALTERNATE_FIREMODE)=0.01`.
+    No index means the default fire mode.
+    """
+    if fire_mode is None or fire_mode.lower() == "default_firemode":
+        return 0
+    if fire_mode.lower() == "alternate_firemode":
+        return 1
+    return int(fire_mode)
+
+
 def strip_comments(text: str):
     def replacer(match):
         s = match.group(0)
@@ -121,7 +142,7 @@ def get_non_comment_lines(data: str) -> List[str]:
 def parse_alt_projectile(attribute_dict: dict, index: int) -> str:
     string = attribute_dict.get(f"WeaponProjectiles[{index}]", "class'None'")
     match = re.match(pattern=r"class'(.*)'", string=string)
-    return match.group(1) if match else "None"
+    return sys.intern(match.group(1)) if match else "None"
 
 
 def parse_alt_ammo_loadouts(data: List[Tuple[str, str]],
@@ -147,12 +168,22 @@ def parse_alt_ammo_loadouts(data: List[Tuple[str, str]],
                 0: int(attrib_dict.get("InstantHitDamage[0]", 0)),
                 1: int(attrib_dict.get("InstantHitDamage[1]", 0)),
             }
-            alt_class_name = f"{class_name}_AltAmmoLoadouts"
+            num_projectiles = {
+                i: int(attrib_dict[f"NumProjectiles[{i}]"])
+                for i in (0, 1) if f"NumProjectiles[{i}]" in attrib_dict
+            }
+            spreads = {
+                i: float(attrib_dict[f"Spread[{i}]"])
+                for i in (0, 1) if f"Spread[{i}]" in attrib_dict
+            }
+            alt_class_name = sys.intern(f"{class_name}_AltAmmoLoadouts")
             result[idx] = AltAmmoLoadoutParseResult(
                 class_name=alt_class_name,
                 parent_name=alt_class_name,
                 bullet_names=bullet_names,
                 instant_damages=instant_damages,
+                num_projectiles=num_projectiles,
+                spreads=spreads,
             )
 
     return result
@@ -178,9 +209,11 @@ def handle_weapon_file(
             if not match:
                 return None
 
-            class_name = match.group(1)
+            # Class names are referenced by many other classes,
+            # interning keeps a single copy of each.
+            class_name = sys.intern(match.group(1))
             check_name(class_name, path.stem)
-            parent_name = match.group(2)
+            parent_name = sys.intern(match.group(2))
             if not is_weapon_str(parent_name):
                 if class_name == base_class_name:
                     parent_name = base_class_name
@@ -198,27 +231,33 @@ def handle_weapon_file(
 
         match = WEAPON_BULLET_PATTERN.match(line)
         if match:
-            if match.group(1).lower() == "alternate_firemode":
-                idx = 1
-            else:
-                idx = int(match.group(1))
-            name = match.group(2)
+            idx = parse_fire_mode(match.group(1))
+            name = sys.intern(match.group(2))
             result.bullet_names[idx] = name
             continue
 
         match = INSTANT_DAMAGE_PATTERN.match(line)
         if match:
-            if match.group(1).lower() == "alternate_firemode":
-                idx = 1
-            else:
-                idx = int(match.group(1))
+            idx = parse_fire_mode(match.group(1))
             dmg = int(match.group(2))
             result.instant_damages[idx] = dmg
             continue
 
-        if "altammoloadouts" in line.lower():
-            if "altammoloadouts.empty" not in line.lower():
-                has_alt_ammo = True
+        match = NUM_PROJECTILES_PATTERN.match(line)
+        if match:
+            idx = parse_fire_mode(match.group(1))
+            result.num_projectiles[idx] = int(match.group(2))
+            continue
+
+        match = SPREAD_PATTERN.match(line)
+        if match:
+            idx = parse_fire_mode(match.group(1))
+            result.spreads[idx] = float(match.group(2))
+            continue
+
+        if ("altammoloadouts" in line.lower()
+                and "altammoloadouts.empty" not in line.lower()):
+            has_alt_ammo = True
 
         # if (result.class_name
         #         and result.bullet_names
@@ -256,9 +295,9 @@ def handle_bullet_file(
             if not match:
                 return None
 
-            class_name = match.group(1)
+            class_name = sys.intern(match.group(1))
             check_name(class_name, path.stem)
-            parent_name = match.group(2)
+            parent_name = sys.intern(match.group(2))
             if not is_bullet_str(parent_name):
                 if class_name == base_class_name:
                     parent_name = base_class_name
@@ -1,7 +1,17 @@
+from . import tables
 from .drag import drag_g1
+from .drag import drag_g2
+from .drag import drag_g5
+from .drag import drag_g6
 from .drag import drag_g7
+from .drag import drag_g8
 
 __all__ = [
     "drag_g1",
+    "drag_g2",
+    "drag_g5",
+    "drag_g6",
     "drag_g7",
+    "drag_g8",
+    "tables",
 ]
@@ -1,3 +1,15 @@
+import bisect
+from typing import Sequence
+from typing import Tuple
+
+from rs2simlib.drag import tables
+
+
+def _table_lookup(table: Sequence[Tuple[float, float]], mach: float) -> float:
+    k = bisect.bisect_right(table, mach, key=lambda row: row[0])
+    return table[max(k - 1, 0)][1]
+
+
 def drag_g1(mach: float) -> float:
     if mach >= 1.60:
         if mach >= 2.70:
@@ -356,3 +368,19 @@ def drag_g7(mach: float) -> float:
                     return 0.1197
                 else:  # if mach >= 0.00:
                     return 0.1198
+
+
+def drag_g2(mach: float) -> float:
+    return _table_lookup(tables.G2, mach)
+
+
+def drag_g5(mach: float) -> float:
+    return _table_lookup(tables.G5, mach)
+
+
+def drag_g6(mach: float) -> float:
+    return _table_lookup(tables.G6, mach)
+
+
+def drag_g8(mach: float) -> float:
+    return _table_lookup(tables.G8, mach)
@@ -0,0 +1,524 @@
+"""Mach number and drag coefficient tables of the standard
+drag curves, as (mach, cd) pairs in ascending Mach order.
+
+The drag coefficient of a curve at Mach `m` is the `cd` of the
+largest tabulated Mach number <= `m` (the first `cd` below the
+table). G1 and G7 are identical to the step functions used by
+the game (see drag.py). G2, G5, G6 and G8 are the standard
+tables of the same family.
+"""
+
+# Standard projectile (flat base, 2 caliber nose).
+G1 = (
+    (0.000, 0.2629),
+    (0.050, 0.2558),
+    (0.100, 0.2487),
+    (0.150, 0.2413),
+    (0.200, 0.2344),
+    (0.250, 0.2278),
+    (0.300, 0.2214),
+    (0.350, 0.2155),
+    (0.400, 0.2104),
+    (0.450, 0.2061),
+    (0.500, 0.2032),
+    (0.550, 0.2020),
+    (0.600, 0.2034),
+    (0.700, 0.2165),
+    (0.725, 0.2230),
+    (0.750, 0.2313),
+    (0.775, 0.2417),
+    (0.800, 0.2546),
+    (0.825, 0.2706),
+    (0.850, 0.2901),
+    (0.875, 0.3136),
+    (0.900, 0.3415),
+    (0.925, 0.3734),
+    (0.950, 0.4084),
+    (0.975, 0.4448),
+    (1.000, 0.4805),
+    (1.025, 0.5136),
+    (1.050, 0.5427),
+    (1.075, 0.5677),
+    (1.100, 0.5883),
+    (1.125, 0.6053),
+    (1.150, 0.6191),
+    (1.200, 0.6393),
+    (1.250, 0.6518),
+    (1.300, 0.6589),
+    (1.350, 0.6621),
+    (1.400, 0.6625),
+    (1.450, 0.6607),
+    (1.500, 0.6573),
+    (1.550, 0.6528),
+    (1.600, 0.6474),
+    (1.650, 0.6413),
+    (1.700, 0.6347),
+    (1.750, 0.6280),
+    (1.800, 0.6210),
+    (1.850, 0.6141),
+    (1.900, 0.6072),
+    (1.950, 0.6003),
+    (2.000, 0.5934),
+    (2.050, 0.5867),
+    (2.100, 0.5804),
+    (2.150, 0.5743),
+    (2.200, 0.5685),
+    (2.250, 0.5630),
+    (2.300, 0.5577),
+    (2.350, 0.5527),
+    (2.400, 0.5481),
+    (2.450, 0.5438),
+    (2.500, 0.5397),
+    (2.600, 0.5325),
+    (2.700, 0.5264),
+    (2.800, 0.5211),
+    (2.900, 0.5168),
+    (3.000, 0.5133),
+    (3.100, 0.5105),
+    (3.200, 0.5084),
+    (3.300, 0.5067),
+    (3.400, 0.5054),
+    (3.500, 0.5040),
+    (3.600, 0.5030),
+    (3.700, 0.5022),
+    (3.800, 0.5016),
+    (3.900, 0.5010),
+    (4.000, 0.5006),
+    (4.200, 0.4998),
+    (4.400, 0.4995),
+    (4.600, 0.4992),
+    (4.800, 0.4990),
+    (5.000, 0.4988),
+)
+
+# Aberdeen J projectile (long boat tail).
+G2 = (
+    (0.000, 0.2303),
+    (0.050, 0.2298),
+    (0.100, 0.2287),
+    (0.150, 0.2271),
+    (0.200, 0.2251),
+    (0.250, 0.2227),
+    (0.300, 0.2196),
+    (0.350, 0.2156),
+    (0.400, 0.2107),
+    (0.450, 0.2048),
+    (0.500, 0.1980),
+    (0.550, 0.1905),
+    (0.600, 0.1828),
+    (0.650, 0.1758),
+    (0.700, 0.1702),
+    (0.750, 0.1669),
+    (0.775, 0.1664),
+    (0.800, 0.1667),
+    (0.825, 0.1682),
+    (0.850, 0.1711),
+    (0.875, 0.1761),
+    (0.900, 0.1831),
+    (0.925, 0.2004),
+    (0.950, 0.2589),
+    (0.975, 0.3492),
+    (1.000, 0.3983),
+    (1.025, 0.4075),
+    (1.050, 0.4103),
+    (1.075, 0.4114),
+    (1.100, 0.4106),
+    (1.125, 0.4089),
+    (1.150, 0.4068),
+    (1.200, 0.4021),
+    (1.250, 0.3966),
+    (1.300, 0.3904),
+    (1.350, 0.3843),
+    (1.400, 0.3780),
+    (1.450, 0.3718),
+    (1.500, 0.3657),
+    (1.550, 0.3597),
+    (1.600, 0.3540),
+    (1.650, 0.3484),
+    (1.700, 0.3433),
+    (1.750, 0.3386),
+    (1.800, 0.3341),
+    (1.850, 0.3298),
+    (1.900, 0.3258),
+    (1.950, 0.3221),
+    (2.000, 0.3186),
+    (2.050, 0.3153),
+    (2.100, 0.3122),
+    (2.150, 0.3094),
+    (2.200, 0.3067),
+    (2.250, 0.3042),
+    (2.300, 0.3018),
+    (2.350, 0.2995),
+    (2.400, 0.2973),
+    (2.450, 0.2953),
+    (2.500, 0.2933),
+    (2.550, 0.2914),
+    (2.600, 0.2896),
+    (2.650, 0.2879),
+    (2.700, 0.2863),
+    (2.750, 0.2847),
+    (2.800, 0.2832),
+    (2.850, 0.2818),
+    (2.900, 0.2804),
+    (2.950, 0.2791),
+    (3.000, 0.2778),
+    (3.100, 0.2753),
+    (3.200, 0.2730),
+    (3.300, 0.2707),
+    (3.400, 0.2686),
+    (3.500, 0.2667),
+    (3.600, 0.2649),
+    (3.700, 0.2633),
+    (3.800, 0.2618),
+    (3.900, 0.2603),
+    (4.000, 0.2590),
+    (4.200, 0.2567),
+    (4.400, 0.2547),
+    (4.600, 0.2528),
+    (4.800, 0.2512),
+    (5.000, 0.2497),
+)
+
+# Short boat tail, 6.19 caliber tangent ogive nose.
+G5 = (
+    (0.000, 0.1710),
+    (0.050, 0.1719),
+    (0.100, 0.1727),
+    (0.150, 0.1732),
+    (0.200, 0.1734),
+    (0.250, 0.1730),
+    (0.300, 0.1718),
+    (0.350, 0.1696),
+    (0.400, 0.1668),
+    (0.450, 0.1637),
+    (0.500, 0.1603),
+    (0.550, 0.1566),
+    (0.600, 0.1529),
+    (0.650, 0.1497),
+    (0.700, 0.1473),
+    (0.750, 0.1463),
+    (0.800, 0.1489),
+    (0.850, 0.1583),
+    (0.875, 0.1672),
+    (0.900, 0.1815),
+    (0.925, 0.2051),
+    (0.950, 0.2413),
+    (0.975, 0.2884),
+    (1.000, 0.3379),
+    (1.025, 0.3785),
+    (1.050, 0.4032),
+    (1.075, 0.4147),
+    (1.100, 0.4201),
+    (1.150, 0.4278),
+    (1.200, 0.4338),
+    (1.250, 0.4373),
+    (1.300, 0.4392),
+    (1.350, 0.4403),
+    (1.400, 0.4406),
+    (1.450, 0.4401),
+    (1.500, 0.4386),
+    (1.550, 0.4362),
+    (1.600, 0.4328),
+    (1.650, 0.4286),
+    (1.700, 0.4237),
+    (1.750, 0.4182),
+    (1.800, 0.4121),
+    (1.850, 0.4057),
+    (1.900, 0.3991),
+    (1.950, 0.3926),
+    (2.000, 0.3861),
+    (2.050, 0.3800),
+    (2.100, 0.3741),
+    (2.150, 0.3684),
+    (2.200, 0.3630),
+    (2.250, 0.3578),
+    (2.300, 0.3529),
+    (2.350, 0.3481),
+    (2.400, 0.3435),
+    (2.450, 0.3391),
+    (2.500, 0.3349),
+    (2.600, 0.3269),
+    (2.700, 0.3194),
+    (2.800, 0.3125),
+    (2.900, 0.3060),
+    (3.000, 0.2999),
+    (3.100, 0.2942),
+    (3.200, 0.2889),
+    (3.300, 0.2838),
+    (3.400, 0.2790),
+    (3.500, 0.2745),
+    (3.600, 0.2703),
+    (3.700, 0.2662),
+    (3.800, 0.2624),
+    (3.900, 0.2588),
+    (4.000, 0.2553),
+    (4.200, 0.2488),
+    (4.400, 0.2429),
+    (4.600, 0.2376),
+    (4.800, 0.2326),
+    (5.000, 0.2280),
+)
+
+# Flat base, 6 caliber secant ogive nose.
+G6 = (
+    (0.000, 0.2617),
+    (0.050, 0.2553),
+    (0.100, 0.2491),
+    (0.150, 0.2432),
+    (0.200, 0.2376),
+    (0.250, 0.2324),
+    (0.300, 0.2278),
+    (0.350, 0.2238),
+    (0.400, 0.2205),
+    (0.450, 0.2177),
+    (0.500, 0.2155),
+    (0.550, 0.2138),
+    (0.600, 0.2126),
+    (0.650, 0.2121),
+    (0.700, 0.2122),
+    (0.750, 0.2132),
+    (0.800, 0.2154),
+    (0.850, 0.2194),
+    (0.875, 0.2229),
+    (0.900, 0.2297),
+    (0.925, 0.2449),
+    (0.950, 0.2732),
+    (0.975, 0.3141),
+    (1.000, 0.3597),
+    (1.025, 0.3994),
+    (1.050, 0.4261),
+    (1.075, 0.4402),
+    (1.100, 0.4465),
+    (1.125, 0.4490),
+    (1.150, 0.4497),
+    (1.175, 0.4494),
+    (1.200, 0.4482),
+    (1.225, 0.4464),
+    (1.250, 0.4441),
+    (1.300, 0.4390),
+    (1.350, 0.4336),
+    (1.400, 0.4279),
+    (1.450, 0.4221),
+    (1.500, 0.4162),
+    (1.550, 0.4102),
+    (1.600, 0.4042),
+    (1.650, 0.3981),
+    (1.700, 0.3919),
+    (1.750, 0.3855),
+    (1.800, 0.3788),
+    (1.850, 0.3721),
+    (1.900, 0.3652),
+    (1.950, 0.3583),
+    (2.000, 0.3515),
+    (2.050, 0.3447),
+    (2.100, 0.3381),
+    (2.150, 0.3314),
+    (2.200, 0.3249),
+    (2.250, 0.3185),
+    (2.300, 0.3122),
+    (2.350, 0.3060),
+    (2.400, 0.3000),
+    (2.450, 0.2941),
+    (2.500, 0.2883),
+    (2.600, 0.2772),
+    (2.700, 0.2668),
+    (2.800, 0.2574),
+    (2.900, 0.2487),
+    (3.000, 0.2407),
+    (3.100, 0.2333),
+    (3.200, 0.2265),
+    (3.300, 0.2202),
+    (3.400, 0.2144),
+    (3.500, 0.2089),
+    (3.600, 0.2039),
+    (3.700, 0.1991),
+    (3.800, 0.1947),
+    (3.900, 0.1905),
+    (4.000, 0.1866),
+    (4.200, 0.1794),
+    (4.400, 0.1730),
+    (4.600, 0.1673),
+    (4.800, 0.1621),
+    (5.000, 0.1574),
+)
+
+# Long boat tail, 10 caliber tangent ogive nose.
+G7 = (
+    (0.000, 0.1198),
+    (0.050, 0.1197),
+    (0.100, 0.1196),
+    (0.150, 0.1194),
+    (0.200, 0.1193),
+    (0.250, 0.1194),
+    (0.300, 0.1194),
+    (0.350, 0.1194),
+    (0.400, 0.1193),
+    (0.450, 0.1193),
+    (0.500, 0.1194),
+    (0.550, 0.1193),
+    (0.600, 0.1194),
+    (0.650, 0.1197),
+    (0.700, 0.1202),
+    (0.725, 0.1207),
+    (0.750, 0.1215),
+    (0.775, 0.1226),
+    (0.800, 0.1242),
+    (0.825, 0.1266),
+    (0.850, 0.1306),
+    (0.875, 0.1368),
+    (0.900, 0.1464),
+    (0.925, 0.1660),
+    (0.950, 0.2054),
+    (0.975, 0.2993),
+    (1.000, 0.3803),
+    (1.025, 0.4015),
+    (1.050, 0.4043),
+    (1.075, 0.4034),
+    (1.100, 0.4014),
+    (1.125, 0.3987),
+    (1.150, 0.3955),
+    (1.200, 0.3884),
+    (1.250, 0.3810),
+    (1.300, 0.3732),
+    (1.350, 0.3657),
+    (1.400, 0.3580),
+    (1.500, 0.3440),
+    (1.550, 0.3376),
+    (1.600, 0.3315),
+    (1.650, 0.3260),
+    (1.700, 0.3209),
+    (1.750, 0.3160),
+    (1.800, 0.3117),
+    (1.850, 0.3078),
+    (1.900, 0.3042),
+    (1.950, 0.3010),
+    (2.000, 0.2980),
+    (2.050, 0.2951),
+    (2.100, 0.2922),
+    (2.150, 0.2892),
+    (2.200, 0.2864),
+    (2.250, 0.2835),
+    (2.300, 0.2807),
+    (2.350, 0.2779),
+    (2.400, 0.2752),
+    (2.450, 0.2725),
+    (2.500, 0.2697),
+    (2.550, 0.2670),
+    (2.600, 0.2643),
+    (2.650, 0.2615),
+    (2.700, 0.2588),
+    (2.750, 0.2561),
+    (2.800, 0.2533),
+    (2.850, 0.2506),
+    (2.900, 0.2479),
+    (2.950, 0.2451),
+    (3.000, 0.2424),
+    (3.100, 0.2368),
+    (3.200, 0.2313),
+    (3.300, 0.2258),
+    (3.400, 0.2205),
+    (3.500, 0.2154),
+    (3.600, 0.2106),
+    (3.700, 0.2060),
+    (3.800, 0.2017),
+    (3.900, 0.1975),
+    (4.000, 0.1935),
+    (4.200, 0.1861),
+    (4.400, 0.1793),
+    (4.600, 0.1730),
+    (4.800, 0.1672),
+    (5.000, 0.1618),
+)
+
+# Flat base, 10 caliber secant ogive nose.
+G8 = (
+    (0.000, 0.2105),
+    (0.050, 0.2105),
+    (0.100, 0.2104),
+    (0.150, 0.2104),
+    (0.200, 0.2103),
+    (0.250, 0.2103),
+    (0.300, 0.2103),
+    (0.350, 0.2103),
+    (0.400, 0.2103),
+    (0.450, 0.2102),
+    (0.500, 0.2102),
+    (0.550, 0.2102),
+    (0.600, 0.2102),
+    (0.650, 0.2102),
+    (0.700, 0.2103),
+    (0.750, 0.2103),
+    (0.800, 0.2104),
+    (0.825, 0.2104),
+    (0.850, 0.2105),
+    (0.875, 0.2106),
+    (0.900, 0.2109),
+    (0.925, 0.2183),
+    (0.950, 0.2571),
+    (0.975, 0.3358),
+    (1.000, 0.4068),
+    (1.025, 0.4378),
+    (1.050, 0.4476),
+    (1.075, 0.4493),
+    (1.100, 0.4477),
+    (1.125, 0.4450),
+    (1.150, 0.4419),
+    (1.200, 0.4353),
+    (1.250, 0.4283),
+    (1.300, 0.4208),
+    (1.350, 0.4133),
+    (1.400, 0.4059),
+    (1.450, 0.3986),
+    (1.500, 0.3915),
+    (1.550, 0.3845),
+    (1.600, 0.3777),
+    (1.650, 0.3710),
+    (1.700, 0.3645),
+    (1.750, 0.3581),
+    (1.800, 0.3519),
+    (1.850, 0.3458),
+    (1.900, 0.3400),
+    (1.950, 0.3343),
+    (2.000, 0.3288),
+    (2.050, 0.3234),
+    (2.100, 0.3182),
+    (2.150, 0.3131),
+    (2.200, 0.3081),
+    (2.250, 0.3032),
+    (2.300, 0.2983),
+    (2.350, 0.2937),
+    (2.400, 0.2891),
+    (2.450, 0.2845),
+    (2.500, 0.2802),
+    (2.600, 0.2720),
+    (2.700, 0.2642),
+    (2.800, 0.2569),
+    (2.900, 0.2499),
+    (3.000, 0.2432),
+    (3.100, 0.2368),
+    (3.200, 0.2308),
+    (3.300, 0.2251),
+    (3.400, 0.2197),
+    (3.500, 0.2147),
+    (3.600, 0.2101),
+    (3.700, 0.2058),
+    (3.800, 0.2019),
+    (3.900, 0.1983),
+    (4.000, 0.1950),
+    (4.200, 0.1890),
+    (4.400, 0.1837),
+    (4.600, 0.1791),
+    (4.800, 0.1750),
+    (5.000, 0.1713),
+)
+
+# Drag function id -> table. The ids are the `drag_func`
+# integers used by the simulation functions.
+STANDARD_CURVES = {
+    1: G1,
+    2: G2,
+    5: G5,
+    6: G6,
+    7: G7,
+    8: G8,
+}
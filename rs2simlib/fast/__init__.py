@@ -1,3 +1,6 @@
+# Registers the cache locator of the compiled functions, which numba
+# picks when a function is defined, so before the submodules.
+from rs2simlib.jitcache import locator as _locator  # noqa: F401
 from . import drag
 from . import sim
 
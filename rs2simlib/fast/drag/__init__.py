@@ -1,7 +1,37 @@
+from .fastdrag import drag_coeffs
 from .fastdrag import drag_g1
+from .fastdrag import drag_g1_ufunc
+from .fastdrag import drag_g1_ufunc_parallel
 from .fastdrag import drag_g7
+from .fastdrag import drag_g7_ufunc
+from .fastdrag import drag_g7_ufunc_parallel
+from .tables import DRAG_TABLES_TYPE
+from .tables import DragTables
+from .tables import STANDARD_DRAG_TABLES
+from .tables import build_drag_tables
+from .tables import drag_coeff
+from .tables import drag_coeff_bsearch
+from .tables import drag_tables
+from .tables import is_valid_drag_func
+from .tables import register_drag_curve
+from .tables import unregister_drag_curve
 
 __all__ = [
+    "DRAG_TABLES_TYPE",
+    "DragTables",
+    "STANDARD_DRAG_TABLES",
+    "build_drag_tables",
+    "drag_coeff",
+    "drag_coeff_bsearch",
+    "drag_coeffs",
     "drag_g1",
+    "drag_g1_ufunc",
+    "drag_g1_ufunc_parallel",
     "drag_g7",
+    "drag_g7_ufunc",
+    "drag_g7_ufunc_parallel",
+    "drag_tables",
+    "is_valid_drag_func",
+    "register_drag_curve",
+    "unregister_drag_curve",
 ]
@@ -2,11 +2,16 @@ import typing
 
 import numba as nb
 import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.drag.tables import STANDARD_DRAG_TABLES
+from rs2simlib.fast.drag.tables import drag_coeff
+from rs2simlib.fast.drag.tables import is_valid_drag_func
 
 
 # noinspection PyTypeChecker,DuplicatedCode
 @typing.no_type_check
-@nb.njit(nb.float64(nb.float64), cache=True)
+@nb.njit([nb.float64(nb.float64), nb.float32(nb.float32)], cache=True)
 def drag_g1(mach: np.float64) -> np.float64:
     if mach >= 1.60:
         if mach >= 2.70:
@@ -184,7 +189,7 @@ def drag_g1(mach: np.float64) -> np.float64:
 
 # noinspection PyTypeChecker,DuplicatedCode
 @typing.no_type_check
-@nb.njit(nb.float64(nb.float64), cache=True)
+@nb.njit([nb.float64(nb.float64), nb.float32(nb.float32)], cache=True)
 def drag_g7(mach: np.float64) -> np.float64:
     if mach >= 1.60:
         if mach >= 2.70:
@@ -368,3 +373,65 @@ def drag_g7(mach: np.float64) -> np.float64:
                     return 0.1197
                 else:  # if mach >= 0.00:
                     return 0.1198
+
+
+# NumPy picks the first loop the input can be safely cast to,
+# so float32 must come first to keep float32 inputs float32.
+UFUNC_SIGNATURES = [nb.float32(nb.float32), nb.float64(nb.float64)]
+
+
+# Array versions of the drag functions. These are NumPy ufuncs
+# that support broadcasting, `out=` and the other ufunc arguments.
+# The parallel versions split large arrays across the Numba
+# threads and only pay off for arrays of roughly 100k elements
+# or more.
+@typing.no_type_check
+@nb.vectorize(UFUNC_SIGNATURES, cache=True)
+def drag_g1_ufunc(mach: np.float64) -> np.float64:
+    return drag_g1(mach)
+
+
+@typing.no_type_check
+@nb.vectorize(UFUNC_SIGNATURES, cache=True)
+def drag_g7_ufunc(mach: np.float64) -> np.float64:
+    return drag_g7(mach)
+
+
+@typing.no_type_check
+@nb.vectorize(UFUNC_SIGNATURES, target="parallel", cache=True)
+def drag_g1_ufunc_parallel(mach: np.float64) -> np.float64:
+    return drag_g1(mach)
+
+
+@typing.no_type_check
+@nb.vectorize(UFUNC_SIGNATURES, target="parallel", cache=True)
+def drag_g7_ufunc_parallel(mach: np.float64) -> np.float64:
+    return drag_g7(mach)
+
+
+@typing.no_type_check
+@nb.guvectorize(
+    [
+        (nb.float32[:], nb.int64, nb.float32[:]),
+        (nb.float64[:], nb.int64, nb.float64[:]),
+    ],
+    "(n),()->(n)",
+    target="parallel",
+    cache=True,
+)
+def drag_coeffs(
+        mach: npt.NDArray[np.float64],
+        drag_func: np.int64,
+        out: npt.NDArray[np.float64],
+):
+    """Drag coefficients of a row of Mach numbers with the standard
+    drag curve `drag_func` (see `tables.STANDARD_DRAG_TABLES`),
+    or NaN for unknown ids. Broadcasts over the leading dimensions,
+    e.g. a (shots, steps) Mach array with a (shots,) array of drag
+    functions. Rows are evaluated in parallel.
+    """
+    if not is_valid_drag_func(STANDARD_DRAG_TABLES, drag_func):
+        out[:] = np.nan
+        return
+    for i in range(mach.shape[0]):
+        out[i] = drag_coeff(STANDARD_DRAG_TABLES, drag_func, mach[i])
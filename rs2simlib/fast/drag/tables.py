@@ -0,0 +1,241 @@
+"""Table driven drag curves.
+
+All registered drag curves are packed into the contiguous arrays
+of a `DragTables` tuple, indexed by the integer `drag_func` ids
+used by the simulation functions. The standard curves (G1, G2,
+G5, G6, G7, G8) are always available and custom curves can be
+added with `register_drag_curve`.
+"""
+
+import bisect
+import itertools
+import math
+import typing
+from typing import Dict
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numba as nb
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.drag.tables import STANDARD_CURVES
+
+# Upper limit for the uniform grid size of a single curve.
+# Curves with very fine spacing get a coarser grid, which
+# costs a few extra comparisons per lookup.
+MAX_GRID_CELLS = 1 << 14
+
+Curve = Sequence[Tuple[float, float]]
+
+
+class DragTables(NamedTuple):
+    """Drag curves packed into contiguous arrays.
+
+    Curve `s` (the slot of a drag function id) occupies
+    `mach[offsets[s]:offsets[s + 1]]` and the same range of `cd`.
+    Its uniform lookup grid occupies
+    `grid[grid_offsets[s]:grid_offsets[s + 1]]`, where each cell
+    holds the index of a breakpoint at or below the start of
+    the cell.
+    """
+    slots: npt.NDArray[np.int64]
+    offsets: npt.NDArray[np.int64]
+    mach: npt.NDArray[np.float64]
+    cd: npt.NDArray[np.float64]
+    grid_offsets: npt.NDArray[np.int64]
+    grid_inv_step: npt.NDArray[np.float64]
+    grid: npt.NDArray[np.int64]
+
+
+def _check_curve(curve: Curve):
+    if len(curve) == 0:
+        raise ValueError("drag curve must not be empty")
+    mach = [row[0] for row in curve]
+    if not all(math.isfinite(m) for m in mach):
+        raise ValueError("drag curve Mach numbers must be finite")
+    if any(b <= a for a, b in itertools.pairwise(mach)):
+        raise ValueError("drag curve Mach numbers must be strictly ascending")
+    if not all(math.isfinite(row[1]) for row in curve):
+        raise ValueError("drag coefficients must be finite")
+
+
+def _build_grid(mach: Sequence[float]) -> Tuple[float, list]:
+    """Return the inverse grid step and the grid of a single
+    curve, with indices relative to the start of the curve.
+    """
+    if len(mach) == 1:
+        return 0.0, [0]
+    span = mach[-1] - mach[0]
+    min_spacing = min(b - a for a, b in itertools.pairwise(mach))
+    step = max(min_spacing, span / MAX_GRID_CELLS)
+    num_cells = math.ceil(span / step) + 1
+    # Start half a cell early so rounding in the cell index can
+    # never put a breakpoint below the one the grid points to.
+    grid = [
+        max(bisect.bisect_right(mach, mach[0] + (c - 0.5) * step) - 1, 0)
+        for c in range(num_cells)
+    ]
+    return 1.0 / step, grid
+
+
+def build_drag_tables(curves: Mapping[int, Curve]) -> DragTables:
+    """Pack drag curves, a mapping of drag function id to
+    (mach, cd) pairs, into a `DragTables` tuple.
+    """
+    if any(drag_func < 0 for drag_func in curves):
+        raise ValueError("drag function ids must be non-negative")
+
+    slots = np.full(max(curves) + 1, -1, dtype=np.int64)
+    offsets = [0]
+    mach: list = []
+    cd: list = []
+    grid_offsets = [0]
+    grid_inv_step = []
+    grid: list = []
+    for slot, (drag_func, curve) in enumerate(sorted(curves.items())):
+        _check_curve(curve)
+        slots[drag_func] = slot
+        curve_mach = [float(row[0]) for row in curve]
+        inv_step, curve_grid = _build_grid(curve_mach)
+        grid.extend(offsets[-1] + g for g in curve_grid)
+        mach.extend(curve_mach)
+        cd.extend(float(row[1]) for row in curve)
+        offsets.append(len(mach))
+        grid_offsets.append(len(grid))
+        grid_inv_step.append(inv_step)
+
+    return DragTables(
+        slots=slots,
+        offsets=np.array(offsets, dtype=np.int64),
+        mach=np.array(mach, dtype=np.float64),
+        cd=np.array(cd, dtype=np.float64),
+        grid_offsets=np.array(grid_offsets, dtype=np.int64),
+        grid_inv_step=np.array(grid_inv_step, dtype=np.float64),
+        grid=np.array(grid, dtype=np.int64),
+    )
+
+
+STANDARD_DRAG_TABLES = build_drag_tables(STANDARD_CURVES)
+DRAG_TABLES_TYPE = nb.typeof(STANDARD_DRAG_TABLES)
+
+_custom_curves: Dict[int, Curve] = {}
+_drag_tables: Optional[DragTables] = None
+
+
+def register_drag_curve(
+        drag_func: int,
+        mach: npt.ArrayLike,
+        cd: npt.ArrayLike,
+):
+    """Register a custom drag curve under the id `drag_func`.
+    `mach` must be strictly ascending. The curve is a step function
+    like the standard ones. Registering an id again replaces the
+    curve. The standard curve ids can not be replaced.
+
+    The simulation functions only see custom curves when they are
+    passed `drag_tables=drag_tables()`.
+    """
+    if drag_func in STANDARD_CURVES:
+        raise ValueError(f"can not replace standard drag curve {drag_func}")
+    mach = np.asarray(mach, dtype=np.float64)
+    cd = np.asarray(cd, dtype=np.float64)
+    if mach.ndim != 1 or mach.shape != cd.shape:
+        raise ValueError("mach and cd must be 1D arrays of the same length")
+    curve = tuple(zip(mach.tolist(), cd.tolist()))
+    # Validate before modifying the registry.
+    _check_curve(curve)
+
+    global _drag_tables
+    _custom_curves[int(drag_func)] = curve
+    _drag_tables = None
+
+
+def unregister_drag_curve(drag_func: int):
+    global _drag_tables
+    del _custom_curves[drag_func]
+    _drag_tables = None
+
+
+def drag_tables() -> DragTables:
+    """Return the tables of the standard and all registered
+    custom drag curves.
+    """
+    global _drag_tables
+    if _drag_tables is None:
+        if _custom_curves:
+            _drag_tables = build_drag_tables(
+                {**STANDARD_CURVES, **_custom_curves})
+        else:
+            _drag_tables = STANDARD_DRAG_TABLES
+    return _drag_tables
+
+
+# Inlined so the tables tuple is not copied on every call.
+@nb.njit(cache=True, inline="always")
+def _slot(tables: DragTables, drag_func: np.int64) -> np.int64:
+    if drag_func < 0 or drag_func >= tables.slots.shape[0]:
+        raise ValueError("invalid drag function")
+    slot = tables.slots[drag_func]
+    if slot < 0:
+        raise ValueError("invalid drag function")
+    return slot
+
+
+@nb.njit(cache=True)
+def is_valid_drag_func(tables: DragTables, drag_func: np.int64) -> bool:
+    return (0 <= drag_func < tables.slots.shape[0]
+            and tables.slots[drag_func] >= 0)
+
+
+# No explicit signatures: compiled for both float32 and float64
+# Mach numbers. The tables are float64 either way.
+@typing.no_type_check
+@nb.njit(cache=True, inline="always")
+def drag_coeff(tables: DragTables, drag_func: np.int64, mach: np.float64):
+    """Drag coefficient of curve `drag_func` at `mach`.
+
+    Uses the uniform grid of the curve to find the breakpoint
+    in O(1). The cell index is only a lower bound, so it is
+    advanced over the (at most two) breakpoints in the cell.
+    """
+    slot = _slot(tables, drag_func)
+    lo = tables.offsets[slot]
+    hi = tables.offsets[slot + 1]
+    g0 = tables.grid_offsets[slot]
+    num_cells = tables.grid_offsets[slot + 1] - g0
+    x = (mach - tables.mach[lo]) * tables.grid_inv_step[slot]
+    if not x >= 0.0:
+        # Below the table (or NaN).
+        return type(mach)(tables.cd[lo])
+    if x >= num_cells:
+        return type(mach)(tables.cd[hi - 1])
+    k = tables.grid[g0 + np.int64(x)]
+    while k + 1 < hi and mach >= tables.mach[k + 1]:
+        k += 1
+    return type(mach)(tables.cd[k])
+
+
+@typing.no_type_check
+@nb.njit(cache=True, inline="always")
+def drag_coeff_bsearch(
+        tables: DragTables,
+        drag_func: np.int64,
+        mach: np.float64,
+):
+    """Same as `drag_coeff`, but finds the breakpoint with a
+    branch-free binary search. The loop runs ceil(log2(n))
+    times and the comparison result is used arithmetically
+    instead of branching on it.
+    """
+    slot = _slot(tables, drag_func)
+    base = tables.offsets[slot]
+    n = tables.offsets[slot + 1] - base
+    while n > 1:
+        half = n // 2
+        base += half * (tables.mach[base + half] <= mach)
+        n -= half
+    return type(mach)(tables.cd[base])
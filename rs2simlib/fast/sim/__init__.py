@@ -1,13 +1,61 @@
+from .adaptive import simulate_adaptive
+from .dispersion import DispersionResult
+from .dispersion import simulate_dispersion
+from .dispersion import simulate_weapon_dispersion
+from .fastsim import Channel
+from .fastsim import StopReason
 from .fastsim import calc_damage
 from .fastsim import calc_energy_transfer
 from .fastsim import calc_power_left
+from .fastsim import channel_rows
+from .fastsim import get_num_threads
+from .fastsim import max_num_threads
+from .fastsim import set_num_threads
 from .fastsim import simulate
+from .fastsim import simulate_batch
+from .fastsim import simulate_batch_into
+from .fastsim import simulate_checkpoints
+from .fastsim import simulate_into
+from .fastsim import simulate_until
 from .fastsim import trigger_jit
+from .instrument import SimCounters
+from .instrument import simulate_instrumented
+from .rangetable import RangeTable
+from .rangetable import RangeTableBuilder
+from .result import SimResult
+from .simcache import SimCache
+from .stream import simulate_stream
+from .zeroing import solve_aim_angles
+from .zeroing import solve_bullet_aim_angles
 
 __all__ = [
+    "Channel",
+    "DispersionResult",
+    "RangeTable",
+    "RangeTableBuilder",
+    "SimCache",
+    "SimCounters",
+    "SimResult",
+    "StopReason",
     "calc_damage",
     "calc_energy_transfer",
     "calc_power_left",
+    "channel_rows",
+    "get_num_threads",
+    "max_num_threads",
+    "set_num_threads",
     "simulate",
+    "simulate_adaptive",
+    "simulate_batch",
+    "simulate_batch_into",
+    "simulate_checkpoints",
+    "simulate_dispersion",
+    "simulate_instrumented",
+    "simulate_into",
+    "simulate_stream",
+    "simulate_until",
+    "simulate_weapon_dispersion",
+    "solve_aim_angles",
+    "solve_bullet_aim_angles",
     "trigger_jit",
 ]
@@ -0,0 +1,367 @@
+import math
+
+import numba as nb
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.drag import drag_coeff
+from rs2simlib.fast.sim.fastsim import GRAVITY
+from rs2simlib.fast.sim.fastsim import NUM_CHANNELS
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR_INVERSE
+from rs2simlib.fast.sim.fastsim import X1
+from rs2simlib.fast.sim.fastsim import X2
+from rs2simlib.fast.sim.fastsim import _resolve_drag_tables
+from rs2simlib.fast.sim.fastsim import calc_damage
+from rs2simlib.fast.sim.fastsim import calc_energy_transfer
+from rs2simlib.fast.sim.fastsim import calc_power_left
+
+# State vector layout (all in UU and seconds).
+LOC_X = 0
+LOC_Y = 1
+VEL_X = 2
+VEL_Y = 3
+DIST = 4
+NUM_STATES = 5
+
+# Dormand-Prince 5(4) coefficients.
+A21 = 1 / 5
+A31, A32 = 3 / 40, 9 / 40
+A41, A42, A43 = 44 / 45, -56 / 15, 32 / 9
+A51, A52, A53, A54 = (
+    19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729)
+A61, A62, A63, A64, A65 = (
+    9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656)
+B1, B3, B4, B5, B6 = (
+    35 / 384, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84)
+# Difference between the 5th and 4th order weights.
+E1, E3, E4, E5, E6, E7 = (
+    71 / 57600, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+# Dense output (Shampine 1986).
+D1, D3, D4, D5, D6, D7 = (
+    -12715105075 / 11282082432, 87487479700 / 32700410799,
+    -10690763975 / 1880347072, 701980252875 / 199316789632,
+    -1453857185 / 822651844, 69997945 / 29380423)
+NUM_DENSE = 5
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 5.0
+MAX_STEPS = 1_000_000
+# Number of bisection iterations used to locate drag
+# discontinuities and distance samples in the dense output.
+NUM_BISECT = 60
+
+
+@nb.njit(nb.float64(nb.float64, nb.float64), cache=True)
+def _mach(vel_x: np.float64, vel_y: np.float64) -> np.float64:
+    return math.sqrt(vel_x * vel_x + vel_y * vel_y) * SCALE_FACTOR_INVERSE * X1
+
+
+@nb.njit(
+    nb.void(nb.float64[:], nb.float64, nb.float64[:]),
+    cache=True,
+    error_model="numpy",
+)
+def _deriv(
+        y: npt.NDArray[np.float64],
+        drag_scale: np.float64,
+        dydt: npt.NDArray[np.float64],
+):
+    """Time derivative of the state `y` with the drag coefficient
+    (times inverse ballistic coefficient) `drag_scale` held constant.
+    """
+    vx = y[VEL_X]
+    vy = y[VEL_Y]
+    v_size = math.sqrt(vx * vx + vy * vy)
+    v = v_size * SCALE_FACTOR_INVERSE
+    drag = X2 * drag_scale * (v * v) * SCALE_FACTOR
+    dydt[LOC_X] = vx
+    dydt[LOC_Y] = vy
+    dydt[VEL_X] = -drag * (vx / v_size)
+    dydt[VEL_Y] = -drag * (vy / v_size) - GRAVITY
+    dydt[DIST] = v_size
+
+
+@nb.njit(cache=True, error_model="numpy")
+def _dopri5_step(y0, f0, h, drag_scale, k2, k3, k4, k5, k6, tmp, y1, f1):
+    """Take one Dormand-Prince step of size `h` from `y0` (with
+    derivative `f0`), writing the 5th order solution to `y1`
+    and its derivative to `f1`. Returns the error estimate
+    components in `tmp`.
+    """
+    for j in range(NUM_STATES):
+        tmp[j] = y0[j] + h * (A21 * f0[j])
+    _deriv(tmp, drag_scale, k2)
+    for j in range(NUM_STATES):
+        tmp[j] = y0[j] + h * (A31 * f0[j] + A32 * k2[j])
+    _deriv(tmp, drag_scale, k3)
+    for j in range(NUM_STATES):
+        tmp[j] = y0[j] + h * (A41 * f0[j] + A42 * k2[j] + A43 * k3[j])
+    _deriv(tmp, drag_scale, k4)
+    for j in range(NUM_STATES):
+        tmp[j] = y0[j] + h * (
+                A51 * f0[j] + A52 * k2[j] + A53 * k3[j] + A54 * k4[j])
+    _deriv(tmp, drag_scale, k5)
+    for j in range(NUM_STATES):
+        tmp[j] = y0[j] + h * (
+                A61 * f0[j] + A62 * k2[j] + A63 * k3[j]
+                + A64 * k4[j] + A65 * k5[j])
+    _deriv(tmp, drag_scale, k6)
+    for j in range(NUM_STATES):
+        y1[j] = y0[j] + h * (
+                B1 * f0[j] + B3 * k3[j] + B4 * k4[j]
+                + B5 * k5[j] + B6 * k6[j])
+    _deriv(y1, drag_scale, f1)
+    for j in range(NUM_STATES):
+        tmp[j] = h * (
+                E1 * f0[j] + E3 * k3[j] + E4 * k4[j]
+                + E5 * k5[j] + E6 * k6[j] + E7 * f1[j])
+
+
+@nb.njit(cache=True)
+def _prepare_dense(y0, f0, k3, k4, k5, k6, y1, f1, h, rc):
+    """Compute the dense output coefficients `rc` of a step."""
+    for j in range(NUM_STATES):
+        y_diff = y1[j] - y0[j]
+        b_spl = h * f0[j] - y_diff
+        rc[0, j] = y0[j]
+        rc[1, j] = y_diff
+        rc[2, j] = b_spl
+        rc[3, j] = y_diff - h * f1[j] - b_spl
+        rc[4, j] = h * (
+                D1 * f0[j] + D3 * k3[j] + D4 * k4[j]
+                + D5 * k5[j] + D6 * k6[j] + D7 * f1[j])
+
+
+@nb.njit(cache=True)
+def _dense(rc, theta, j):
+    """4th order continuous extension of state component `j`
+    at `theta` in [0, 1] of a step.
+    """
+    theta1 = 1.0 - theta
+    return rc[0, j] + theta * (
+            rc[1, j] + theta1 * (
+                rc[2, j] + theta * (rc[3, j] + theta1 * rc[4, j])))
+
+
+@nb.njit(cache=True, error_model="numpy")
+def _write_sample(
+        out, col, rc, theta, t,
+        muzzle_velocity, falloff_x, falloff_y, bullet_damage):
+    vx = _dense(rc, theta, VEL_X)
+    vy = _dense(rc, theta, VEL_Y)
+    v_size_sq = vx * vx + vy * vy
+    energy_transfer = calc_energy_transfer(
+        vel_size_sq=v_size_sq,
+        falloff_x=falloff_x,
+        falloff_y=falloff_y,
+    )
+    power_left = calc_power_left(
+        vel_size_sq=v_size_sq,
+        muzzle_velocity=muzzle_velocity,
+    )
+    out[0, col] = _dense(rc, theta, LOC_X) / 50
+    out[1, col] = _dense(rc, theta, LOC_Y) / 50
+    out[2, col] = calc_damage(
+        power_left=power_left,
+        energy_transfer=energy_transfer,
+        base_damage=bullet_damage,
+    )
+    out[3, col] = _dense(rc, theta, DIST) / 50
+    out[4, col] = t
+    out[5, col] = math.sqrt(v_size_sq) / 50
+    out[6, col] = energy_transfer
+    out[7, col] = power_left
+
+
+@nb.njit(cache=True, error_model="numpy")
+def _emit_samples(
+        out, next_sample, samples, sample_scale, by_distance,
+        rc, h, t0, t1, dist1,
+        muzzle_velocity, falloff_x, falloff_y, bullet_damage):
+    """Write all samples that fall inside the step [t0, t1].
+    Returns the index of the next pending sample.
+    """
+    n_samples = samples.shape[0]
+    while next_sample < n_samples:
+        target = samples[next_sample] * sample_scale
+        if by_distance:
+            if target > dist1:
+                break
+            # Distance is monotonic within the step.
+            lo = 0.0
+            hi = 1.0
+            for _ in range(NUM_BISECT):
+                mid = 0.5 * (lo + hi)
+                if _dense(rc, mid, DIST) < target:
+                    lo = mid
+                else:
+                    hi = mid
+            theta = hi
+        else:
+            if target > t1:
+                break
+            theta = (target - t0) / h
+        _write_sample(
+            out, next_sample, rc, theta, t0 + theta * h,
+            muzzle_velocity, falloff_x, falloff_y, bullet_damage)
+        next_sample += 1
+    return next_sample
+
+
+# No explicit signature, see fastsim.simulate_until.
+@nb.njit(cache=True, error_model="numpy")
+def simulate_adaptive(
+        samples: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        aim_dir_x: np.float64,
+        aim_dir_y: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        by_distance=False,
+        rtol=np.float64(1e-8),
+        atol=np.float64(1e-6),
+        drag_tables=None,
+) -> tuple[npt.NDArray[np.float64], int]:
+    """Simulate a shot with an adaptive step Dormand-Prince 5(4)
+    integrator and sample the solution with dense output.
+
+    `samples` are ascending flight times [s], or distances [m]
+    traveled if `by_distance` is True. The result has the same
+    8 rows as `simulate`, with one column per sample. Samples
+    that are not reached within `sim_time` are NaN.
+
+    The drag coefficient is a step function of Mach. It is held
+    constant during each step, and a step that crosses into a
+    different drag region is shortened to end at the crossing,
+    so the integrator never steps over a discontinuity.
+
+    `rtol` and `atol` are the error tolerances of the state
+    (locations and distance in UU, velocities in UU/s).
+
+    Returns the samples and the number of integration steps taken.
+    """
+    tables = _resolve_drag_tables(drag_tables)
+    n_samples = samples.shape[0]
+    for j in range(1, n_samples):
+        if samples[j] < samples[j - 1]:
+            raise ValueError("samples must be in ascending order")
+    # Distance is tracked in UU.
+    sample_scale = 50.0 if by_distance else 1.0
+
+    out = np.full((NUM_CHANNELS, n_samples), np.nan, dtype=np.float64)
+
+    bc_inverse = 1.0 / ballistic_coeff
+    aim_size = math.sqrt(aim_dir_x * aim_dir_x + aim_dir_y * aim_dir_y)
+
+    y0 = np.empty(NUM_STATES, dtype=np.float64)
+    y0[LOC_X] = start_loc_x
+    y0[LOC_Y] = start_loc_y
+    y0[VEL_X] = aim_dir_x / aim_size * muzzle_velocity
+    y0[VEL_Y] = aim_dir_y / aim_size * muzzle_velocity
+    y0[DIST] = 0.0
+
+    f0 = np.empty(NUM_STATES, dtype=np.float64)
+    y1 = np.empty(NUM_STATES, dtype=np.float64)
+    f1 = np.empty(NUM_STATES, dtype=np.float64)
+    k2 = np.empty(NUM_STATES, dtype=np.float64)
+    k3 = np.empty(NUM_STATES, dtype=np.float64)
+    k4 = np.empty(NUM_STATES, dtype=np.float64)
+    k5 = np.empty(NUM_STATES, dtype=np.float64)
+    k6 = np.empty(NUM_STATES, dtype=np.float64)
+    err = np.empty(NUM_STATES, dtype=np.float64)
+    rc = np.zeros((NUM_DENSE, NUM_STATES), dtype=np.float64)
+
+    cd = drag_coeff(tables, drag_func, _mach(y0[VEL_X], y0[VEL_Y]))
+    _deriv(y0, cd * bc_inverse, f0)
+
+    t = 0.0
+    h = min(1e-3, sim_time)
+    next_sample = 0
+    # Samples at the very start.
+    rc[0] = y0
+    while next_sample < n_samples and samples[next_sample] * sample_scale <= (
+            y0[DIST] if by_distance else t):
+        _write_sample(
+            out, next_sample, rc, 0.0, t,
+            muzzle_velocity, falloff_x, falloff_y, bullet_damage)
+        next_sample += 1
+
+    h_min = 1e-12 * max(sim_time, 1.0)
+    steps = 0
+    while t < sim_time and next_sample < n_samples:
+        if steps >= MAX_STEPS:
+            raise RuntimeError("maximum number of steps exceeded")
+        h = min(h, sim_time - t)
+
+        _dopri5_step(y0, f0, h, cd * bc_inverse,
+                     k2, k3, k4, k5, k6, err, y1, f1)
+        err_norm = 0.0
+        for j in range(NUM_STATES):
+            sc = atol + rtol * max(abs(y0[j]), abs(y1[j]))
+            err_norm += (err[j] / sc) ** 2
+        err_norm = math.sqrt(err_norm / NUM_STATES)
+
+        if err_norm > 1.0 and h > h_min:
+            h *= max(MIN_FACTOR, SAFETY * err_norm ** -0.2)
+            continue
+
+        _prepare_dense(y0, f0, k3, k4, k5, k6, y1, f1, h, rc)
+        cd_end = drag_coeff(tables, drag_func, _mach(y1[VEL_X], y1[VEL_Y]))
+        if cd_end != cd and h > h_min:
+            # Crossed into another drag region. Locate the crossing
+            # in the dense output and redo the step up to just past it.
+            lo = 0.0
+            hi = 1.0
+            for _ in range(NUM_BISECT):
+                mid = 0.5 * (lo + hi)
+                mach = _mach(
+                    _dense(rc, mid, VEL_X),
+                    _dense(rc, mid, VEL_Y),
+                )
+                if drag_coeff(tables, drag_func, mach) == cd:
+                    lo = mid
+                else:
+                    hi = mid
+            if hi < 1.0:
+                h_full = h
+                h = max(hi * h, h_min)
+                _dopri5_step(y0, f0, h, cd * bc_inverse,
+                             k2, k3, k4, k5, k6, err, y1, f1)
+                _prepare_dense(y0, f0, k3, k4, k5, k6, y1, f1, h, rc)
+                steps += 1
+                t_end = t + h
+                next_sample = _emit_samples(
+                    out, next_sample, samples, sample_scale, by_distance,
+                    rc, h, t, t_end, y1[DIST],
+                    muzzle_velocity, falloff_x, falloff_y, bullet_damage)
+                t = t_end
+                y0[:] = y1
+                cd = drag_coeff(tables, drag_func, _mach(y0[VEL_X], y0[VEL_Y]))
+                _deriv(y0, cd * bc_inverse, f0)
+                h = h_full
+                continue
+
+        steps += 1
+        t_end = t + h
+        next_sample = _emit_samples(
+            out, next_sample, samples, sample_scale, by_distance,
+            rc, h, t, t_end, y1[DIST],
+            muzzle_velocity, falloff_x, falloff_y, bullet_damage)
+        t = t_end
+        y0[:] = y1
+        if cd_end != cd:
+            cd = cd_end
+            _deriv(y0, cd * bc_inverse, f0)
+        else:
+            f0[:] = f1
+        h *= min(MAX_FACTOR, SAFETY * max(err_norm, 1e-10) ** -0.2)
+
+    return out, steps
@@ -0,0 +1,16 @@
+"""Root directory of the on-disk caches of simulation results."""
+
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "RS2SIMLIB_CACHE_DIR"
+
+
+def cache_root() -> Path:
+    """`$RS2SIMLIB_CACHE_DIR`, or `~/.cache/rs2simlib`
+    if it is not set.
+    """
+    base = os.environ.get(CACHE_DIR_ENV)
+    if base is None:
+        return Path.home() / ".cache" / "rs2simlib"
+    return Path(base)
@@ -0,0 +1,496 @@
+import math
+from typing import NamedTuple
+
+import numba as nb
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.drag import DRAG_TABLES_TYPE
+from rs2simlib.fast.drag import DragTables
+from rs2simlib.fast.drag import is_valid_drag_func
+from rs2simlib.fast.sim.fastsim import GRAVITY
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR_INVERSE
+from rs2simlib.fast.sim.fastsim import X1
+from rs2simlib.fast.sim.fastsim import X2
+from rs2simlib.fast.sim.fastsim import _check_integrator
+from rs2simlib.fast.sim.fastsim import _resolve_drag_tables
+from rs2simlib.fast.sim.fastsim import _step
+from rs2simlib.fast.sim.fastsim import calc_damage
+from rs2simlib.fast.sim.fastsim import calc_energy_transfer
+from rs2simlib.fast.sim.fastsim import calc_power_left
+from rs2simlib.models import Integrator
+from rs2simlib.models import Weapon
+from rs2simlib.models import interp_dmg_falloff
+
+# Default number of random number streams. Each stream fires a
+# fixed share of the shots, so the results only depend on the
+# seed and the number of streams, not on the number of threads.
+NUM_STREAMS = 256
+
+# SplitMix64 constants.
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MUL1 = np.uint64(0xBF58476D1CE4E5B9)
+_MUL2 = np.uint64(0x94D049BB133111EB)
+_S30 = np.uint64(30)
+_S27 = np.uint64(27)
+_S31 = np.uint64(31)
+_S11 = np.uint64(11)
+_INV_2_53 = 1.0 / (1 << 53)
+
+
+class DispersionResult(NamedTuple):
+    """Aggregated Monte Carlo dispersion results, one entry
+    (or row) per range.
+    """
+    ranges: npt.NDArray[np.float64]
+    # Probability of a single projectile hitting the target.
+    hit_probability: npt.NDArray[np.float64]
+    # Probability of at least one projectile of a shot hitting.
+    shot_hit_probability: npt.NDArray[np.float64]
+    # Mean damage of a shot, all of its projectiles combined.
+    mean_damage: npt.NDArray[np.float64]
+    # Histogram of the damage of a shot, damage_counts[k] has
+    # the counts of range k in the bins given by damage_edges.
+    damage_edges: npt.NDArray[np.float64]
+    damage_counts: npt.NDArray[np.int64]
+
+
+@nb.njit(nb.uint64(nb.uint64), cache=True)
+def _mix(z: np.uint64) -> np.uint64:
+    z = (z ^ (z >> _S30)) * _MUL1
+    z = (z ^ (z >> _S27)) * _MUL2
+    return z ^ (z >> _S31)
+
+
+@nb.njit(cache=True, inline="always")
+def _uniform(state):
+    """SplitMix64 step. Returns (uniform [0, 1), next state)."""
+    state = state + _GAMMA
+    return np.float64(_mix(state) >> _S11) * _INV_2_53, state
+
+
+@nb.njit(cache=True, error_model="numpy", inline="always")
+def _trace(
+        elevation,
+        azimuth,
+        ranges,
+        sim_time,
+        time_step,
+        drag_func,
+        bc_inverse,
+        muzzle_velocity,
+        integrator,
+        drag_tables,
+        out_y,
+        out_v_sq,
+):
+    """Fire a projectile at `elevation` and `azimuth` [rad] and
+    write its height [UU] and speed squared [UU^2/s^2] where it
+    crosses each downrange distance in `ranges` [UU] to `out_y`
+    and `out_v_sq`. Drag acts along the velocity, so the shot
+    stays in the vertical plane of its azimuth and is simulated
+    in 2D. The simulation stops after the last range. Ranges that
+    are not reached within `sim_time` are NaN.
+    """
+    n = ranges.shape[0]
+    cos_azimuth = math.cos(azimuth)
+    loc_x = 0.0
+    loc_y = 0.0
+    vel_x = math.cos(elevation) * muzzle_velocity
+    vel_y = math.sin(elevation) * muzzle_velocity
+    d_accumulated = 0.0
+    flight_time = 0.0
+    k = 0
+    while flight_time < sim_time and k < n:
+        flight_time += time_step
+        prev_x = loc_x
+        prev_y = loc_y
+        prev_v_sq = vel_x * vel_x + vel_y * vel_y
+        loc_x, loc_y, vel_x, vel_y, d_accumulated = _step(
+            integrator, loc_x, loc_y, vel_x, vel_y, d_accumulated,
+            time_step, drag_tables, drag_func, bc_inverse,
+            SCALE_FACTOR_INVERSE, SCALE_FACTOR, X1, X2, GRAVITY)
+        v_sq = vel_x * vel_x + vel_y * vel_y
+        # Horizontal distance in the plane of the shot.
+        span = loc_x - prev_x
+        while k < n and loc_x >= ranges[k] / cos_azimuth:
+            # Distance can stand still only for a vertical shot.
+            frac = ((ranges[k] / cos_azimuth - prev_x) / span
+                    if span > 0 else 1.0)
+            out_y[k] = prev_y + frac * (loc_y - prev_y)
+            out_v_sq[k] = prev_v_sq + frac * (v_sq - prev_v_sq)
+            k += 1
+    for j in range(k, n):
+        out_y[j] = np.nan
+        out_v_sq[j] = np.nan
+
+
+@nb.njit(
+    nb.void(
+        nb.uint64,
+        nb.int64,
+        nb.int64,
+        nb.float64,
+        nb.float64,
+        nb.float64[:],
+        nb.float64[:],
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.int64,
+        nb.float64,
+        nb.float64,
+        nb.float64[:],
+        nb.float64[:],
+        nb.int64,
+        nb.float64[:],
+        nb.int64,
+        DRAG_TABLES_TYPE,
+        nb.int64[:],
+        nb.int64[:],
+        nb.float64[:],
+        nb.int64[:, :],
+    ),
+    cache=True,
+    error_model="numpy",
+)
+def _run_stream(
+        seed: np.uint64,
+        num_shots: np.int64,
+        num_projectiles: np.int64,
+        spread: np.float64,
+        aim_elevation: np.float64,
+        ranges: npt.NDArray[np.float64],
+        nominal_y: npt.NDArray[np.float64],
+        half_width: np.float64,
+        half_height: np.float64,
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        damage_edges: npt.NDArray[np.float64],
+        integrator: np.int64,
+        drag_tables: DragTables,
+        hits: npt.NDArray[np.int64],
+        shot_hits: npt.NDArray[np.int64],
+        damage_sum: npt.NDArray[np.float64],
+        damage_counts: npt.NDArray[np.int64],
+):
+    """Fire `num_shots` shots with the random number stream
+    `seed`, accumulating the results into the output arrays.
+    """
+    n = ranges.shape[0]
+    num_bins = damage_counts.shape[1]
+    bin_scale = num_bins / (damage_edges[num_bins] - damage_edges[0])
+    bc_inverse = 1.0 / ballistic_coeff
+    cos_spread = math.cos(spread)
+    cos_aim = math.cos(aim_elevation)
+    sin_aim = math.sin(aim_elevation)
+    y = np.empty(n, dtype=np.float64)
+    v_sq = np.empty(n, dtype=np.float64)
+    shot_damage = np.empty(n, dtype=np.float64)
+    shot_hit = np.empty(n, dtype=np.bool_)
+    state = _mix(seed)
+
+    for _ in range(num_shots):
+        shot_damage[:] = 0.0
+        shot_hit[:] = False
+        for _ in range(num_projectiles):
+            # Uniform direction in the spread cone around the aim.
+            u, state = _uniform(state)
+            cos_theta = 1.0 - u * (1.0 - cos_spread)
+            sin_theta = math.sqrt(max(1.0 - cos_theta * cos_theta, 0.0))
+            u, state = _uniform(state)
+            psi = 2.0 * math.pi * u
+            # Components downrange, lateral and up.
+            up = sin_theta * math.cos(psi)
+            dir_x = cos_theta * cos_aim - up * sin_aim
+            dir_y = cos_theta * sin_aim + up * cos_aim
+            dir_z = sin_theta * math.sin(psi)
+            azimuth = math.atan2(dir_z, dir_x)
+            elevation = math.atan2(
+                dir_y, math.sqrt(dir_x * dir_x + dir_z * dir_z))
+
+            _trace(
+                elevation, azimuth, ranges, sim_time, time_step, drag_func,
+                bc_inverse, muzzle_velocity, integrator, drag_tables, y, v_sq)
+
+            tan_azimuth = math.tan(azimuth)
+            for k in range(n):
+                # NaN (not reached) is a miss.
+                if not (abs(ranges[k] * tan_azimuth) <= half_width
+                        and abs(y[k] - nominal_y[k]) <= half_height):
+                    continue
+                hits[k] += 1
+                shot_hit[k] = True
+                energy_transfer = calc_energy_transfer(
+                    v_sq[k], falloff_x, falloff_y)
+                power_left = calc_power_left(v_sq[k], muzzle_velocity)
+                shot_damage[k] += calc_damage(
+                    power_left, energy_transfer, bullet_damage)
+
+        for k in range(n):
+            if shot_hit[k]:
+                shot_hits[k] += 1
+            damage_sum[k] += shot_damage[k]
+            b = np.int64((shot_damage[k] - damage_edges[0]) * bin_scale)
+            damage_counts[k, min(max(b, 0), num_bins - 1)] += 1
+
+
+@nb.njit(
+    nb.types.Tuple((
+            nb.int64[:, :],
+            nb.int64[:, :],
+            nb.float64[:, :],
+            nb.int64[:, :, :],
+    ))(
+        nb.uint64,
+        nb.int64,
+        nb.int64,
+        nb.int64,
+        nb.float64,
+        nb.float64,
+        nb.float64[:],
+        nb.float64[:],
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.int64,
+        nb.float64,
+        nb.float64,
+        nb.float64[:],
+        nb.float64[:],
+        nb.int64,
+        nb.float64[:],
+        nb.int64,
+        DRAG_TABLES_TYPE,
+    ),
+    cache=True,
+    parallel=True,
+)
+def _simulate_dispersion(
+        seed: np.uint64,
+        num_streams: np.int64,
+        num_shots: np.int64,
+        num_projectiles: np.int64,
+        spread: np.float64,
+        aim_elevation: np.float64,
+        ranges: npt.NDArray[np.float64],
+        nominal_y: npt.NDArray[np.float64],
+        half_width: np.float64,
+        half_height: np.float64,
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        damage_edges: npt.NDArray[np.float64],
+        integrator: np.int64,
+        drag_tables: DragTables,
+):
+    n = ranges.shape[0]
+    num_bins = damage_edges.shape[0] - 1
+    # Accumulators per stream, summed in stream order by the
+    # caller so the floating point sums are reproducible too.
+    hits = np.zeros((num_streams, n), dtype=np.int64)
+    shot_hits = np.zeros((num_streams, n), dtype=np.int64)
+    damage_sum = np.zeros((num_streams, n), dtype=np.float64)
+    damage_counts = np.zeros((num_streams, n, num_bins), dtype=np.int64)
+    for s in nb.prange(num_streams):
+        start = s * num_shots // num_streams
+        end = (s + 1) * num_shots // num_streams
+        _run_stream(
+            seed + _mix(np.uint64(s)),
+            end - start,
+            num_projectiles,
+            spread,
+            aim_elevation,
+            ranges,
+            nominal_y,
+            half_width,
+            half_height,
+            sim_time,
+            time_step,
+            drag_func,
+            ballistic_coeff,
+            muzzle_velocity,
+            falloff_x,
+            falloff_y,
+            bullet_damage,
+            damage_edges,
+            integrator,
+            drag_tables,
+            hits[s],
+            shot_hits[s],
+            damage_sum[s],
+            damage_counts[s],
+        )
+    return hits, shot_hits, damage_sum, damage_counts
+
+
+@nb.njit(cache=True)
+def _nominal_y(
+        aim_elevation,
+        ranges,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        muzzle_velocity,
+        integrator,
+        drag_tables,
+):
+    tables = _resolve_drag_tables(drag_tables)
+    if not is_valid_drag_func(tables, drag_func):
+        raise ValueError("invalid drag function")
+    _check_integrator(integrator)
+    y = np.empty(ranges.shape[0], dtype=np.float64)
+    v_sq = np.empty(ranges.shape[0], dtype=np.float64)
+    _trace(
+        aim_elevation, 0.0, ranges, sim_time, time_step, drag_func,
+        1.0 / ballistic_coeff, muzzle_velocity, integrator, tables, y, v_sq)
+    return y, tables
+
+
+def simulate_dispersion(
+        ranges: npt.ArrayLike,
+        num_shots: int,
+        num_projectiles: int,
+        spread: float,
+        sim_time: float,
+        time_step: float,
+        drag_func: int,
+        ballistic_coeff: float,
+        muzzle_velocity: float,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: int,
+        target_width: float = 0.5,
+        target_height: float = 1.8,
+        aim_elevation: float = 0.0,
+        num_bins: int = 50,
+        seed: int = 0,
+        num_streams: int = NUM_STREAMS,
+        integrator: Integrator = Integrator.EULER,
+        drag_tables=None,
+) -> DispersionResult:
+    """Monte Carlo dispersion of `num_shots` shots of
+    `num_projectiles` projectiles (e.g. shotgun pellets), each
+    fired in a random direction within a cone of half-angle
+    `spread` [rad] around the aim.
+
+    The target is a `target_width` x `target_height` [m] rectangle
+    at each of the downrange distances `ranges` [m], centered on
+    the point the shot would hit without spread. Only aggregated
+    hit probabilities and damage distributions are kept, so the
+    memory use does not depend on `num_shots`. The other ballistic
+    arguments are the same as for `simulate`.
+
+    Shots are split evenly over `num_streams` independent random
+    number streams that run in parallel. The result only depends
+    on `seed` and `num_streams`, not on the number of threads.
+    """
+    ranges = np.array(ranges, dtype=np.float64)
+    if ranges.ndim != 1 or (np.diff(ranges) < 0).any() or (ranges < 0).any():
+        raise ValueError("ranges must be non-negative and in ascending order")
+    if num_shots < 1 or num_projectiles < 1 or num_streams < 1:
+        raise ValueError(
+            "num_shots, num_projectiles and num_streams must be positive")
+    if not 0.0 <= spread < math.pi / 2:
+        raise ValueError("spread must be in [0, pi/2)")
+
+    ranges_uu = ranges * 50
+    nominal_y, tables = _nominal_y(
+        np.float64(aim_elevation),
+        ranges_uu,
+        np.float64(sim_time),
+        np.float64(time_step),
+        np.int64(drag_func),
+        np.float64(ballistic_coeff),
+        np.float64(muzzle_velocity),
+        np.int64(integrator),
+        drag_tables,
+    )
+    falloff_x = np.ascontiguousarray(falloff_x, dtype=np.float64)
+    falloff_y = np.ascontiguousarray(falloff_y, dtype=np.float64)
+    # A projectile never does more than its base damage
+    # times the largest energy transfer.
+    max_damage = bullet_damage * num_projectiles * max(
+        float(np.max(falloff_y)), 1.0)
+    damage_edges = np.linspace(0.0, max_damage, num_bins + 1)
+
+    hits, shot_hits, damage_sum, damage_counts = _simulate_dispersion(
+        np.uint64(seed),
+        np.int64(num_streams),
+        np.int64(num_shots),
+        np.int64(num_projectiles),
+        np.float64(spread),
+        np.float64(aim_elevation),
+        ranges_uu,
+        nominal_y,
+        np.float64(target_width * 50 / 2),
+        np.float64(target_height * 50 / 2),
+        np.float64(sim_time),
+        np.float64(time_step),
+        np.int64(drag_func),
+        np.float64(ballistic_coeff),
+        np.float64(muzzle_velocity),
+        falloff_x,
+        falloff_y,
+        np.int64(bullet_damage),
+        damage_edges,
+        np.int64(integrator),
+        tables,
+    )
+    return DispersionResult(
+        ranges=ranges,
+        hit_probability=hits.sum(axis=0) / (num_shots * num_projectiles),
+        shot_hit_probability=shot_hits.sum(axis=0) / num_shots,
+        mean_damage=damage_sum.sum(axis=0) / num_shots,
+        damage_edges=damage_edges,
+        damage_counts=damage_counts.sum(axis=0),
+    )
+
+
+def simulate_weapon_dispersion(
+        weapon: Weapon,
+        ranges: npt.ArrayLike,
+        num_shots: int,
+        sim_time: float,
+        time_step: float,
+        fire_mode: int = 0,
+        **kwargs,
+) -> DispersionResult:
+    """`simulate_dispersion` with the bullet, number of
+    projectiles and spread of `weapon` in `fire_mode`.
+    Keyword arguments are passed to `simulate_dispersion`.
+    """
+    bullet = weapon.get_bullet(fire_mode)
+    if bullet is None:
+        raise ValueError(f"weapon has no bullet for fire mode {fire_mode}")
+    fo_x, fo_y = interp_dmg_falloff(bullet.get_damage_falloff())
+    return simulate_dispersion(
+        ranges=ranges,
+        num_shots=num_shots,
+        num_projectiles=weapon.get_num_projectiles(fire_mode),
+        spread=weapon.get_spread(fire_mode),
+        sim_time=sim_time,
+        time_step=time_step,
+        drag_func=bullet.get_drag_func_int(),
+        ballistic_coeff=bullet.get_ballistic_coeff(),
+        muzzle_velocity=bullet.get_speed_uu(),
+        falloff_x=fo_x,
+        falloff_y=fo_y,
+        bullet_damage=bullet.get_damage(),
+        **kwargs,
+    )
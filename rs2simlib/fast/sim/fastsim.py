@@ -1,11 +1,19 @@
 import math
+from enum import IntEnum
+from typing import Optional
 
 import numba as nb
 import numpy as np
 import numpy.typing as npt
 
+from rs2simlib.fast.drag import DRAG_TABLES_TYPE
+from rs2simlib.fast.drag import DragTables
+from rs2simlib.fast.drag import STANDARD_DRAG_TABLES
+from rs2simlib.fast.drag import drag_coeff
 from rs2simlib.fast.drag import drag_g1
 from rs2simlib.fast.drag import drag_g7
+from rs2simlib.fast.drag import is_valid_drag_func
+from rs2simlib.models import Integrator
 
 SCALE_FACTOR_INVERSE = np.float64(0.065618)
 SCALE_FACTOR = np.float64(15.24)
@@ -14,7 +22,58 @@ X2 = np.float64(0.00020874137882624)
 GRAVITY = np.float64(490.3325)  # 490.3325 UU/s = 9.80665 m/s
 
 
-@nb.njit(nb.float64(nb.float64, nb.float64[:], nb.float64[:]), cache=True)
+class StopReason(IntEnum):
+    """Reason why a simulation stopped."""
+    SIM_TIME = 0
+    MIN_Y = 1
+    MAX_DISTANCE = 2
+    MIN_SPEED = 3
+    MIN_DAMAGE = 4
+
+
+class Channel(IntEnum):
+    """Simulation output channels. Combine with `|` to select
+    multiple channels. Selected channels are stored in the result
+    rows in the order they are defined here.
+    """
+    X = 1 << 0
+    Y = 1 << 1
+    DAMAGE = 1 << 2
+    DISTANCE = 1 << 3
+    TIME = 1 << 4
+    VELOCITY = 1 << 5
+    ENERGY_TRANSFER = 1 << 6
+    POWER_LEFT = 1 << 7
+    ALL = (1 << 8) - 1
+
+
+NUM_CHANNELS = 8
+
+
+@nb.njit(nb.int64[:](nb.int64), cache=True)
+def channel_rows(channels: np.int64) -> npt.NDArray[np.int64]:
+    """Map each channel index to its row in a result array
+    that only contains the selected `channels`. Unselected
+    channels are mapped to -1.
+    """
+    if channels <= 0 or channels > Channel.ALL:
+        raise ValueError("invalid channel mask")
+    rows = np.full(NUM_CHANNELS, -1, dtype=np.int64)
+    row = 0
+    for c in range(NUM_CHANNELS):
+        if channels & (1 << c):
+            rows[c] = row
+            row += 1
+    return rows
+
+
+@nb.njit(
+    [
+        nb.float64(nb.float64, nb.float64[:], nb.float64[:]),
+        nb.float32(nb.float32, nb.float64[:], nb.float64[:]),
+    ],
+    cache=True,
+)
 def calc_energy_transfer(
         vel_size_sq: np.float64,
         falloff_x: npt.NDArray[np.float64],
@@ -28,7 +87,13 @@ def calc_energy_transfer(
     return energy_transfer
 
 
-@nb.njit(nb.float64(nb.float64, nb.float64), cache=True)
+@nb.njit(
+    [
+        nb.float64(nb.float64, nb.float64),
+        nb.float32(nb.float32, nb.float32),
+    ],
+    cache=True,
+)
 def calc_power_left(
         vel_size_sq: np.float64,
         muzzle_velocity: np.float64,
@@ -36,7 +101,13 @@ def calc_power_left(
     return vel_size_sq / (muzzle_velocity ** 2)
 
 
-@nb.njit(nb.float64(nb.float64, nb.float64, nb.int64), cache=True)
+@nb.njit(
+    [
+        nb.float64(nb.float64, nb.float64, nb.int64),
+        nb.float32(nb.float32, nb.float32, nb.int64),
+    ],
+    cache=True,
+)
 def calc_damage(
         power_left: np.float64,
         energy_transfer: np.float64,
@@ -45,25 +116,496 @@ def calc_damage(
     return base_damage * power_left * energy_transfer
 
 
+# No explicit signatures: these are only called from the
+# kernels and are compiled for the working precision. Inlined
+# so the drag tables tuple is not copied on every call.
+@nb.njit(cache=True, error_model="numpy", inline="always")
+def _accel(
+        vel_x,
+        vel_y,
+        drag_tables,
+        drag_func,
+        bc_inverse,
+        scale_factor_inverse,
+        scale_factor,
+        x1,
+        x2,
+        gravity,
+):
+    """Acceleration (drag and gravity) at the given velocity.
+    Returns (accel_x, accel_y, speed).
+    """
+    v_size = math.sqrt(vel_x * vel_x + vel_y * vel_y)
+    v = v_size * scale_factor_inverse
+    cd = drag_coeff(drag_tables, drag_func, v * x1)
+    drag = x2 * (cd * bc_inverse) * (v * v) * scale_factor
+    return (
+        -drag * (vel_x / v_size),
+        -drag * (vel_y / v_size) - gravity,
+        v_size,
+    )
+
+
+@nb.njit(cache=True)
+def _check_integrator(integrator):
+    if (integrator != Integrator.EULER
+            and integrator != Integrator.RK4
+            and integrator != Integrator.VERLET):
+        raise ValueError("invalid integrator")
+
+
+@nb.njit(cache=True, inline="always")
+def _resolve_drag_tables(drag_tables):
+    # The default tables are frozen into the compiled code.
+    if drag_tables is None:
+        return STANDARD_DRAG_TABLES
+    return drag_tables
+
+
+@nb.njit(cache=True, error_model="numpy", inline="always")
+def _step(
+        integrator,
+        loc_x,
+        loc_y,
+        vel_x,
+        vel_y,
+        d_accumulated,
+        dt,
+        drag_tables,
+        drag_func,
+        bc_inverse,
+        scale_factor_inverse,
+        scale_factor,
+        x1,
+        x2,
+        gravity,
+):
+    """Advance the state by one fixed time step with the given
+    integrator. Returns (loc_x, loc_y, vel_x, vel_y, distance).
+    """
+    # Constants in the working precision.
+    two = type(dt)(2)
+    half_dt = dt / two
+    sixth_dt = dt / type(dt)(6)
+    v_size = math.sqrt(vel_x * vel_x + vel_y * vel_y)
+
+    if integrator == Integrator.EULER:
+        # Semi-implicit: the location is advanced
+        # with the already updated velocity.
+        v = v_size * scale_factor_inverse
+        mach = v * x1
+        cd = drag_coeff(drag_tables, drag_func, mach)
+        drag = x2 * (cd * bc_inverse) * (v * v) * scale_factor
+        vel_x += drag * -((vel_x / v_size) * dt)
+        vel_y += drag * -((vel_y / v_size) * dt)
+        vel_y -= (gravity * dt)
+        loc_change_x = vel_x * dt
+        loc_change_y = vel_y * dt
+        loc_x += loc_change_x
+        loc_y += loc_change_y
+        d_accumulated += math.sqrt(
+            loc_change_x * loc_change_x + loc_change_y * loc_change_y)
+    elif integrator == Integrator.RK4:
+        ax1, ay1, s1 = _accel(
+            vel_x, vel_y, drag_tables, drag_func, bc_inverse,
+            scale_factor_inverse, scale_factor, x1, x2, gravity)
+        vx2 = vel_x + half_dt * ax1
+        vy2 = vel_y + half_dt * ay1
+        ax2, ay2, s2 = _accel(
+            vx2, vy2, drag_tables, drag_func, bc_inverse,
+            scale_factor_inverse, scale_factor, x1, x2, gravity)
+        vx3 = vel_x + half_dt * ax2
+        vy3 = vel_y + half_dt * ay2
+        ax3, ay3, s3 = _accel(
+            vx3, vy3, drag_tables, drag_func, bc_inverse,
+            scale_factor_inverse, scale_factor, x1, x2, gravity)
+        vx4 = vel_x + dt * ax3
+        vy4 = vel_y + dt * ay3
+        ax4, ay4, s4 = _accel(
+            vx4, vy4, drag_tables, drag_func, bc_inverse,
+            scale_factor_inverse, scale_factor, x1, x2, gravity)
+        loc_x += sixth_dt * (vel_x + two * vx2 + two * vx3 + vx4)
+        loc_y += sixth_dt * (vel_y + two * vy2 + two * vy3 + vy4)
+        # Arc length, integrated like the other states.
+        d_accumulated += sixth_dt * (s1 + two * s2 + two * s3 + s4)
+        vel_x += sixth_dt * (ax1 + two * ax2 + two * ax3 + ax4)
+        vel_y += sixth_dt * (ay1 + two * ay2 + two * ay3 + ay4)
+    else:
+        # Velocity Verlet. Drag depends on velocity, so the
+        # end of step acceleration uses a predicted velocity.
+        ax0, ay0, _ = _accel(
+            vel_x, vel_y, drag_tables, drag_func, bc_inverse,
+            scale_factor_inverse, scale_factor, x1, x2, gravity)
+        loc_change_x = vel_x * dt + half_dt * dt * ax0
+        loc_change_y = vel_y * dt + half_dt * dt * ay0
+        loc_x += loc_change_x
+        loc_y += loc_change_y
+        d_accumulated += math.sqrt(
+            loc_change_x * loc_change_x + loc_change_y * loc_change_y)
+        ax1, ay1, _ = _accel(
+            vel_x + dt * ax0, vel_y + dt * ay0, drag_tables, drag_func,
+            bc_inverse, scale_factor_inverse, scale_factor, x1, x2, gravity)
+        vel_x += half_dt * (ax0 + ax1)
+        vel_y += half_dt * (ay0 + ay1)
+
+    return loc_x, loc_y, vel_x, vel_y, d_accumulated
+
+
+# Integration state carried between calls of _simulate_steps:
+# location and velocity [UU, UU/s], distance traveled [UU] and
+# flight time [s], in the working precision.
+STATE_LOC_X = 0
+STATE_LOC_Y = 1
+STATE_VEL_X = 2
+STATE_VEL_Y = 3
+STATE_DISTANCE = 4
+STATE_TIME = 5
+STATE_SIZE = 6
+
+# Counters of an instrumented _simulate_steps call, see
+# simulate_instrumented. Drag evaluations are attributed to
+# the Mach region of the speed at the start of the step,
+# region k is [MACH_REGION_EDGES[k - 1], MACH_REGION_EDGES[k]).
+COUNTER_STEPS = 0
+COUNTER_DRAG_EVALUATIONS = 1
+COUNTER_INTERP_CALLS = 2
+COUNTER_SUPERSONIC_STEPS = 3
+COUNTER_SUBSONIC_STEPS = 4
+COUNTER_MACH_REGIONS = 5
+MACH_REGION_EDGES = (0.8, 1.2, 1.6, 2.7, 3.6)
+NUM_MACH_REGIONS = len(MACH_REGION_EDGES) + 1
+NUM_COUNTERS = COUNTER_MACH_REGIONS + NUM_MACH_REGIONS
+
+
+@nb.njit(cache=True, inline="always")
+def _count_step(counters, integrator, mach, need_damage):
+    if integrator == Integrator.EULER:
+        drag_evaluations = 1
+    elif integrator == Integrator.RK4:
+        drag_evaluations = 4
+    else:
+        drag_evaluations = 2
+    counters[COUNTER_STEPS] += 1
+    counters[COUNTER_DRAG_EVALUATIONS] += drag_evaluations
+    if need_damage:
+        counters[COUNTER_INTERP_CALLS] += 1
+    if mach >= 1.0:
+        counters[COUNTER_SUPERSONIC_STEPS] += 1
+    else:
+        counters[COUNTER_SUBSONIC_STEPS] += 1
+    region = 0
+    for edge in MACH_REGION_EDGES:
+        if mach >= edge:
+            region += 1
+    counters[COUNTER_MACH_REGIONS + region] += drag_evaluations
+
+
+@nb.njit(
+    [
+        nb.void(
+            state_type,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+        )
+        for state_type in (nb.float64[:], nb.float32[:])
+    ],
+    cache=True,
+    error_model="numpy",
+)
+def _init_state(
+        state: npt.NDArray[np.float64],
+        aim_dir_x: np.float64,
+        aim_dir_y: np.float64,
+        muzzle_velocity: np.float64,
+        start_loc_x: np.float64,
+        start_loc_y: np.float64,
+):
+    """Initial integration state of a shot, see STATE_SIZE."""
+    ft = state.dtype.type
+    muzzle_vel = ft(muzzle_velocity)
+    aim_x = ft(aim_dir_x)
+    aim_y = ft(aim_dir_y)
+    aim_size = math.sqrt(aim_x * aim_x + aim_y * aim_y)
+    state[STATE_LOC_X] = ft(start_loc_x)
+    state[STATE_LOC_Y] = ft(start_loc_y)
+    state[STATE_VEL_X] = aim_x / aim_size * muzzle_vel
+    state[STATE_VEL_Y] = aim_y / aim_size * muzzle_vel
+    state[STATE_DISTANCE] = ft(0.0)
+    state[STATE_TIME] = ft(0.0)
+
+
+@nb.njit(
+    [
+        nb.types.UniTuple(nb.int64, 2)(
+            out_type,
+            nb.int64[:],
+            state_type,
+            nb.float64,
+            nb.float64,
+            nb.int64,
+            nb.float64,
+            nb.float64,
+            nb.float64[:],
+            nb.float64[:],
+            nb.int64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.int64,
+            DRAG_TABLES_TYPE,
+            counters_type,
+        )
+        for out_type, state_type, counters_type in (
+            (nb.float64[:, :], nb.float64[:], nb.types.none),
+            (nb.float32[:, :], nb.float32[:], nb.types.none),
+            (nb.float64[:, :], nb.float64[:], nb.int64[:]),
+        )
+    ],
+    cache=True,
+    # Division by zero gives inf/nan instead of raising, like
+    # the earlier array based version did. Also keeps the
+    # zero division checks out of the loop.
+    error_model="numpy",
+)
+def _simulate_steps(
+        out: npt.NDArray[np.float64],
+        rows: npt.NDArray[np.int64],
+        state: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        min_y: np.float64,
+        max_distance: np.float64,
+        min_speed: np.float64,
+        min_damage: np.float64,
+        integrator: np.int64,
+        drag_tables: DragTables,
+        counters: Optional[npt.NDArray[np.int64]],
+) -> tuple[np.int64, int]:
+    """Integrate a shot from `state` (see `_init_state`), writing
+    the results directly into the columns of `out`, and store the
+    final state back into `state`. Channel c is written to row
+    `rows[c]` of `out` and skipped if `rows[c]` is negative.
+    Returns the number of columns filled and the StopReason.
+    SIM_TIME is also returned when `out` is full.
+
+    The stop conditions are checked against each written sample,
+    so the sample that triggers a stop is included in the output.
+
+    With a `counters` array (see NUM_COUNTERS), the work done is
+    added to it. With None, the counting is compiled out.
+    """
+    # Working precision. No-op casts for float64.
+    ft = out.dtype.type
+    uu_per_m = ft(50)
+    scale_factor_inverse = ft(SCALE_FACTOR_INVERSE)
+    scale_factor = ft(SCALE_FACTOR)
+    x1 = ft(X1)
+    x2 = ft(X2)
+    gravity = ft(GRAVITY)
+    dt = ft(time_step)
+    muzzle_vel = ft(muzzle_velocity)
+
+    bc_inverse = ft(1.0) / ft(ballistic_coeff)
+    # Position and velocity are kept as scalars to avoid
+    # allocating temporary 2-vectors on every step.
+    loc_x = state[STATE_LOC_X]
+    loc_y = state[STATE_LOC_Y]
+    vel_x = state[STATE_VEL_X]
+    vel_y = state[STATE_VEL_Y]
+    d_accumulated = state[STATE_DISTANCE]
+    flight_time = state[STATE_TIME]
+
+    arr_len = out.shape[1]
+
+    row_x = rows[0]
+    row_y = rows[1]
+    row_damage = rows[2]
+    row_distance = rows[3]
+    row_time = rows[4]
+    row_velocity = rows[5]
+    row_energy_transfer = rows[6]
+    row_power_left = rows[7]
+    # Falloff lookup and damage are only needed when a damage
+    # related channel is requested or used as a stop condition.
+    need_damage = (
+            row_damage >= 0
+            or row_energy_transfer >= 0
+            or row_power_left >= 0
+            or min_damage > -np.inf
+    )
+    energy_transfer = ft(0.0)
+    power_left = ft(0.0)
+    damage = ft(np.inf)
+
+    _check_integrator(integrator)
+
+    reason = StopReason.SIM_TIME
+    i = np.int64(0)
+    while (flight_time < sim_time) and (i < arr_len):
+        flight_time += dt
+
+        if counters is not None:
+            mach = math.sqrt(vel_x * vel_x + vel_y * vel_y) * (
+                    scale_factor_inverse * x1)
+            _count_step(counters, integrator, mach, need_damage)
+
+        loc_x, loc_y, vel_x, vel_y, d_accumulated = _step(
+            integrator, loc_x, loc_y, vel_x, vel_y, d_accumulated,
+            dt, drag_tables, drag_func, bc_inverse, scale_factor_inverse,
+            scale_factor, x1, x2, gravity)
+
+        v_size_sq = vel_x * vel_x + vel_y * vel_y
+        v_size = math.sqrt(v_size_sq)
+        x = loc_x / uu_per_m
+        y = loc_y / uu_per_m
+        distance = d_accumulated / uu_per_m
+        speed_m = v_size / uu_per_m
+
+        if need_damage:
+            energy_transfer = calc_energy_transfer(
+                vel_size_sq=v_size_sq,
+                falloff_x=falloff_x,
+                falloff_y=falloff_y,
+            )
+            power_left = calc_power_left(
+                vel_size_sq=v_size_sq,
+                muzzle_velocity=muzzle_vel,
+            )
+            damage = calc_damage(
+                power_left=power_left,
+                energy_transfer=energy_transfer,
+                base_damage=bullet_damage,
+            )
+
+        if row_x >= 0:
+            out[row_x, i] = x
+        if row_y >= 0:
+            out[row_y, i] = y
+        if row_damage >= 0:
+            out[row_damage, i] = damage
+        if row_distance >= 0:
+            out[row_distance, i] = distance
+        if row_time >= 0:
+            out[row_time, i] = flight_time
+        if row_velocity >= 0:
+            out[row_velocity, i] = speed_m
+        if row_energy_transfer >= 0:
+            out[row_energy_transfer, i] = energy_transfer
+        if row_power_left >= 0:
+            out[row_power_left, i] = power_left
+        i += 1
+
+        if y < min_y:
+            reason = StopReason.MIN_Y
+            break
+        if distance > max_distance:
+            reason = StopReason.MAX_DISTANCE
+            break
+        if speed_m < min_speed:
+            reason = StopReason.MIN_SPEED
+            break
+        if damage < min_damage:
+            reason = StopReason.MIN_DAMAGE
+            break
+
+    state[STATE_LOC_X] = loc_x
+    state[STATE_LOC_Y] = loc_y
+    state[STATE_VEL_X] = vel_x
+    state[STATE_VEL_Y] = vel_y
+    state[STATE_DISTANCE] = d_accumulated
+    state[STATE_TIME] = flight_time
+    return i, reason
+
+
 @nb.njit(
-    nb.float64[:, :](
-        nb.float64,
-        nb.float64,
-        nb.int64,
-        nb.float64,
-        nb.float64,
-        nb.float64,
-        nb.float64,
-        nb.float64[:],
-        nb.float64[:],
-        nb.int64,
-        nb.int64,
-        nb.int64,
-        nb.float64,
-        nb.float64,
-    ),
-    cache=True
+    [
+        nb.types.UniTuple(nb.int64, 2)(
+            out_type,
+            nb.int64[:],
+            nb.float64,
+            nb.float64,
+            nb.int64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64[:],
+            nb.float64[:],
+            nb.int64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.float64,
+            nb.int64,
+            DRAG_TABLES_TYPE,
+        )
+        for out_type in (nb.float64[:, :], nb.float32[:, :])
+    ],
+    cache=True,
 )
+def _simulate_into(
+        out: npt.NDArray[np.float64],
+        rows: npt.NDArray[np.int64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        aim_dir_x: np.float64,
+        aim_dir_y: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        start_loc_x: np.float64,
+        start_loc_y: np.float64,
+        min_y: np.float64,
+        max_distance: np.float64,
+        min_speed: np.float64,
+        min_damage: np.float64,
+        integrator: np.int64,
+        drag_tables: DragTables,
+) -> tuple[np.int64, int]:
+    """Integrate a single shot from the muzzle, see `_simulate_steps`."""
+    state = np.empty(STATE_SIZE, dtype=out.dtype)
+    _init_state(
+        state, aim_dir_x, aim_dir_y, muzzle_velocity, start_loc_x,
+        start_loc_y)
+    return _simulate_steps(
+        out,
+        rows,
+        state,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        min_y,
+        max_distance,
+        min_speed,
+        min_damage,
+        integrator,
+        drag_tables,
+        None,
+    )
+
+
+# No explicit signature, see simulate_until.
+@nb.njit(cache=True)
 def simulate(
         sim_time: np.float64,
         time_step: np.float64,
@@ -79,113 +621,537 @@ def simulate(
         pre_fire_trace_len: np.int64,
         start_loc_x=np.float64(0.0),
         start_loc_y=np.float64(0.0),
+        integrator=np.int64(Integrator.EULER),
+        drag_tables=None,
 ) -> npt.NDArray[np.float64]:
-    d_accumulated = np.float64(0.0)
-    flight_time = np.float64(0.0)
-    energy_transfer: np.float64
-    power_left: np.float64
-    location = np.array([start_loc_x, start_loc_y], dtype=np.float64)
-    bc_inverse = 1.0 / ballistic_coeff
-    velocity = np.array([aim_dir_x, aim_dir_y], dtype=np.float64)
-    velocity /= np.linalg.norm(velocity)
-    velocity *= muzzle_velocity
+    """Simulate a single shot with fixed time steps.
+
+    `integrator` selects the fixed step scheme (models.Integrator).
+    Euler is the scheme the game uses; RK4 and Verlet allow much
+    larger time steps for the same accuracy.
 
+    `drag_func` is a drag curve id (1, 2, 5, 6, 7 or 8 for G1-G8).
+    Custom curves registered with `fast.drag.register_drag_curve`
+    are available with `drag_tables=fast.drag.drag_tables()`.
+
+    `instant_damage` and `pre_fire_trace_len` (the instant hit
+    damage of the weapon and the range it applies within [UU])
+    are not used by the simulation. They are reserved for the
+    pre-fire trace damage and kept for compatibility.
+
+    Returns an array of shape (8, ceil(sim_time / time_step) - 1)
+    with the rows: x [m], y [m], damage, distance [m], flight
+    time [s], velocity [m/s], energy transfer and power left.
+    """
+    tables = _resolve_drag_tables(drag_tables)
     num_steps = math.ceil(sim_time / time_step)
     arr_len = num_steps - 1
 
-    trajectory_x = np.empty(arr_len, dtype=np.float64)
-    trajectory_y = np.empty(arr_len, dtype=np.float64)
-    damage = np.empty(arr_len, dtype=np.float64)
-    distance = np.empty(arr_len, dtype=np.float64)
-    time_at_flight = np.empty(arr_len, dtype=np.float64)
-    bullet_velocity = np.empty(arr_len, dtype=np.float64)
-    power_left_arr = np.empty(arr_len, dtype=np.float64)
-    energy_transfer_arr = np.empty(arr_len, dtype=np.float64)
-    damage_with_prefire = np.empty(arr_len, dtype=np.float64)
+    ret = np.empty(shape=(8, arr_len), dtype=np.float64)
+    _simulate_into(
+        ret,
+        channel_rows(np.int64(Channel.ALL)),
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        aim_dir_x,
+        aim_dir_y,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        start_loc_x,
+        start_loc_y,
+        np.float64(-np.inf),
+        np.float64(np.inf),
+        np.float64(-np.inf),
+        np.float64(-np.inf),
+        integrator,
+        tables,
+    )
+    return ret
 
-    i = np.int64(0)
-    while (flight_time < sim_time) and (i <= arr_len):
+
+# No explicit signature: the stop conditions are optional,
+# and omitted arguments do not match explicit signatures.
+@nb.njit(cache=True)
+def simulate_until(
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        aim_dir_x: np.float64,
+        aim_dir_y: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        instant_damage: np.int64,
+        pre_fire_trace_len: np.int64,
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        min_y=np.float64(-np.inf),
+        max_distance=np.float64(np.inf),
+        min_speed=np.float64(-np.inf),
+        min_damage=np.float64(-np.inf),
+        channels=np.int64(Channel.ALL),
+        dtype=np.float64,
+        integrator=np.int64(Integrator.EULER),
+        drag_tables=None,
+) -> tuple[npt.NDArray[np.float64], int]:
+    """Like `simulate`, but stops as soon as the bullet falls
+    below `min_y` [m], travels further than `max_distance` [m],
+    slows below `min_speed` [m/s] or its damage drops below
+    `min_damage`. By default no stop conditions are set.
+
+    Only the rows for the Channel mask `channels` are allocated
+    and computed. The damage falloff lookup is skipped when no
+    damage related channel or stop condition is used.
+
+    With `dtype=np.float32` the integration and the result use
+    single precision. See README.md for the error envelope
+    compared to float64.
+
+    Returns the filled part of the result array and
+    the StopReason as an integer.
+    """
+    tables = _resolve_drag_tables(drag_tables)
+    num_steps = math.ceil(sim_time / time_step)
+    arr_len = num_steps - 1
+
+    rows = channel_rows(channels)
+    ret = np.empty(shape=(rows.max() + 1, arr_len), dtype=dtype)
+    n, reason = _simulate_into(
+        ret,
+        rows,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        aim_dir_x,
+        aim_dir_y,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        start_loc_x,
+        start_loc_y,
+        min_y,
+        max_distance,
+        min_speed,
+        min_damage,
+        integrator,
+        tables,
+    )
+    if n < arr_len:
+        # Copy to release the unused tail.
+        return ret[:, :n].copy(), reason
+    return ret, reason
+
+
+# No explicit signature, see simulate_until.
+@nb.njit(cache=True)
+def simulate_into(
+        out: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        aim_dir_x: np.float64,
+        aim_dir_y: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        instant_damage: np.int64,
+        pre_fire_trace_len: np.int64,
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        min_y=np.float64(-np.inf),
+        max_distance=np.float64(np.inf),
+        min_speed=np.float64(-np.inf),
+        min_damage=np.float64(-np.inf),
+        channels=np.int64(Channel.ALL),
+        integrator=np.int64(Integrator.EULER),
+        drag_tables=None,
+) -> tuple[np.int64, int]:
+    """Like `simulate_until`, but writes the results into the
+    caller provided 2D array `out` instead of allocating a new one.
+    `out` may be any strided view, e.g. a slice of a larger
+    sweep matrix or a memmap, and must have one row per selected
+    channel. The simulation stops early when `out` is full.
+    The dtype of `out` (float64 or float32) selects the precision.
+
+    Returns the number of columns filled and the StopReason.
+    """
+    tables = _resolve_drag_tables(drag_tables)
+    rows = channel_rows(channels)
+    if out.shape[0] != rows.max() + 1:
+        raise ValueError("out must have one row per selected channel")
+    return _simulate_into(
+        out,
+        rows,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        aim_dir_x,
+        aim_dir_y,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        start_loc_x,
+        start_loc_y,
+        min_y,
+        max_distance,
+        min_speed,
+        min_damage,
+        integrator,
+        tables,
+    )
+
+
+@nb.njit(cache=True, error_model="numpy")
+def _checkpoint_row(
+        row, loc_x, loc_y, vel_x, vel_y, d_accumulated, flight_time,
+        muzzle_velocity, falloff_x, falloff_y, bullet_damage):
+    """Write the output channels of the current state to `row`."""
+    v_size_sq = vel_x * vel_x + vel_y * vel_y
+    energy_transfer = calc_energy_transfer(
+        vel_size_sq=v_size_sq,
+        falloff_x=falloff_x,
+        falloff_y=falloff_y,
+    )
+    power_left = calc_power_left(
+        vel_size_sq=v_size_sq,
+        muzzle_velocity=muzzle_velocity,
+    )
+    row[0] = loc_x / 50
+    row[1] = loc_y / 50
+    row[2] = calc_damage(
+        power_left=power_left,
+        energy_transfer=energy_transfer,
+        base_damage=bullet_damage,
+    )
+    row[3] = d_accumulated / 50
+    row[4] = flight_time
+    row[5] = math.sqrt(v_size_sq) / 50
+    row[6] = energy_transfer
+    row[7] = power_left
+
+
+# No explicit signature, see simulate_until.
+@nb.njit(cache=True, error_model="numpy")
+def simulate_checkpoints(
+        checkpoints: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        aim_dir_x: np.float64,
+        aim_dir_y: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        by_distance=False,
+        integrator=np.int64(Integrator.EULER),
+        drag_tables=None,
+) -> tuple[npt.NDArray[np.float64], int]:
+    """Simulate a single shot with fixed time steps and record
+    the results only at the given checkpoints.
+
+    `checkpoints` are ascending flight times [s], or distances [m]
+    traveled if `by_distance` is True, e.g. `np.arange(0, 1000, 1.0)`
+    for every meter up to 1 km. Values at each checkpoint are
+    linearly interpolated between the two enclosing steps. The
+    result has the same 8 rows as `simulate`, with one column per
+    checkpoint, so its size does not depend on `time_step`.
+    Checkpoints that are not reached within `sim_time` are NaN.
+
+    Returns the checkpoints and the number of steps taken.
+    """
+    tables = _resolve_drag_tables(drag_tables)
+    n = checkpoints.shape[0]
+    for j in range(1, n):
+        if checkpoints[j] < checkpoints[j - 1]:
+            raise ValueError("checkpoints must be in ascending order")
+    _check_integrator(integrator)
+    key = 3 if by_distance else 4
+
+    out = np.full((NUM_CHANNELS, n), np.nan, dtype=np.float64)
+    prev = np.empty(NUM_CHANNELS, dtype=np.float64)
+    cur = np.empty(NUM_CHANNELS, dtype=np.float64)
+
+    d_accumulated = 0.0
+    flight_time = 0.0
+    bc_inverse = 1.0 / ballistic_coeff
+    loc_x = start_loc_x
+    loc_y = start_loc_y
+    aim_size = math.sqrt(aim_dir_x * aim_dir_x + aim_dir_y * aim_dir_y)
+    vel_x = aim_dir_x / aim_size * muzzle_velocity
+    vel_y = aim_dir_y / aim_size * muzzle_velocity
+
+    _checkpoint_row(
+        cur, loc_x, loc_y, vel_x, vel_y, d_accumulated, flight_time,
+        muzzle_velocity, falloff_x, falloff_y, bullet_damage)
+    j = 0
+    # Checkpoints at the very start.
+    while j < n and checkpoints[j] <= cur[key]:
+        out[:, j] = cur
+        j += 1
+
+    steps = 0
+    while flight_time < sim_time and j < n:
         flight_time += time_step
-        # noinspection PyTypeChecker
-        v_size = np.linalg.norm(velocity)
-        # noinspection PyTypeChecker
-        v: np.float64 = v_size * SCALE_FACTOR_INVERSE
-        mach = v * X1
-
-        # Numba caching fails when trying to choose
-        # the drag function dynamically outside the loop.
-        if drag_func == 1:
-            # noinspection PyTypeChecker
-            cd = drag_g1(mach)
-        elif drag_func == 7:
-            # noinspection PyTypeChecker
-            cd = drag_g7(mach)
-        else:
-            raise ValueError("invalid drag function")
+        loc_x, loc_y, vel_x, vel_y, d_accumulated = _step(
+            integrator, loc_x, loc_y, vel_x, vel_y, d_accumulated,
+            time_step, tables, drag_func, bc_inverse, SCALE_FACTOR_INVERSE,
+            SCALE_FACTOR, X1, X2, GRAVITY)
+        steps += 1
 
-        velocity += (
-                X2 * (cd * bc_inverse) * np.square(v)
-                * SCALE_FACTOR
-                * (-1 * ((velocity / v_size) * time_step)))
-        velocity[1] -= (GRAVITY * time_step)
-        loc_change = velocity * time_step
-        prev_loc = location.copy()
-        location += loc_change
-        d_accumulated += np.float64(abs(np.linalg.norm(prev_loc - location)))
-        distance[i] = d_accumulated
-
-        # TODO: is there a better way of doing this?
-        #   Just let the data user do this on demand,
-        #   instead of pre-calculating it here?
-        if d_accumulated <= pre_fire_trace_len:
-            damage_with_prefire[i] = instant_damage
-
-        v_size_sq = np.linalg.norm(velocity) ** 2
-        energy_transfer = calc_energy_transfer(
-            vel_size_sq=v_size_sq,
-            falloff_x=falloff_x,
-            falloff_y=falloff_y,
-        )
-        power_left = calc_power_left(
-            vel_size_sq=v_size_sq,
-            muzzle_velocity=muzzle_velocity,
+        prev, cur = cur, prev
+        _checkpoint_row(
+            cur, loc_x, loc_y, vel_x, vel_y, d_accumulated, flight_time,
+            muzzle_velocity, falloff_x, falloff_y, bullet_damage)
+        span = cur[key] - prev[key]
+        while j < n and checkpoints[j] <= cur[key]:
+            # Distance can stand still only if the bullet does.
+            frac = (checkpoints[j] - prev[key]) / span if span > 0 else 1.0
+            for c in range(NUM_CHANNELS):
+                out[c, j] = prev[c] + frac * (cur[c] - prev[c])
+            j += 1
+
+    return out, steps
+
+
+@nb.njit(
+    [
+        nb.int64[:](
+            out_type,
+            nb.float64,
+            nb.float64,
+            nb.int64[:],
+            nb.float64[:],
+            nb.float64[:],
+            nb.float64[:],
+            nb.float64[:],
+            nb.float64[:, :],
+            nb.float64[:, :],
+            nb.int64[:],
+            nb.float64[:],
+            nb.float64[:],
+            DRAG_TABLES_TYPE,
         )
-        damage[i] = calc_damage(
-            power_left=power_left,
-            energy_transfer=energy_transfer,
-            base_damage=bullet_damage,
+        for out_type in (nb.float64[:, :, :], nb.float32[:, :, :])
+    ],
+    cache=True,
+    parallel=True,
+)
+def _simulate_batch_into(
+        out: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: npt.NDArray[np.int64],
+        ballistic_coeff: npt.NDArray[np.float64],
+        aim_dir_x: npt.NDArray[np.float64],
+        aim_dir_y: npt.NDArray[np.float64],
+        muzzle_velocity: npt.NDArray[np.float64],
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: npt.NDArray[np.int64],
+        start_loc_x: npt.NDArray[np.float64],
+        start_loc_y: npt.NDArray[np.float64],
+        drag_tables: DragTables,
+) -> npt.NDArray[np.int64]:
+    n_shots = drag_func.shape[0]
+    rows = channel_rows(np.int64(Channel.ALL))
+    filled = np.empty(n_shots, dtype=np.int64)
+    for j in nb.prange(n_shots):
+        n, _ = _simulate_into(
+            out[j],
+            rows,
+            sim_time,
+            time_step,
+            drag_func[j],
+            ballistic_coeff[j],
+            aim_dir_x[j],
+            aim_dir_y[j],
+            muzzle_velocity[j],
+            falloff_x[j],
+            falloff_y[j],
+            bullet_damage[j],
+            start_loc_x[j],
+            start_loc_y[j],
+            np.float64(-np.inf),
+            np.float64(np.inf),
+            np.float64(-np.inf),
+            np.float64(-np.inf),
+            np.int64(Integrator.EULER),
+            drag_tables,
         )
+        filled[j] = n
+    return filled
 
-        trajectory_x[i] = np.float64(location[0])
-        trajectory_y[i] = np.float64(location[1])
-        time_at_flight[i] = np.float64(flight_time)
-        bullet_velocity[i] = np.linalg.norm(velocity)
-        power_left_arr[i] = power_left
-        energy_transfer_arr[i] = energy_transfer
-        i += 1
 
-    # UU to m.
-    trajectory_x /= 50
-    trajectory_y /= 50
-    distance /= 50
-    bullet_velocity /= 50
+# No explicit signature, see simulate_until. The parallel
+# part is in _simulate_batch_into, which takes the drag
+# tables as a plain argument.
+@nb.njit(cache=True)
+def simulate_batch_into(
+        out: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: npt.NDArray[np.int64],
+        ballistic_coeff: npt.NDArray[np.float64],
+        aim_dir_x: npt.NDArray[np.float64],
+        aim_dir_y: npt.NDArray[np.float64],
+        muzzle_velocity: npt.NDArray[np.float64],
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: npt.NDArray[np.int64],
+        instant_damage: npt.NDArray[np.int64],
+        pre_fire_trace_len: npt.NDArray[np.int64],
+        start_loc_x: npt.NDArray[np.float64],
+        start_loc_y: npt.NDArray[np.float64],
+        drag_tables=None,
+) -> npt.NDArray[np.int64]:
+    """Like `simulate_batch`, but writes the results into the
+    caller provided array `out` of shape (n_shots, 8, N).
+    The dtype of `out` (float64 or float32) selects the precision.
+
+    Returns the number of columns filled for each shot.
+    """
+    tables = _resolve_drag_tables(drag_tables)
+    n_shots = drag_func.shape[0]
+    if (out.shape[0] != n_shots
+            or ballistic_coeff.shape[0] != n_shots
+            or aim_dir_x.shape[0] != n_shots
+            or aim_dir_y.shape[0] != n_shots
+            or muzzle_velocity.shape[0] != n_shots
+            or falloff_x.shape[0] != n_shots
+            or falloff_y.shape[0] != n_shots
+            or bullet_damage.shape[0] != n_shots
+            or instant_damage.shape[0] != n_shots
+            or pre_fire_trace_len.shape[0] != n_shots
+            or start_loc_x.shape[0] != n_shots
+            or start_loc_y.shape[0] != n_shots):
+        raise ValueError("all per-shot arrays must have the same length")
+    if out.shape[1] != NUM_CHANNELS:
+        raise ValueError("out must have one row per channel")
+    # Checked here, raising inside the parallel loop is not supported.
+    for j in range(n_shots):
+        if not is_valid_drag_func(tables, drag_func[j]):
+            raise ValueError("invalid drag function")
 
-    ret = np.empty(shape=(8, arr_len), dtype=np.float64)
-    ret[0] = trajectory_x
-    ret[1] = trajectory_y
-    ret[2] = damage
-    ret[3] = distance
-    ret[4] = time_at_flight
-    ret[5] = bullet_velocity
-    ret[6] = energy_transfer_arr
-    ret[7] = power_left_arr
+    return _simulate_batch_into(
+        out,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        aim_dir_x,
+        aim_dir_y,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        start_loc_x,
+        start_loc_y,
+        tables,
+    )
+
+# No explicit signature, see simulate_until.
+@nb.njit(cache=True)
+def simulate_batch(
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: npt.NDArray[np.int64],
+        ballistic_coeff: npt.NDArray[np.float64],
+        aim_dir_x: npt.NDArray[np.float64],
+        aim_dir_y: npt.NDArray[np.float64],
+        muzzle_velocity: npt.NDArray[np.float64],
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: npt.NDArray[np.int64],
+        instant_damage: npt.NDArray[np.int64],
+        pre_fire_trace_len: npt.NDArray[np.int64],
+        start_loc_x: npt.NDArray[np.float64],
+        start_loc_y: npt.NDArray[np.float64],
+        drag_tables=None,
+) -> npt.NDArray[np.float64]:
+    """Simulate multiple shots in parallel. Every per-shot
+    parameter is an array with one element per shot. Falloff
+    curves are given as 2D arrays with one curve per row,
+    so all curves in the batch must have the same number of points.
+    `instant_damage` and `pre_fire_trace_len` are not used, see
+    `simulate`.
+
+    Returns an array of shape (n_shots, 8, n_steps), where each
+    [i] is the same result `simulate` returns for shot i.
+    """
+    num_steps = math.ceil(sim_time / time_step)
+    arr_len = num_steps - 1
+
+    ret = np.empty(
+        shape=(drag_func.shape[0], NUM_CHANNELS, arr_len), dtype=np.float64)
+    simulate_batch_into(
+        ret,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        aim_dir_x,
+        aim_dir_y,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        instant_damage,
+        pre_fire_trace_len,
+        start_loc_x,
+        start_loc_y,
+        drag_tables,
+    )
     return ret
 
 
+def set_num_threads(n: int):
+    """Set the number of threads used by the parallel
+    simulation functions, e.g. `simulate_batch`.
+    Must be between 1 and `max_num_threads()`.
+    """
+    nb.set_num_threads(n)
+
+
+def get_num_threads() -> int:
+    """Number of threads currently used by the parallel
+    simulation functions.
+    """
+    return nb.get_num_threads()
+
+
+def max_num_threads() -> int:
+    """Maximum number of threads available to the parallel
+    simulation functions (NUMBA_NUM_THREADS).
+    """
+    return nb.config.NUMBA_NUM_THREADS  # type: ignore[attr-defined]
+
+
 def trigger_jit() -> bool:
     """Convenience function to trigger JIT compilation
     for all simulation functions.
     """
+    # Imported here to avoid a circular import.
+    from rs2simlib.fast.sim.adaptive import simulate_adaptive
+    from rs2simlib.fast.sim.dispersion import simulate_dispersion
+    from rs2simlib.fast.sim.instrument import simulate_instrumented
+    from rs2simlib.fast.sim.zeroing import solve_aim_angles
+
     calc_damage(
         np.float64(1.0),
         np.float64(1.0),
@@ -209,7 +1175,7 @@ def trigger_jit() -> bool:
     simulate(
         sim_time=np.float64(0.21),
         time_step=np.float64(0.1),
-        drag_func=7,
+        drag_func=np.int64(7),
         ballistic_coeff=np.float64(0.15),
         aim_dir_x=np.float64(0.0),
         aim_dir_y=np.float64(0.0),
@@ -223,4 +1189,143 @@ def trigger_jit() -> bool:
         start_loc_y=np.float64(0.0),
     )
 
+    simulate_until(
+        sim_time=np.float64(0.21),
+        time_step=np.float64(0.1),
+        drag_func=np.int64(7),
+        ballistic_coeff=np.float64(0.15),
+        aim_dir_x=np.float64(1.0),
+        aim_dir_y=np.float64(0.0),
+        muzzle_velocity=np.float64(15000.0),
+        falloff_x=np.array([1.0, 1.0]),
+        falloff_y=np.array([0.1, 0.1]),
+        bullet_damage=np.int64(100),
+        instant_damage=np.int64(101),
+        pre_fire_trace_len=np.int64(1),
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        min_y=np.float64(-1.0),
+        max_distance=np.float64(100.0),
+        min_speed=np.float64(10.0),
+        min_damage=np.float64(1.0),
+        channels=np.int64(Channel.X | Channel.Y | Channel.DISTANCE),
+    )
+
+    simulate_into(
+        out=np.empty((2, 2), dtype=np.float64),
+        sim_time=np.float64(0.21),
+        time_step=np.float64(0.1),
+        drag_func=np.int64(7),
+        ballistic_coeff=np.float64(0.15),
+        aim_dir_x=np.float64(1.0),
+        aim_dir_y=np.float64(0.0),
+        muzzle_velocity=np.float64(15000.0),
+        falloff_x=np.array([1.0, 1.0]),
+        falloff_y=np.array([0.1, 0.1]),
+        bullet_damage=np.int64(100),
+        instant_damage=np.int64(101),
+        pre_fire_trace_len=np.int64(1),
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        min_y=np.float64(-1.0),
+        max_distance=np.float64(100.0),
+        min_speed=np.float64(10.0),
+        min_damage=np.float64(1.0),
+        channels=np.int64(Channel.X | Channel.Y),
+    )
+
+    simulate_checkpoints(
+        checkpoints=np.array([1.0, 2.0]),
+        sim_time=np.float64(0.21),
+        time_step=np.float64(0.1),
+        drag_func=np.int64(7),
+        ballistic_coeff=np.float64(0.15),
+        aim_dir_x=np.float64(1.0),
+        aim_dir_y=np.float64(0.0),
+        muzzle_velocity=np.float64(15000.0),
+        falloff_x=np.array([1.0, 1.0]),
+        falloff_y=np.array([0.1, 0.1]),
+        bullet_damage=np.int64(100),
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        by_distance=True,
+        integrator=np.int64(Integrator.EULER),
+    )
+
+    simulate_batch(
+        sim_time=np.float64(0.21),
+        time_step=np.float64(0.1),
+        drag_func=np.array([1, 7], dtype=np.int64),
+        ballistic_coeff=np.array([0.15, 0.15]),
+        aim_dir_x=np.array([1.0, 1.0]),
+        aim_dir_y=np.array([0.0, 0.0]),
+        muzzle_velocity=np.array([15000.0, 15000.0]),
+        falloff_x=np.array([[1.0, 1.0], [1.0, 1.0]]),
+        falloff_y=np.array([[0.1, 0.1], [0.1, 0.1]]),
+        bullet_damage=np.array([100, 100], dtype=np.int64),
+        instant_damage=np.array([101, 101], dtype=np.int64),
+        pre_fire_trace_len=np.array([1, 1], dtype=np.int64),
+        start_loc_x=np.array([0.0, 0.0]),
+        start_loc_y=np.array([0.0, 0.0]),
+    )
+
+    simulate_adaptive(
+        samples=np.array([0.05, 0.1]),
+        sim_time=np.float64(0.21),
+        drag_func=np.int64(7),
+        ballistic_coeff=np.float64(0.15),
+        aim_dir_x=np.float64(1.0),
+        aim_dir_y=np.float64(0.0),
+        muzzle_velocity=np.float64(15000.0),
+        falloff_x=np.array([1.0, 1.0]),
+        falloff_y=np.array([0.1, 0.1]),
+        bullet_damage=np.int64(100),
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        by_distance=False,
+        rtol=np.float64(1e-8),
+        atol=np.float64(1e-6),
+    )
+
+    simulate_dispersion(
+        ranges=np.array([1.0]),
+        num_shots=1,
+        num_projectiles=1,
+        spread=0.01,
+        sim_time=0.21,
+        time_step=0.1,
+        drag_func=7,
+        ballistic_coeff=0.15,
+        muzzle_velocity=15000.0,
+        falloff_x=np.array([1.0, 1.0]),
+        falloff_y=np.array([0.1, 0.1]),
+        bullet_damage=100,
+        num_streams=1,
+    )
+
+    solve_aim_angles(
+        target_x=np.array([10.0]),
+        target_y=np.array([0.0]),
+        sim_time=np.float64(0.21),
+        time_step=np.float64(0.1),
+        drag_func=np.int64(7),
+        ballistic_coeff=np.float64(0.15),
+        muzzle_velocity=np.float64(15000.0),
+    )
+
+    simulate_instrumented(
+        sim_time=np.float64(0.21),
+        time_step=np.float64(0.1),
+        drag_func=np.int64(7),
+        ballistic_coeff=np.float64(0.15),
+        aim_dir_x=np.float64(1.0),
+        aim_dir_y=np.float64(0.0),
+        muzzle_velocity=np.float64(15000.0),
+        falloff_x=np.array([1.0, 1.0]),
+        falloff_y=np.array([0.1, 0.1]),
+        bullet_damage=np.int64(100),
+        instant_damage=np.int64(101),
+        pre_fire_trace_len=np.int64(1),
+    )
+
     return True
@@ -0,0 +1,146 @@
+"""Work counters for profiling simulations."""
+
+import math
+from typing import NamedTuple
+from typing import Tuple
+
+import numba as nb
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.sim.fastsim import COUNTER_DRAG_EVALUATIONS
+from rs2simlib.fast.sim.fastsim import COUNTER_INTERP_CALLS
+from rs2simlib.fast.sim.fastsim import COUNTER_MACH_REGIONS
+from rs2simlib.fast.sim.fastsim import COUNTER_STEPS
+from rs2simlib.fast.sim.fastsim import COUNTER_SUBSONIC_STEPS
+from rs2simlib.fast.sim.fastsim import COUNTER_SUPERSONIC_STEPS
+from rs2simlib.fast.sim.fastsim import Channel
+from rs2simlib.fast.sim.fastsim import MACH_REGION_EDGES
+from rs2simlib.fast.sim.fastsim import NUM_COUNTERS
+from rs2simlib.fast.sim.fastsim import STATE_SIZE
+from rs2simlib.fast.sim.fastsim import _init_state
+from rs2simlib.fast.sim.fastsim import _resolve_drag_tables
+from rs2simlib.fast.sim.fastsim import _simulate_steps
+from rs2simlib.fast.sim.fastsim import channel_rows
+from rs2simlib.models import Integrator
+
+
+class SimCounters(NamedTuple):
+    """Work done by a simulation.
+
+    `drag_evaluations_by_mach[k]` counts the drag evaluations of
+    steps that start at a Mach number in
+    `[mach_region_edges[k - 1], mach_region_edges[k])`, with the
+    first and last regions open ended. Supersonic steps start at
+    Mach 1 or above. `interp_calls` counts the damage falloff
+    interpolations.
+    """
+    steps: int
+    drag_evaluations: int
+    interp_calls: int
+    supersonic_steps: int
+    subsonic_steps: int
+    drag_evaluations_by_mach: npt.NDArray[np.int64]
+    mach_region_edges: npt.NDArray[np.float64]
+
+
+# No explicit signature, see simulate_until.
+@nb.njit(cache=True)
+def _simulate_counted(
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        aim_dir_x,
+        aim_dir_y,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        start_loc_x,
+        start_loc_y,
+        integrator,
+        drag_tables,
+):
+    tables = _resolve_drag_tables(drag_tables)
+    arr_len = math.ceil(sim_time / time_step) - 1
+    rows = channel_rows(np.int64(Channel.ALL))
+    ret = np.empty(shape=(rows.max() + 1, arr_len), dtype=np.float64)
+    state = np.empty(STATE_SIZE, dtype=np.float64)
+    counters = np.zeros(NUM_COUNTERS, dtype=np.int64)
+    _init_state(
+        state, aim_dir_x, aim_dir_y, muzzle_velocity, start_loc_x,
+        start_loc_y)
+    _simulate_steps(
+        ret,
+        rows,
+        state,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        -np.inf,
+        np.inf,
+        -np.inf,
+        -np.inf,
+        integrator,
+        tables,
+        counters,
+    )
+    return ret, counters
+
+
+def simulate_instrumented(
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        aim_dir_x: np.float64,
+        aim_dir_y: np.float64,
+        muzzle_velocity: np.float64,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: np.int64,
+        instant_damage: np.int64,
+        pre_fire_trace_len: np.int64,
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        integrator=np.int64(Integrator.EULER),
+        drag_tables=None,
+) -> Tuple[npt.NDArray[np.float64], SimCounters]:
+    """`simulate` with work counters. Returns the same result
+    array as `simulate` and the `SimCounters`.
+
+    The counting is compiled into a separate specialization of
+    the simulation kernel, `simulate` and the other functions do
+    not pay for it.
+    """
+    ret, counters = _simulate_counted(
+        np.float64(sim_time),
+        np.float64(time_step),
+        np.int64(drag_func),
+        np.float64(ballistic_coeff),
+        np.float64(aim_dir_x),
+        np.float64(aim_dir_y),
+        np.float64(muzzle_velocity),
+        np.asarray(falloff_x, dtype=np.float64),
+        np.asarray(falloff_y, dtype=np.float64),
+        np.int64(bullet_damage),
+        np.float64(start_loc_x),
+        np.float64(start_loc_y),
+        np.int64(integrator),
+        drag_tables,
+    )
+    return ret, SimCounters(
+        steps=int(counters[COUNTER_STEPS]),
+        drag_evaluations=int(counters[COUNTER_DRAG_EVALUATIONS]),
+        interp_calls=int(counters[COUNTER_INTERP_CALLS]),
+        supersonic_steps=int(counters[COUNTER_SUPERSONIC_STEPS]),
+        subsonic_steps=int(counters[COUNTER_SUBSONIC_STEPS]),
+        drag_evaluations_by_mach=counters[COUNTER_MACH_REGIONS:].copy(),
+        mach_region_edges=np.array(MACH_REGION_EDGES),
+    )
@@ -0,0 +1,178 @@
+"""Per-bullet range tables with a persistent on-disk cache."""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.sim.cachedir import cache_root
+from rs2simlib.fast.sim.fastsim import simulate_checkpoints
+from rs2simlib.models import Bullet
+from rs2simlib.models import Integrator
+from rs2simlib.models import interp_dmg_falloff
+
+# Part of every cache key. Bump when the simulation changes
+# in a way that changes the results for the same inputs.
+RANGE_TABLE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """`range_tables` directory in `cache_root()`."""
+    return cache_root() / "range_tables"
+
+
+@dataclass(frozen=True)
+class RangeTable:
+    """Simulation results of a single bullet, fired horizontally,
+    at fixed ranges (distance traveled [m]).
+
+    `data` has the same 8 rows as the result of `simulate`, with
+    one column per range. Ranges the bullet does not reach within
+    the simulation time are NaN.
+    """
+    key: str
+    ranges: npt.NDArray[np.float64]
+    data: npt.NDArray[np.float64]
+
+    @property
+    def drop(self) -> npt.NDArray[np.float64]:
+        """Drop (negative height) in meters."""
+        return -self.data[1]
+
+    @property
+    def damage(self) -> npt.NDArray[np.float64]:
+        return self.data[2]
+
+    @property
+    def time(self) -> npt.NDArray[np.float64]:
+        """Time of flight in seconds."""
+        return self.data[4]
+
+    @property
+    def velocity(self) -> npt.NDArray[np.float64]:
+        """Velocity in m/s."""
+        return self.data[5]
+
+
+class RangeTableBuilder:
+    """Builds `RangeTable`s for bullets on a fixed range grid
+    with fixed integration settings.
+
+    Tables are cached in memory and on disk in `cache_dir`. The
+    cache key is a hash of the resolved ballistic parameters of
+    the bullet (speed, ballistic coefficient, drag function,
+    damage and damage falloff) and the integration settings, so
+    a cached table is never used once any of these change.
+    """
+
+    def __init__(
+            self,
+            ranges: npt.ArrayLike,
+            sim_time: float = 5.0,
+            time_step: float = 1 / 500,
+            integrator: Integrator = Integrator.EULER,
+            cache_dir: Optional[Union[str, Path]] = None,
+    ):
+        self.ranges = np.array(ranges, dtype=np.float64)
+        if self.ranges.ndim != 1 or (np.diff(self.ranges) < 0).any():
+            raise ValueError("ranges must be a 1D array in ascending order")
+        self.sim_time = float(sim_time)
+        self.time_step = float(time_step)
+        self.integrator = Integrator(integrator)
+        self.cache_dir = (
+            default_cache_dir() if cache_dir is None else Path(cache_dir))
+        self._tables: Dict[str, RangeTable] = {}
+
+    def key(self, bullet: Bullet) -> str:
+        """Cache key of the range table of `bullet`."""
+        fo_x, fo_y = interp_dmg_falloff(bullet.get_damage_falloff())
+        params = {
+            "version": RANGE_TABLE_VERSION,
+            "speed": float(bullet.get_speed()),
+            "ballistic_coeff": float(bullet.get_ballistic_coeff()),
+            "drag_func": bullet.get_drag_func_int(),
+            "damage": int(bullet.get_damage()),
+            "falloff_x": fo_x.astype(np.float64).tolist(),
+            "falloff_y": fo_y.astype(np.float64).tolist(),
+            "sim_time": self.sim_time,
+            "time_step": self.time_step,
+            "integrator": int(self.integrator),
+            "ranges": self.ranges.tolist(),
+        }
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def build(self, bullet: Bullet) -> RangeTable:
+        """Return the range table of `bullet`, computing it only
+        if it is not in the memory or disk cache.
+        """
+        key = self.key(bullet)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._load(key)
+            if table is None:
+                table = self._compute(key, bullet)
+                self._save(table)
+            self._tables[key] = table
+        return table
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def _compute(self, key: str, bullet: Bullet) -> RangeTable:
+        fo_x, fo_y = interp_dmg_falloff(bullet.get_damage_falloff())
+        data, _ = simulate_checkpoints(
+            checkpoints=self.ranges,
+            sim_time=np.float64(self.sim_time),
+            time_step=np.float64(self.time_step),
+            drag_func=np.int64(bullet.get_drag_func_int()),
+            ballistic_coeff=np.float64(bullet.get_ballistic_coeff()),
+            aim_dir_x=np.float64(1.0),
+            aim_dir_y=np.float64(0.0),
+            muzzle_velocity=np.float64(bullet.get_speed_uu()),
+            falloff_x=np.ascontiguousarray(fo_x, dtype=np.float64),
+            falloff_y=np.ascontiguousarray(fo_y, dtype=np.float64),
+            bullet_damage=np.int64(bullet.get_damage()),
+            by_distance=True,
+            integrator=np.int64(self.integrator),
+        )
+        return RangeTable(key=key, ranges=self.ranges, data=data)
+
+    def _load(self, key: str) -> Optional[RangeTable]:
+        try:
+            with np.load(self._path(key)) as npz:
+                if str(npz["key"]) != key:
+                    return None
+                return RangeTable(
+                    key=key, ranges=npz["ranges"], data=npz["data"])
+        except (OSError, KeyError, ValueError):
+            # Missing or unreadable (e.g. truncated) entry.
+            return None
+
+    def _save(self, table: RangeTable):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent
+        # readers never see a partially written entry.
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, key=table.key, ranges=table.ranges,
+                         data=table.data)
+            os.replace(tmp, self._path(table.key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self):
+        """Remove all cached range tables from memory and disk."""
+        self._tables.clear()
+        for path in self.cache_dir.glob("*.npz"):
+            path.unlink(missing_ok=True)
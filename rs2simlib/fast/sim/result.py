@@ -0,0 +1,96 @@
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.sim.fastsim import Channel
+from rs2simlib.fast.sim.fastsim import NUM_CHANNELS
+from rs2simlib.fast.sim.fastsim import StopReason
+
+
+class SimResult:
+    """Named, zero-copy views into a simulation result array.
+
+    Wraps a result array as returned by e.g. `simulate`,
+    `simulate_until` or filled by `simulate_into`. Each channel
+    property (`x`, `y`, `damage`, ...) returns a view of the
+    filled part of the corresponding row; no data is copied.
+    """
+    __slots__ = ("_rows", "channels", "data", "n", "stop_reason")
+
+    def __init__(
+            self,
+            data: npt.NDArray[np.float64],
+            channels: int = Channel.ALL,
+            n: Optional[int] = None,
+            stop_reason: StopReason = StopReason.SIM_TIME,
+    ):
+        self._rows = [-1] * NUM_CHANNELS
+        row = 0
+        for c in range(NUM_CHANNELS):
+            if channels & (1 << c):
+                self._rows[c] = row
+                row += 1
+        if row == 0:
+            raise ValueError("invalid channel mask")
+        if data.ndim != 2 or data.shape[0] != row:
+            raise ValueError(
+                f"expected data with {row} rows, got shape {data.shape}")
+
+        self.data = data
+        self.channels = int(channels)
+        self.n = data.shape[1] if n is None else n
+        self.stop_reason = StopReason(stop_reason)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, channel: Channel) -> npt.NDArray[np.float64]:
+        index = int(channel).bit_length() - 1
+        # A single channel, not a mask of several.
+        if not 0 <= index < NUM_CHANNELS or channel & (channel - 1):
+            raise KeyError(f"not a single channel: {channel!r}")
+        row = self._rows[index]
+        if row < 0:
+            raise KeyError(f"channel not in result: {channel!r}")
+        return self.data[row, :self.n]
+
+    def __contains__(self, channel: Channel) -> bool:
+        return bool(self.channels & channel)
+
+    @property
+    def x(self) -> npt.NDArray[np.float64]:
+        """Trajectory x-coordinate in meters."""
+        return self[Channel.X]
+
+    @property
+    def y(self) -> npt.NDArray[np.float64]:
+        """Trajectory y-coordinate in meters."""
+        return self[Channel.Y]
+
+    @property
+    def damage(self) -> npt.NDArray[np.float64]:
+        return self[Channel.DAMAGE]
+
+    @property
+    def distance(self) -> npt.NDArray[np.float64]:
+        """Distance traveled in meters."""
+        return self[Channel.DISTANCE]
+
+    @property
+    def time(self) -> npt.NDArray[np.float64]:
+        """Flight time in seconds."""
+        return self[Channel.TIME]
+
+    @property
+    def velocity(self) -> npt.NDArray[np.float64]:
+        """Speed in m/s."""
+        return self[Channel.VELOCITY]
+
+    @property
+    def energy_transfer(self) -> npt.NDArray[np.float64]:
+        return self[Channel.ENERGY_TRANSFER]
+
+    @property
+    def power_left(self) -> npt.NDArray[np.float64]:
+        return self[Channel.POWER_LEFT]
@@ -0,0 +1,188 @@
+"""Content addressed on-disk cache of simulation results.
+
+Results are stored as one `.npy` file per set of inputs, named by
+a hash of the function name, all of its (numeric) arguments,
+including defaults, and the library version. Entries are written
+atomically, so any number of processes can share a cache
+directory, and can be memory-mapped when loaded.
+"""
+
+import hashlib
+import inspect
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.sim.cachedir import cache_root
+from rs2simlib.fast.sim.fastsim import simulate
+
+# Part of every cache key. Bump when the simulation changes
+# in a way that changes the results for the same inputs.
+SIM_CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def default_cache_dir() -> Path:
+    """`simulate` directory in `cache_root()`."""
+    return cache_root() / "simulate"
+
+
+def _update_hash(h: "hashlib._Hash", value: Any):
+    if value is None:
+        h.update(b"N")
+    elif isinstance(value, (type, np.dtype)):
+        # E.g. the dtype argument of simulate_until.
+        h.update(f"D{np.dtype(value).str}".encode())
+    elif isinstance(value, tuple):
+        # E.g. fast.drag.DragTables.
+        h.update(f"T{len(value)}".encode())
+        for item in value:
+            _update_hash(h, item)
+    else:
+        arr = np.ascontiguousarray(value)
+        if arr.dtype == object:
+            raise TypeError(f"cannot hash argument of type {type(value)}")
+        h.update(f"A{arr.dtype.str}{arr.shape}".encode())
+        h.update(arr.tobytes())
+
+
+class SimCache:
+    """Memoizes functions returning a single array, such as
+    `simulate` or `simulate_batch`, in `directory`.
+
+    The total size of the cache is kept below `max_bytes` by
+    removing the least recently used entries after each store.
+    Entries are touched on every hit, so the file modification
+    time is the time of last use.
+
+    Concurrent use from many processes is safe: entries are
+    written to a temporary file and renamed into place, and a
+    reader that loses an entry to another process's eviction
+    recomputes it. Memory-mapped results stay valid after their
+    file is evicted on POSIX systems.
+    """
+
+    def __init__(
+            self,
+            directory: Optional[Union[str, Path]] = None,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            mmap: bool = True,
+    ):
+        self.directory = (
+            default_cache_dir() if directory is None else Path(directory))
+        self.max_bytes = int(max_bytes)
+        self.mmap = mmap
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, func: Callable, *args, **kwargs) -> str:
+        """Cache key of `func(*args, **kwargs)`."""
+        # Numba dispatchers keep the Python function in py_func.
+        py_func = getattr(func, "py_func", func)
+        bound = inspect.signature(py_func).bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        from rs2simlib import __version__
+
+        h = hashlib.sha256()
+        h.update(f"{SIM_CACHE_VERSION}:{__version__}:".encode())
+        h.update(f"{py_func.__module__}.{py_func.__qualname__}:".encode())
+        for name, value in bound.arguments.items():
+            h.update(f"{name}=".encode())
+            _update_hash(h, value)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[npt.NDArray]:
+        """Cached result for `key`, or None."""
+        path = self._path(key)
+        try:
+            data = np.load(path, mmap_mode="r" if self.mmap else None)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Missing, evicted or unreadable entry.
+            return None
+        return data
+
+    def put(self, key: str, data: npt.NDArray):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent
+        # readers never see a partially written entry.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def call(self, func: Callable, *args, **kwargs) -> npt.NDArray:
+        """`func(*args, **kwargs)`, loaded from the cache if the
+        same call has been made before. `func` must return a single
+        array; functions returning e.g. a tuple (`simulate_until`)
+        raise TypeError.
+        """
+        key = self.key(func, *args, **kwargs)
+        data = self.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = func(*args, **kwargs)
+        if not isinstance(data, np.ndarray):
+            raise TypeError(
+                f"cannot cache result of type {type(data).__name__}")
+        self.put(key, data)
+        return data
+
+    def simulate(self, *args, **kwargs) -> npt.NDArray[np.float64]:
+        """Cached `fastsim.simulate`."""
+        return self.call(simulate, *args, **kwargs)
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        """Total size of the cached entries in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache
+        fits in `max_bytes`.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort(key=lambda e: e[0])
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        """Remove all cached entries."""
+        for path in self.directory.glob("*.npy"):
+            path.unlink(missing_ok=True)
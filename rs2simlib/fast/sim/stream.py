@@ -0,0 +1,102 @@
+"""Simulation results streamed in fixed size chunks."""
+
+import math
+from typing import Generator
+
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.drag import STANDARD_DRAG_TABLES
+from rs2simlib.fast.sim.fastsim import Channel
+from rs2simlib.fast.sim.fastsim import STATE_SIZE
+from rs2simlib.fast.sim.fastsim import StopReason
+from rs2simlib.fast.sim.fastsim import _init_state
+from rs2simlib.fast.sim.fastsim import _simulate_steps
+from rs2simlib.fast.sim.fastsim import channel_rows
+from rs2simlib.models import Integrator
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def simulate_stream(
+        sim_time: float,
+        time_step: float,
+        drag_func: int,
+        ballistic_coeff: float,
+        aim_dir_x: float,
+        aim_dir_y: float,
+        muzzle_velocity: float,
+        falloff_x: npt.NDArray[np.float64],
+        falloff_y: npt.NDArray[np.float64],
+        bullet_damage: int,
+        start_loc_x: float = 0.0,
+        start_loc_y: float = 0.0,
+        min_y: float = -np.inf,
+        max_distance: float = np.inf,
+        min_speed: float = -np.inf,
+        min_damage: float = -np.inf,
+        channels: int = Channel.ALL,
+        dtype: npt.DTypeLike = np.float64,
+        integrator: Integrator = Integrator.EULER,
+        drag_tables=None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Generator[npt.NDArray, None, StopReason]:
+    """Like `simulate_until`, but yields the result in chunks of
+    at most `chunk_size` columns, so memory use does not depend
+    on `sim_time`. The integration state is carried over between
+    chunks, and the concatenated chunks are identical to the
+    result of `simulate_until`.
+
+    Each chunk is a new array, the generator keeps no reference
+    to it. The StopReason is the return value of the generator,
+    e.g. `reason = yield from simulate_stream(...)`.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    dtype = np.dtype(dtype)
+    if drag_tables is None:
+        drag_tables = STANDARD_DRAG_TABLES
+    rows = channel_rows(np.int64(channels))
+    num_rows = int(rows.max()) + 1
+    falloff_x = np.asarray(falloff_x, dtype=np.float64)
+    falloff_y = np.asarray(falloff_y, dtype=np.float64)
+
+    state = np.empty(STATE_SIZE, dtype=dtype)
+    _init_state(
+        state,
+        np.float64(aim_dir_x),
+        np.float64(aim_dir_y),
+        np.float64(muzzle_velocity),
+        np.float64(start_loc_x),
+        np.float64(start_loc_y),
+    )
+    # Same number of samples as simulate_until.
+    remaining = math.ceil(sim_time / time_step) - 1
+    while remaining > 0:
+        out = np.empty((num_rows, min(chunk_size, remaining)), dtype=dtype)
+        n, reason = _simulate_steps(
+            out,
+            rows,
+            state,
+            np.float64(sim_time),
+            np.float64(time_step),
+            np.int64(drag_func),
+            np.float64(ballistic_coeff),
+            np.float64(muzzle_velocity),
+            falloff_x,
+            falloff_y,
+            np.int64(bullet_damage),
+            np.float64(min_y),
+            np.float64(max_distance),
+            np.float64(min_speed),
+            np.float64(min_damage),
+            np.int64(integrator),
+            drag_tables,
+            None,
+        )
+        remaining -= int(n)
+        if n > 0:
+            yield out if n == out.shape[1] else out[:, :n].copy()
+        if reason != StopReason.SIM_TIME or n < out.shape[1]:
+            return StopReason(reason)
+    return StopReason.SIM_TIME
@@ -0,0 +1,319 @@
+import math
+
+import numba as nb
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.drag import DRAG_TABLES_TYPE
+from rs2simlib.fast.drag import DragTables
+from rs2simlib.fast.drag import is_valid_drag_func
+from rs2simlib.fast.sim.fastsim import GRAVITY
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR_INVERSE
+from rs2simlib.fast.sim.fastsim import X1
+from rs2simlib.fast.sim.fastsim import X2
+from rs2simlib.fast.sim.fastsim import _check_integrator
+from rs2simlib.fast.sim.fastsim import _resolve_drag_tables
+from rs2simlib.fast.sim.fastsim import _step
+from rs2simlib.models import Bullet
+from rs2simlib.models import Integrator
+
+# No low trajectory solution exists above this angle, drag
+# only lowers the angle of maximum range below 45 degrees.
+MAX_ANGLE = math.pi / 4
+# Bracket width [rad] at which the iteration gives up on
+# reaching the height tolerance, e.g. when a drag table
+# discontinuity makes the height jump over the target.
+MIN_BRACKET = 1e-12
+
+
+@nb.njit(cache=True, error_model="numpy", inline="always")
+def _height_at(
+        target_x,
+        angle,
+        sim_time,
+        time_step,
+        drag_func,
+        bc_inverse,
+        muzzle_velocity,
+        start_loc_x,
+        start_loc_y,
+        integrator,
+        drag_tables,
+):
+    """Height [UU] at which the shot fired at `angle` [rad]
+    crosses `target_x` [UU], linearly interpolated between the
+    two enclosing steps. The simulation stops as soon as the
+    shot passes the target. NaN if it does not get there within
+    `sim_time`.
+    """
+    loc_x = start_loc_x
+    loc_y = start_loc_y
+    vel_x = math.cos(angle) * muzzle_velocity
+    vel_y = math.sin(angle) * muzzle_velocity
+    d_accumulated = 0.0
+    flight_time = 0.0
+    while flight_time < sim_time:
+        flight_time += time_step
+        prev_x = loc_x
+        prev_y = loc_y
+        loc_x, loc_y, vel_x, vel_y, d_accumulated = _step(
+            integrator, loc_x, loc_y, vel_x, vel_y, d_accumulated,
+            time_step, drag_tables, drag_func, bc_inverse,
+            SCALE_FACTOR_INVERSE, SCALE_FACTOR, X1, X2, GRAVITY)
+        if loc_x >= target_x:
+            frac = (target_x - prev_x) / (loc_x - prev_x)
+            return prev_y + frac * (loc_y - prev_y)
+    return np.nan
+
+
+@nb.njit(
+    nb.float64(
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.int64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.int64,
+        nb.int64,
+        DRAG_TABLES_TYPE,
+    ),
+    cache=True,
+    error_model="numpy",
+)
+def _solve_angle(
+        target_x: np.float64,
+        target_y: np.float64,
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        muzzle_velocity: np.float64,
+        start_loc_x: np.float64,
+        start_loc_y: np.float64,
+        tol: np.float64,
+        max_iter: np.int64,
+        integrator: np.int64,
+        drag_tables: DragTables,
+) -> float:
+    """Low trajectory aim angle [rad] that hits (`target_x`,
+    `target_y`) [UU] within `tol` [UU]. NaN if out of range.
+    """
+    bc_inverse = 1.0 / ballistic_coeff
+    dx = target_x - start_loc_x
+    if not dx > 0.0:
+        return np.nan
+
+    # Gravity keeps the shot below the line of sight,
+    # which gives the lower end of the bracket.
+    lo = math.atan2(target_y - start_loc_y, dx)
+    f_lo = _height_at(
+        target_x, lo, sim_time, time_step, drag_func, bc_inverse,
+        muzzle_velocity, start_loc_x, start_loc_y, integrator,
+        drag_tables) - target_y
+    if math.isnan(f_lo):
+        return np.nan
+    if f_lo >= -tol:
+        return lo
+
+    # Expand upwards, starting from the small angle correction
+    # for the drop at the line of sight angle. The last step is
+    # clamped to MAX_ANGLE, out of range only if that falls short.
+    step = -f_lo / dx
+    hi = lo
+    f_hi = f_lo
+    while f_hi < 0.0:
+        if hi >= MAX_ANGLE:
+            return np.nan
+        lo = hi
+        f_lo = f_hi
+        hi = min(lo + step, MAX_ANGLE)
+        f_hi = _height_at(
+            target_x, hi, sim_time, time_step, drag_func, bc_inverse,
+            muzzle_velocity, start_loc_x, start_loc_y, integrator,
+            drag_tables) - target_y
+        if math.isnan(f_hi):
+            return np.nan
+        step *= 2.0
+    if f_hi <= tol:
+        return hi
+
+    # Newton iterations with the slope estimated from the last
+    # two points (secant), kept inside the bracket [lo, hi].
+    # Falls back to bisection when a step leaves the bracket
+    # or the bracket does not shrink fast enough.
+    x = hi
+    fx = f_hi
+    x_prev = lo
+    fx_prev = f_lo
+    # No bracket to compare with before the first step,
+    # which can always be a secant step.
+    width = np.inf
+    for _ in range(max_iter):
+        slope = (fx - fx_prev) / (x - x_prev)
+        x_new = x - fx / slope
+        if not (lo < x_new < hi) or (hi - lo) > 0.5 * width:
+            x_new = 0.5 * (lo + hi)
+        width = hi - lo
+        f_new = _height_at(
+            target_x, x_new, sim_time, time_step, drag_func, bc_inverse,
+            muzzle_velocity, start_loc_x, start_loc_y, integrator,
+            drag_tables) - target_y
+        if math.isnan(f_new):
+            return np.nan
+        if abs(f_new) <= tol:
+            return x_new
+        if f_new < 0.0:
+            lo = x_new
+        else:
+            hi = x_new
+        x_prev = x
+        fx_prev = fx
+        x = x_new
+        fx = f_new
+        if hi - lo <= MIN_BRACKET:
+            break
+    # Did not converge within `tol`.
+    return np.nan
+
+
+@nb.njit(
+    nb.float64[:](
+        nb.float64[:],
+        nb.float64[:],
+        nb.float64,
+        nb.float64,
+        nb.int64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.float64,
+        nb.int64,
+        nb.int64,
+        DRAG_TABLES_TYPE,
+    ),
+    cache=True,
+    parallel=True,
+)
+def _solve_aim_angles(
+        target_x: npt.NDArray[np.float64],
+        target_y: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        muzzle_velocity: np.float64,
+        start_loc_x: np.float64,
+        start_loc_y: np.float64,
+        tol: np.float64,
+        max_iter: np.int64,
+        integrator: np.int64,
+        drag_tables: DragTables,
+) -> npt.NDArray[np.float64]:
+    n = target_x.shape[0]
+    angles = np.empty(n, dtype=np.float64)
+    for j in nb.prange(n):
+        angles[j] = _solve_angle(
+            target_x[j] * 50,
+            target_y[j] * 50,
+            sim_time,
+            time_step,
+            drag_func,
+            ballistic_coeff,
+            muzzle_velocity,
+            start_loc_x,
+            start_loc_y,
+            tol * 50,
+            max_iter,
+            integrator,
+            drag_tables,
+        )
+    return angles
+
+
+# No explicit signature, see simulate_until. The parallel
+# part is in _solve_aim_angles, see simulate_batch_into.
+@nb.njit(cache=True)
+def solve_aim_angles(
+        target_x: npt.NDArray[np.float64],
+        target_y: npt.NDArray[np.float64],
+        sim_time: np.float64,
+        time_step: np.float64,
+        drag_func: np.int64,
+        ballistic_coeff: np.float64,
+        muzzle_velocity: np.float64,
+        start_loc_x=np.float64(0.0),
+        start_loc_y=np.float64(0.0),
+        tol=np.float64(1e-4),
+        max_iter=np.int64(50),
+        integrator=np.int64(Integrator.EULER),
+        drag_tables=None,
+) -> npt.NDArray[np.float64]:
+    """Solve the aim angle needed to hit each target, e.g.
+    for a sight table. Targets are solved in parallel.
+
+    `target_x` (range) and `target_y` (height) are in meters,
+    the other arguments are the same as for `simulate`. Returns
+    the low trajectory aim angle [rad] of each target, so that
+    `aim_dir = (cos(angle), sin(angle))` hits it within `tol` [m].
+    The angle is NaN for targets out of range (or not reached
+    within `sim_time`) and for targets not solved within `tol`
+    in `max_iter` iterations.
+
+    The targets are bracketed between the line of sight and an
+    angle above the target, then solved with Newton iterations
+    (secant slope) safeguarded by bisection. Each trajectory is
+    only simulated until it passes the target range.
+    """
+    tables = _resolve_drag_tables(drag_tables)
+    if target_x.shape[0] != target_y.shape[0]:
+        raise ValueError("target_x and target_y must have the same length")
+    # Checked here, raising inside the parallel loop is not supported.
+    if not is_valid_drag_func(tables, drag_func):
+        raise ValueError("invalid drag function")
+    _check_integrator(integrator)
+
+    return _solve_aim_angles(
+        target_x,
+        target_y,
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        muzzle_velocity,
+        start_loc_x,
+        start_loc_y,
+        tol,
+        max_iter,
+        integrator,
+        tables,
+    )
+
+
+def solve_bullet_aim_angles(
+        bullet: Bullet,
+        target_x: npt.ArrayLike,
+        target_y: npt.ArrayLike,
+        sim_time: float,
+        time_step: float,
+        tol: float = 1e-4,
+        integrator: Integrator = Integrator.EULER,
+) -> npt.NDArray[np.float64]:
+    """`solve_aim_angles` with the ballistic parameters of `bullet`."""
+    return solve_aim_angles(
+        target_x=np.asarray(target_x, dtype=np.float64),
+        target_y=np.asarray(target_y, dtype=np.float64),
+        sim_time=np.float64(sim_time),
+        time_step=np.float64(time_step),
+        drag_func=np.int64(bullet.get_drag_func_int()),
+        ballistic_coeff=np.float64(bullet.get_ballistic_coeff()),
+        muzzle_velocity=np.float64(bullet.get_speed_uu()),
+        tol=np.float64(tol),
+        integrator=np.int64(integrator),
+    )
@@ -0,0 +1,11 @@
+from .jitcache import build_bundle
+from .jitcache import install_bundle
+from .jitcache import set_cache_dir
+from .jitcache import warmup
+
+__all__ = [
+    "build_bundle",
+    "install_bundle",
+    "set_cache_dir",
+    "warmup",
+]
@@ -0,0 +1,36 @@
+"""Build or install a JIT cache bundle, e.g. in a container build:
+
+    python -m rs2simlib.jitcache build rs2simlib-jit.zip
+    python -m rs2simlib.jitcache install rs2simlib-jit.zip /var/cache/numba
+"""
+
+import argparse
+
+from rs2simlib.jitcache import build_bundle
+from rs2simlib.jitcache import install_bundle
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        prog="python -m rs2simlib.jitcache", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile and write a bundle")
+    build.add_argument("bundle")
+    install = sub.add_parser("install", help="install a bundle")
+    install.add_argument("bundle")
+    install.add_argument(
+        "cache_dir", nargs="?", default=None,
+        help="numba cache directory (default: NUMBA_CACHE_DIR)")
+    args = ap.parse_args()
+
+    if args.command == "build":
+        n = build_bundle(args.bundle)
+        print(f"wrote {n} cache files to {args.bundle}")
+    else:
+        n = install_bundle(args.bundle, args.cache_dir)
+        print(f"installed {n} cache files")
+
+
+if __name__ == "__main__":
+    main()
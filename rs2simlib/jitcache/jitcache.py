@@ -0,0 +1,279 @@
+"""Precompiled JIT cache bundles and background warmup.
+
+Numba caches the compiled `fast.drag` and `fast.sim` functions
+next to their source files, or in `NUMBA_CACHE_DIR` if it is set.
+The cache directory of a source directory is named after a hash
+of its absolute path, so a cache built in one install location
+is not found in another. A bundle stores the cache files relative
+to the package instead, and `install_bundle` places them where
+numba looks for them in the current install.
+
+The caches of the `fast` functions are stamped with a digest of
+all the source files they are built from, see `jitcache.locator`.
+
+This module does not import numba at import time, so
+`set_cache_dir` can be called before `rs2simlib.fast` is first
+imported.
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+BUNDLE_VERSION = 2
+
+MANIFEST = "manifest.json"
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# Packages with cached numba functions, relative to PACKAGE_DIR.
+JIT_PACKAGES = ("fast/drag", "fast/sim")
+
+# Other source files the compiled functions depend on, relative to
+# PACKAGE_DIR. The standard drag curves are frozen into the code.
+JIT_DEPENDENCIES = ("drag/tables.py",)
+
+WARMUP_CODE = "from rs2simlib.fast.sim import trigger_jit; trigger_jit()"
+
+
+def _cache_subpath(source_dir: Path) -> str:
+    # Same as numba.core.caching._CacheLocator.get_suitable_cache_subpath,
+    # which is only importable with numba.
+    subpath = os.path.abspath(source_dir)
+    hashed = hashlib.sha1(subpath.encode()).hexdigest()
+    return f"{os.path.basename(subpath)}_{hashed}"
+
+
+def _jit_sources(
+        package_dir: Path,
+        packages: Sequence[str],
+        dependencies: Sequence[str],
+) -> Dict[str, str]:
+    # Hashes of the source files of `packages` and of `dependencies`,
+    # by path relative to `package_dir`.
+    paths = [
+        path
+        for package in packages
+        for path in sorted((package_dir / package).glob("*.py"))
+    ]
+    paths.extend(package_dir / dependency for dependency in dependencies)
+    return {
+        path.relative_to(package_dir).as_posix():
+            hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in paths
+    }
+
+
+def _source_stamp(source: Path) -> Any:
+    # The stamp numba stores in a cache index and compares with the
+    # one of the source file.
+    from .locator import source_stamp
+
+    return source_stamp(source)
+
+
+# Errors of numba versions with a different cache index layout
+# or locator classes than the pinned ones.
+_INDEX_ERRORS = (
+    AttributeError, EOFError, ImportError, TypeError, ValueError,
+    pickle.UnpicklingError)
+
+
+def _restamp_index(index: bytes, stamp: Any) -> bytes:
+    # Same format as numba.core.caching.IndexDataCacheFile._save_index.
+    from numba.core.serialize import dumps
+
+    f = io.BytesIO(index)
+    version = pickle.load(f)
+    _, overloads = pickle.loads(f.read())
+    out = io.BytesIO()
+    pickle.dump(version, out, protocol=-1)
+    out.write(dumps((stamp, overloads)))
+    return out.getvalue()
+
+
+def _numba_version() -> str:
+    from importlib.metadata import version
+
+    return version("numba")
+
+
+def set_cache_dir(cache_dir: Union[str, Path]):
+    """Make numba use `cache_dir` for the JIT cache, e.g. when the
+    package directory is read-only. Must be called before
+    `rs2simlib.fast` is imported, numba picks the cache location
+    of a function when it is defined.
+    """
+    if "rs2simlib.fast" in sys.modules:
+        raise RuntimeError(
+            "set_cache_dir must be called before rs2simlib.fast is imported")
+    cache_dir = os.fspath(Path(cache_dir).resolve())
+    os.environ["NUMBA_CACHE_DIR"] = cache_dir
+    numba = sys.modules.get("numba")
+    if numba is not None:
+        numba.config.CACHE_DIR = cache_dir
+
+
+def build_bundle(path: Union[str, Path]) -> int:
+    """Compile all `fast` functions (see `fast.sim.trigger_jit`)
+    into an empty cache directory and write the cache files to
+    the bundle `path` (a zip file). Returns the number of cache
+    files in the bundle.
+
+    The compilation runs in a new interpreter, so the functions
+    already compiled in this process do not affect the bundle.
+    Numba compiles for the host CPU, so build the bundle on the
+    same CPU type the bundle is installed on.
+    """
+    return _build_bundle(
+        path, PACKAGE_DIR, JIT_PACKAGES, JIT_DEPENDENCIES, WARMUP_CODE)
+
+
+def _build_bundle(
+        path: Union[str, Path],
+        package_dir: Path,
+        packages: Sequence[str],
+        dependencies: Sequence[str],
+        warmup_code: str,
+) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "NUMBA_CACHE_DIR": tmp}
+        subprocess.run(
+            [sys.executable, "-c", warmup_code],
+            check=True,
+            env=env,
+        )
+
+        manifest: dict = {
+            "version": BUNDLE_VERSION,
+            "numba": _numba_version(),
+            "python": list(sys.version_info[:2]),
+            "packages": list(packages),
+            "sources": _jit_sources(package_dir, packages, dependencies),
+        }
+        num_files = 0
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for package in packages:
+                source_dir = package_dir / package
+                cache_dir = Path(tmp) / _cache_subpath(source_dir)
+                for file in sorted(cache_dir.glob("*.nb[ic]")):
+                    zf.write(file, f"{package}/{file.name}")
+                    num_files += 1
+            zf.writestr(MANIFEST, json.dumps(manifest, indent=2))
+    return num_files
+
+
+def install_bundle(
+        path: Union[str, Path],
+        cache_dir: Optional[Union[str, Path]] = None,
+) -> int:
+    """Extract the bundle `path` into `cache_dir` (default:
+    `NUMBA_CACHE_DIR`) for the current install location of the
+    package. Returns the number of cache files installed.
+
+    Nothing is installed if any of the source files differs from
+    the ones the bundle was built from, the compiled functions
+    inline code and data from each other's modules. The cache
+    indexes are stamped with the installed source files, so numba
+    loads them after a fresh checkout or install. Indexes that can
+    not be stamped, e.g. because the numba caching internals have
+    changed, are left out and numba compiles their functions. Files
+    are replaced atomically, so processes using the cache
+    directory at the same time never see partially written files.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get("NUMBA_CACHE_DIR")
+        if not cache_dir:
+            raise ValueError("no cache_dir given and NUMBA_CACHE_DIR not set")
+    return _install_bundle(
+        path, Path(cache_dir), PACKAGE_DIR, JIT_DEPENDENCIES)
+
+
+def _install_bundle(
+        path: Union[str, Path],
+        cache_dir: Path,
+        package_dir: Path,
+        dependencies: Sequence[str],
+) -> int:
+    num_files = 0
+    with zipfile.ZipFile(path) as zf:
+        manifest = json.loads(zf.read(MANIFEST))
+        if manifest.get("version") != BUNDLE_VERSION:
+            raise ValueError(
+                f"unsupported bundle version: {manifest.get('version')}")
+        if manifest["numba"] != _numba_version():
+            raise ValueError(
+                f"bundle was built with numba {manifest['numba']}, "
+                f"installed is {_numba_version()}")
+        if tuple(manifest["python"]) != sys.version_info[:2]:
+            raise ValueError(
+                f"bundle was built for Python {manifest['python']}")
+
+        packages = manifest["packages"]
+        if manifest["sources"] != _jit_sources(
+                package_dir, packages, dependencies):
+            return 0
+
+        for package in packages:
+            source_dir = package_dir / package
+            target_dir = cache_dir / _cache_subpath(source_dir)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for name in zf.namelist():
+                directory, _, file = name.rpartition("/")
+                if directory != package:
+                    continue
+                # E.g. "fastsim.simulate-440.py311.nbi", gufuncs
+                # have a prefix: "guf-fastdrag.drag_coeffs-412.py311.nbi".
+                source = file.partition(".")[0].rpartition("-")[2] + ".py"
+                data = zf.read(name)
+                if file.endswith(".nbi"):
+                    try:
+                        data = _restamp_index(
+                            data, _source_stamp(source_dir / source))
+                    except _INDEX_ERRORS:
+                        # Left out, numba compiles the function.
+                        continue
+                fd, tmp = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp, target_dir / file)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+                num_files += 1
+    return num_files
+
+
+def warmup(background: bool = True) -> Optional[threading.Thread]:
+    """Compile (or load from the cache) all `fast` functions with
+    `fast.sim.trigger_jit`. With `background`, this runs in a
+    daemon thread which is returned, join it to wait. Calls from
+    other threads wait for a function being compiled instead of
+    compiling it again.
+    """
+
+    def run():
+        from rs2simlib.fast.sim import trigger_jit
+
+        trigger_jit()
+
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="rs2simlib-warmup", daemon=True)
+    thread.start()
+    return thread
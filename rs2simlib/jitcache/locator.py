@@ -0,0 +1,158 @@
+"""Numba cache locator for the `fast` functions.
+
+Numba only compares the source file of a cached function with the
+one its cache was built from. The compiled `fast` functions also
+contain code inlined from other modules and data such as the
+standard drag curves of `drag.tables`, which are frozen into the
+compiled code. The locator adds a digest of all source files of a
+source set (see `register_source_set`) to the stamp of the functions
+defined in it, so editing any of them, e.g. a drag curve, recompiles
+the functions instead of loading stale code from the cache.
+
+Importing this module registers the locator and the source set of
+`rs2simlib.fast` (`jitcache.JIT_PACKAGES` and
+`jitcache.JIT_DEPENDENCIES`). Numba picks the locator of a function
+when it is defined, so `rs2simlib.fast` imports this module before
+its submodules.
+
+The locator relies on private numba caching classes of the numba
+versions pinned in `pyproject.toml`. If they change, it is not
+registered and the functions are cached by numba's own locators.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .jitcache import JIT_DEPENDENCIES
+from .jitcache import JIT_PACKAGES
+from .jitcache import PACKAGE_DIR
+from .jitcache import _jit_sources
+
+_caching: Any
+_CacheLocator: Any
+_NUMBA_LOCATORS: List[Any]
+try:
+    _caching = importlib.import_module("numba.core.caching")
+    _CacheLocator = _caching._CacheLocator
+    # Used by source_stamp, checked here.
+    _caching._SourceFileBackedLocatorMixin  # noqa: B018
+    # The numba locators, tried in order for the location of the cache.
+    _NUMBA_LOCATORS = list(_caching.CacheImpl._locator_classes)
+except (ImportError, AttributeError):
+    _caching = None
+    _CacheLocator = object
+    _NUMBA_LOCATORS = []
+
+
+class _SourceSet:
+
+    def __init__(self, package_dir: Path, packages: Sequence[str],
+                 dependencies: Sequence[str]):
+        self.package_dir = package_dir
+        self.packages = tuple(packages)
+        self.dependencies = tuple(dependencies)
+        self.source_dirs = frozenset(
+            os.path.normcase((package_dir / package).resolve())
+            for package in packages)
+        self._digest: Optional[str] = None
+
+    def digest(self) -> str:
+        # Computed once, when the first function is defined.
+        if self._digest is None:
+            sources = _jit_sources(
+                self.package_dir, self.packages, self.dependencies)
+            self._digest = hashlib.sha256(
+                json.dumps(sources, sort_keys=True).encode()).hexdigest()
+        return self._digest
+
+
+_source_sets: List[_SourceSet] = []
+
+
+def _find_source_set(py_file: str) -> Optional[_SourceSet]:
+    source_dir = os.path.normcase(Path(py_file).resolve().parent)
+    for source_set in _source_sets:
+        if source_dir in source_set.source_dirs:
+            return source_set
+    return None
+
+
+class SourceSetLocator(_CacheLocator):
+    """Cache location of the numba locator of a function (e.g.
+    `NUMBA_CACHE_DIR`), with the digest of its source set added
+    to the source stamp.
+    """
+
+    def __init__(self, locator: _CacheLocator, digest: str):
+        self._locator = locator
+        self._digest = digest
+
+    def ensure_cache_path(self):
+        self._locator.ensure_cache_path()
+
+    def get_cache_path(self) -> str:
+        return self._locator.get_cache_path()
+
+    def get_source_stamp(self) -> Tuple[Any, str]:
+        return self._locator.get_source_stamp(), self._digest
+
+    def get_disambiguator(self) -> str:
+        return self._locator.get_disambiguator()
+
+    @classmethod
+    def from_function(cls, py_func, py_file):
+        source_set = _find_source_set(py_file)
+        if source_set is None:
+            return None
+        for locator_class in _NUMBA_LOCATORS:
+            locator = locator_class.from_function(py_func, py_file)
+            if locator is not None:
+                try:
+                    return cls(locator, source_set.digest())
+                except TypeError:
+                    # E.g. a new abstract method of _CacheLocator.
+                    return None
+        return None
+
+
+def register_source_set(
+        package_dir: Path,
+        packages: Sequence[str],
+        dependencies: Sequence[str] = (),
+):
+    """Stamp the caches of the functions defined in `packages`
+    (directories relative to `package_dir`) with a digest of their
+    source files and the `dependencies` (files relative to
+    `package_dir`). Only affects functions defined afterwards.
+    """
+    _source_sets.append(_SourceSet(package_dir, packages, dependencies))
+
+
+def source_stamp(source: Path) -> Any:
+    """The source stamp numba stores in the cache index of a function
+    defined in `source` and compares with the current one. Raises
+    ImportError if the numba version is not supported.
+    """
+    if _caching is None:
+        raise ImportError("unsupported numba caching internals")
+    locator = _caching._SourceFileBackedLocatorMixin()
+    locator._py_file = os.fspath(source)
+    stamp = locator.get_source_stamp()
+    source_set = _find_source_set(os.fspath(source))
+    if source_set is None:
+        return stamp
+    return stamp, source_set.digest()
+
+
+if (_caching is not None
+        and SourceSetLocator not in _caching.CacheImpl._locator_classes):
+    _caching.CacheImpl._locator_classes.insert(0, SourceSetLocator)
+    register_source_set(PACKAGE_DIR, JIT_PACKAGES, JIT_DEPENDENCIES)
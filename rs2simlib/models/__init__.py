@@ -2,15 +2,18 @@ from .models import AltAmmoLoadout
 from .models import AltAmmoLoadoutParseResult
 from .models import Bullet
 from .models import BulletParseResult
+from .models import BulletSimulation
 from .models import ClassBase
 from .models import ClassLike
 from .models import DragFunction
+from .models import Integrator
 from .models import PROJECTILE
 from .models import ParseResult
 from .models import WEAPON
 from .models import Weapon
 from .models import WeaponParseResult
 from .models import WeaponSimulation
+from .models import freeze_class_map
 from .models import interp_dmg_falloff
 
 __all__ = [
@@ -18,14 +21,17 @@ __all__ = [
     "AltAmmoLoadoutParseResult",
     "Bullet",
     "BulletParseResult",
+    "BulletSimulation",
     "ClassBase",
     "ClassLike",
     "DragFunction",
+    "Integrator",
     "PROJECTILE",
     "ParseResult",
     "WEAPON",
     "Weapon",
     "WeaponParseResult",
     "WeaponSimulation",
+    "freeze_class_map",
     "interp_dmg_falloff",
 ]
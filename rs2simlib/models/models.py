@@ -1,10 +1,16 @@
+import weakref
+from dataclasses import MISSING
 from dataclasses import dataclass
 from dataclasses import field
+from dataclasses import fields
 from enum import Enum
+from enum import IntEnum
 from typing import Any
 from typing import Callable
+from typing import ClassVar
 from typing import Dict
 from typing import List
+from typing import Mapping
 from typing import Optional
 from typing import Tuple
 from typing import TypeVar
@@ -13,7 +19,11 @@ import numpy as np
 import numpy.typing as npt
 
 from rs2simlib.drag import drag_g1
+from rs2simlib.drag import drag_g2
+from rs2simlib.drag import drag_g5
+from rs2simlib.drag import drag_g6
 from rs2simlib.drag import drag_g7
+from rs2simlib.drag import drag_g8
 
 SCALE_FACTOR_INVERSE = 0.065618
 SCALE_FACTOR = 15.24
@@ -48,10 +58,46 @@ MAS_49_GRENADE_RANGE_VELOCITIES = {
 class DragFunction(Enum):
     Invalid = ""
     G1 = "RODF_G1"
+    G2 = "RODF_G2"
+    G5 = "RODF_G5"
+    G6 = "RODF_G6"
     G7 = "RODF_G7"
+    G8 = "RODF_G8"
 
 
-@dataclass
+class Integrator(IntEnum):
+    """Fixed time step integration schemes.
+
+    EULER is the semi-implicit Euler scheme used by the game.
+    """
+    EULER = 0
+    RK4 = 1
+    VERLET = 2
+
+
+def _set_state(obj: Any, state: Dict[str, Any]):
+    """Restore the pickled field dict `state` of a slots dataclass.
+    Fields missing from `state`, e.g. fields added after it was
+    pickled, are set to their default values.
+    """
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+    for f in fields(obj):
+        if f.name in state:
+            continue
+        if f.default is not MISSING:
+            object.__setattr__(obj, f.name, f.default)
+        elif f.default_factory is not MISSING:
+            object.__setattr__(obj, f.name, f.default_factory())
+
+
+# Shared default of parse results without a damage falloff
+# curve, parsing replaces it instead of writing into it.
+_NO_DAMAGE_FALLOFF = np.array([0.0, 0.0], dtype=np.float64)
+_NO_DAMAGE_FALLOFF.flags.writeable = False
+
+
+@dataclass(slots=True)
 class ParseResult:
     class_name: str = ""
     parent_name: str = ""
@@ -59,41 +105,74 @@ class ParseResult:
     def __eq__(self, other: "ParseResult"):
         return self.class_name.lower() == other.class_name.lower()
 
+    # Pickled as a dict of the fields, like the regular (non-slots)
+    # dataclasses were, so that either can load the other's pickles.
+    def __getstate__(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
-# TODO: NumProjectiles and Spread?
-@dataclass
+    def __setstate__(self, state: Dict[str, Any]):
+        _set_state(self, state)
+
+
+@dataclass(slots=True)
 class WeaponParseResult(ParseResult):
     bullet_names: Dict[int, str] = field(default_factory=dict)
     instant_damages: Dict[int, int] = field(default_factory=dict)
     alt_ammo_loadouts: Dict[
         int, "AltAmmoLoadoutParseResult"] = field(default_factory=dict)
     pre_fire_length: int = -1
+    num_projectiles: Dict[int, int] = field(default_factory=dict)
+    spreads: Dict[int, float] = field(default_factory=dict)
 
 
-# TODO: NumProjectiles and Spread?
-@dataclass
+@dataclass(slots=True)
 class AltAmmoLoadoutParseResult(ParseResult):
     # TODO: just build lists directly here?
     bullet_names: Dict[int, str] = field(default_factory=dict)
     instant_damages: Dict[int, int] = field(default_factory=dict)
+    num_projectiles: Dict[int, int] = field(default_factory=dict)
+    spreads: Dict[int, float] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class BulletParseResult(ParseResult):
     # TODO: add damage type?
     speed: float = -1
     damage: int = -1
     damage_falloff: npt.NDArray[np.float64] = field(
-        default_factory=lambda: np.array(
-            [0.0, 0.0], dtype=np.float64))
+        default_factory=lambda: _NO_DAMAGE_FALLOFF)
     drag_func: DragFunction = DragFunction.Invalid
     ballistic_coeff: float = -1
 
 
-@dataclass
+def _is_set(value: Any) -> bool:
+    return value != -1
+
+
+def _is_valid_drag_func(value: DragFunction) -> bool:
+    return value != DragFunction.Invalid
+
+
+def _has_falloff(value: npt.NDArray[np.float64]) -> bool:
+    return bool((value > 0).any())
+
+
+@dataclass(slots=True, weakref_slot=True)
 class ClassBase:
+    # Before the other fields, so that they are set
+    # when __init__ first calls __setattr__.
+    _frozen: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _dependents: Optional["weakref.WeakValueDictionary[int, ClassBase]"] = field(
+        default=None, init=False, repr=False, compare=False)
     name: str = field(hash=True)
     parent: Optional["ClassBase"]
+    # Attributes resolved from the parent chain and the
+    # test for a value set in the class itself, see freeze.
+    _INHERITED: ClassVar[Dict[str, Callable[[Any], bool]]] = {}
+    # The `invalid_value` that the accessors pass to get_attr for the
+    # inherited attributes, i.e. the one the frozen record matches.
+    _INVALID_VALUES: ClassVar[Dict[str, Any]] = {}
 
     def __eq__(self, other: "ClassBase"):
         return self.name.lower() == other.name.lower()
@@ -101,35 +180,112 @@ class ClassBase:
     def __hash__(self) -> int:
         return hash(self.name)
 
-    # @lru_cache(maxsize=64, typed=True)
-    # TODO: cache this with e.g. _attr_name__CACHED = value?
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if not name.startswith("_") and (
+                self._frozen is not None or self._dependents):
+            self.invalidate()
+
+    # Pickled as a dict of the fields, like the regular (non-slots)
+    # dataclasses were. Dependents are weak references, which can
+    # not be pickled, and frozen records are only valid with them,
+    # so neither is included.
+    def __getstate__(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        _set_state(self, state)
+
+    def _resolve_attr(self, attr_name: str,
+                      is_valid: Callable[[Any], bool]) -> Any:
+        obj = self
+        attr = getattr(obj, attr_name)
+        while not is_valid(attr):
+            parent = obj.parent
+            if parent.name == obj.name:
+                break
+            obj = parent
+            attr = getattr(obj, attr_name)
+        return attr
+
     def get_attr(self,
                  attr_name: str,
                  invalid_value: Optional[Any] = None) -> Any:
-        if invalid_value is not None:
-            attr = getattr(self, attr_name)
-            if attr != invalid_value:
-                return attr
-            parent = self.parent
-            while attr == invalid_value:
-                attr = getattr(parent, attr_name)
-                parent = parent.parent
-                if parent.name == parent.parent.name:
-                    attr = getattr(parent.parent, attr_name)
+        """Value of `attr_name` in this class or, if it is not set
+        (equal to `invalid_value` or falsy), in the closest parent
+        class that sets it.
+
+        For frozen classes, attributes in the frozen record are
+        returned without walking the parent chain if `invalid_value`
+        is the one the record was resolved with (see the accessors,
+        e.g. `Bullet.get_speed`). Other values walk the chain.
+        """
+        frozen = self._frozen
+        if frozen is not None and attr_name in frozen:
+            invalid_values = self._INVALID_VALUES
+            if (attr_name in invalid_values
+                    and invalid_values[attr_name] == invalid_value):
+                return frozen[attr_name]
+        obj = self
+        attr = getattr(obj, attr_name)
+        if invalid_value is None:
+            while not attr:
+                parent = obj.parent
+                if parent.name == obj.name:
                     break
-            return attr
+                obj = parent
+                attr = getattr(obj, attr_name)
         else:
-            attr = getattr(self, attr_name)
-            if attr:
-                return attr
-            parent = self.parent
-            while not attr:
-                attr = getattr(parent, attr_name)
-                parent = parent.parent
-                if parent.name == parent.parent.name:
-                    attr = getattr(parent.parent, attr_name)
+            while attr == invalid_value:
+                parent = obj.parent
+                if parent.name == obj.name:
                     break
-            return attr
+                obj = parent
+                attr = getattr(obj, attr_name)
+        return attr
+
+    def freeze(self):
+        """Resolve the inherited attributes of this class and its
+        parents once, so that the accessors (e.g. `Bullet.get_speed`)
+        no longer walk the parent chain.
+
+        Setting an attribute of the class or of any of its parents
+        (e.g. `parent`) drops the frozen record, see `invalidate`.
+        Attributes that can not be resolved, e.g. because the chain
+        does not end in a root class, are left out of the record.
+        """
+        parent = self.parent
+        is_root = parent is not None and parent.name == self.name
+        parent_record: Dict[str, Any] = {}
+        if parent is not None and not is_root:
+            if parent._frozen is None:
+                parent.freeze()
+            parent_record = parent._frozen or {}
+            if parent._dependents is None:
+                object.__setattr__(
+                    parent, "_dependents", weakref.WeakValueDictionary())
+            parent._dependents[id(self)] = self
+
+        record = {}
+        for attr_name, is_valid in self._INHERITED.items():
+            attr = getattr(self, attr_name)
+            if not (is_valid(attr) or is_root):
+                if attr_name not in parent_record:
+                    continue
+                attr = parent_record[attr_name]
+            record[attr_name] = attr
+        object.__setattr__(self, "_frozen", record)
+
+    def invalidate(self):
+        """Drop the frozen records of this class and of all frozen
+        classes that inherit from it.
+        """
+        object.__setattr__(self, "_frozen", None)
+        dependents = self._dependents
+        if dependents:
+            object.__setattr__(self, "_dependents", None)
+            for obj in list(dependents.values()):
+                obj.invalidate()
 
     def is_child_of(self, obj: "ClassBase") -> bool:
         if not self.parent:
@@ -161,7 +317,7 @@ class ClassBase:
 ClassLike = TypeVar("ClassLike", bound=ClassBase)
 
 
-@dataclass
+@dataclass(slots=True)
 class Bullet(ClassBase):
     parent: Optional["Bullet"]
     speed: float
@@ -170,8 +326,22 @@ class Bullet(ClassBase):
     drag_func: DragFunction
     ballistic_coeff: float
 
+    _INHERITED: ClassVar[Dict[str, Callable[[Any], bool]]] = {
+        "speed": _is_set,
+        "damage": _is_set,
+        "damage_falloff": _has_falloff,
+        "drag_func": _is_valid_drag_func,
+        "ballistic_coeff": _is_set,
+    }
+    _INVALID_VALUES: ClassVar[Dict[str, Any]] = {
+        "speed": -1,
+        "damage": -1,
+        "drag_func": DragFunction.Invalid,
+        "ballistic_coeff": -1,
+    }
+
     def __hash__(self) -> int:
-        return super().__hash__()
+        return ClassBase.__hash__(self)
 
     def get_speed(self) -> float:
         """Speed (muzzle velocity) in m/s."""
@@ -184,19 +354,11 @@ class Bullet(ClassBase):
     def get_damage(self) -> int:
         return self.get_attr("damage", invalid_value=-1)
 
-    # @lru_cache(maxsize=64, typed=True)
-    # TODO: cache this value. Use e.g. _damage_falloff to store the value?
     def get_damage_falloff(self) -> npt.NDArray[np.float64]:
-        dmg_fo = self.damage_falloff
-        if (dmg_fo > 0).any():
-            return dmg_fo
-        parent = self.parent
-        while not (dmg_fo > 0).any():
-            dmg_fo = parent.damage_falloff
-            parent = parent.parent
-            if parent.name == parent.parent.name:
-                break
-        return dmg_fo
+        frozen = self._frozen
+        if frozen is not None and "damage_falloff" in frozen:
+            return frozen["damage_falloff"]
+        return self._resolve_attr("damage_falloff", _has_falloff)
 
     def get_drag_func(self) -> DragFunction:
         return self.get_attr("drag_func", invalid_value=DragFunction.Invalid)
@@ -204,37 +366,47 @@ class Bullet(ClassBase):
     def get_drag_func_int(self) -> int:
         return {
             DragFunction.G1: 1,
+            DragFunction.G2: 2,
+            DragFunction.G5: 5,
+            DragFunction.G6: 6,
             DragFunction.G7: 7,
+            DragFunction.G8: 8,
         }[self.get_drag_func()]
 
     def get_ballistic_coeff(self) -> float:
         return self.get_attr("ballistic_coeff", invalid_value=-1)
 
 
-@dataclass
+@dataclass(slots=True)
 class Weapon(ClassBase):
     parent: Optional["Weapon"]
     bullets: List[Optional[Bullet]]
     instant_damages: List[int]
     pre_fire_length: int
     alt_ammo_loadouts: List[Optional["AltAmmoLoadout"]]
+    num_projectiles: List[int] = field(default_factory=list)
+    spreads: List[float] = field(default_factory=list)
+
+    _INHERITED: ClassVar[Dict[str, Callable[[Any], bool]]] = {
+        "bullets": any,
+        "instant_damages": any,
+        "pre_fire_length": _is_set,
+        "alt_ammo_loadouts": any,
+        "num_projectiles": any,
+        "spreads": any,
+    }
+    _INVALID_VALUES: ClassVar[Dict[str, Any]] = {
+        "pre_fire_length": -1,
+    }
 
     def __hash__(self) -> int:
-        return super().__hash__()
+        return ClassBase.__hash__(self)
 
-    # @lru_cache(maxsize=64, typed=True)
     def _get_attr_opt_list(self, attr: str) -> Optional[Any]:
-        attrs = getattr(self, attr)
-        if any(attrs):
-            return attrs
-        parent = self.parent
-        while not any(attrs):
-            attrs = getattr(parent, attr)
-            parent = parent.parent
-            if parent.name == parent.parent.name:
-                attrs = getattr(parent.parent, attr)
-                break
-        return attrs
+        frozen = self._frozen
+        if frozen is not None and attr in frozen:
+            return frozen[attr]
+        return self._resolve_attr(attr, any)
 
     def get_bullets(self) -> List[Optional[Bullet]]:
         return self._get_attr_opt_list("bullets")
@@ -254,14 +426,37 @@ class Weapon(ClassBase):
     def get_alt_ammo_loadouts(self) -> List[Optional["AltAmmoLoadout"]]:
         return self._get_attr_opt_list("alt_ammo_loadouts")
 
+    def get_num_projectiles(self, index: int) -> int:
+        """Number of projectiles (pellets) fired per shot."""
+        num = self._get_attr_opt_list("num_projectiles") or []
+        return num[index] if index < len(num) and num[index] > 0 else 1
 
-@dataclass
+    def get_spread(self, index: int) -> float:
+        """Spread cone half-angle in radians."""
+        spreads = self._get_attr_opt_list("spreads") or []
+        return spreads[index] if index < len(spreads) else 0.0
+
+
+@dataclass(slots=True)
 class AltAmmoLoadout(ClassBase):
     bullets: List[Optional[Bullet]]
     instant_damages: List[int]
+    num_projectiles: List[int] = field(default_factory=list)
+    spreads: List[float] = field(default_factory=list)
 
     def __hash__(self) -> int:
-        return super().__hash__()
+        return ClassBase.__hash__(self)
+
+
+def freeze_class_map(class_map: Mapping[str, ClassLike]):
+    """Freeze (see `ClassBase.freeze`) every class of `class_map`.
+    Parents are frozen before their children, so each inherited
+    attribute is resolved once per class instead of once per
+    accessor call.
+    """
+    for obj in class_map.values():
+        if obj._frozen is None:
+            obj.freeze()
 
 
 PROJECTILE = Bullet(
@@ -282,12 +477,18 @@ WEAPON = Weapon(
     pre_fire_length=50,
     instant_damages=[0],
     alt_ammo_loadouts=[],
+    num_projectiles=[1],
+    spreads=[0.0],
 )
 WEAPON.parent = WEAPON
 
 str_to_df = {
     DragFunction.G1: drag_g1,
+    DragFunction.G2: drag_g2,
+    DragFunction.G5: drag_g5,
+    DragFunction.G6: drag_g6,
     DragFunction.G7: drag_g7,
+    DragFunction.G8: drag_g8,
 }
 
 
@@ -347,6 +548,7 @@ class BulletSimulation:
         default_factory=lambda: np.array([1, 0], dtype=np.float64))
     location: np.ndarray = field(
         default_factory=lambda: np.array([0, 1], dtype=np.float64))
+    integrator: Integrator = Integrator.EULER
     fo_x: np.ndarray = field(init=False)
     fo_y: np.ndarray = field(init=False)
 
@@ -383,12 +585,33 @@ class BulletSimulation:
     def calc_drag_coeff(self, mach: float) -> float:
         return str_to_df[self.bullet.get_drag_func()](mach)
 
+    def calc_accel(self, velocity: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Return the acceleration (drag and gravity) in UU/s^2
+        at the given velocity and the speed in UU/s.
+        """
+        v_size = float(np.linalg.norm(velocity))
+        v = v_size * SCALE_FACTOR_INVERSE
+        mach = v * 0.0008958245617
+        cd = self.calc_drag_coeff(mach)
+        accel = (
+                -0.00020874137882624
+                * (cd * self.bc_inverse) * np.square(v)
+                * SCALE_FACTOR * (velocity / v_size))
+        accel[1] -= 490.3325
+        return accel, v_size
+
     def simulate(self, delta_time: float):
         if delta_time < 0:
             raise RuntimeError("simulation delta time must be >= 0")
         self.flight_time += delta_time
         if (self.velocity == 0).all():
             return
+        if self.integrator == Integrator.RK4:
+            self._simulate_rk4(delta_time)
+            return
+        if self.integrator == Integrator.VERLET:
+            self._simulate_verlet(delta_time)
+            return
         v_size = np.linalg.norm(self.velocity)
         v = v_size * SCALE_FACTOR_INVERSE
         mach = v * 0.0008958245617
@@ -410,6 +633,28 @@ class BulletSimulation:
         self.location += loc_change
         self.distance_traveled_uu += abs(np.linalg.norm(prev_loc - self.location))
 
+    def _simulate_rk4(self, delta_time: float):
+        v1 = self.velocity
+        a1, s1 = self.calc_accel(v1)
+        v2 = v1 + (delta_time / 2) * a1
+        a2, s2 = self.calc_accel(v2)
+        v3 = v1 + (delta_time / 2) * a2
+        a3, s3 = self.calc_accel(v3)
+        v4 = v1 + delta_time * a3
+        a4, s4 = self.calc_accel(v4)
+        self.location += (delta_time / 6) * (v1 + 2 * v2 + 2 * v3 + v4)
+        self.distance_traveled_uu += (delta_time / 6) * (s1 + 2 * s2 + 2 * s3 + s4)
+        self.velocity = v1 + (delta_time / 6) * (a1 + 2 * a2 + 2 * a3 + a4)
+
+    def _simulate_verlet(self, delta_time: float):
+        a0, _ = self.calc_accel(self.velocity)
+        loc_change = self.velocity * delta_time + (delta_time / 2) * delta_time * a0
+        self.location += loc_change
+        self.distance_traveled_uu += float(np.linalg.norm(loc_change))
+        # Drag depends on velocity, use a predicted end of step velocity.
+        a1, _ = self.calc_accel(self.velocity + delta_time * a0)
+        self.velocity = self.velocity + (delta_time / 2) * (a0 + a1)
+
     def calc_damage(self) -> float:
         v_size_sq = np.linalg.norm(self.velocity) ** 2
         power_left = v_size_sq / (self.bullet.get_speed_uu() ** 2)
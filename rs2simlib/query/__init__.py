@@ -0,0 +1,5 @@
+from .query import DistanceIndex
+
+__all__ = [
+    "DistanceIndex",
+]
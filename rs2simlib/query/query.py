@@ -0,0 +1,153 @@
+"""Distance based lookups into simulation results.
+
+Only depends on NumPy, so the indexes can be loaded and queried
+without importing the simulation code.
+"""
+
+import math
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+# Rows of the simulate result array used by the index.
+_Y = 1
+_DAMAGE = 2
+_DISTANCE = 3
+_TIME = 4
+_VELOCITY = 5
+
+# Rows of DistanceIndex.table.
+DAMAGE = 0
+VELOCITY = 1
+DROP = 2
+TIME = 3
+NUM_ROWS = 4
+
+ArrayOrFloat = Union[float, npt.NDArray[np.float64]]
+
+
+class DistanceIndex:
+    """Damage, velocity, drop and time of flight of a single
+    shot as a function of distance traveled [m].
+
+    The values are resampled on a uniform distance grid, so
+    each query is a single linear interpolation between two
+    grid points, O(1) per distance. Queries are vectorized
+    over array distances. Distances before the first sample
+    give the first value, distances the shot does not reach
+    (and NaN distances) give NaN.
+    """
+    __slots__ = ("end", "start", "step", "table")
+
+    def __init__(
+            self,
+            start: float,
+            step: float,
+            end: float,
+            table: npt.NDArray[np.float64],
+    ):
+        """Grid point j of `table` is at distance `start + j * step`.
+        `end` is the last distance [m] reached by the shot.
+        """
+        if not step > 0:
+            raise ValueError("step must be positive")
+        if table.ndim != 2 or table.shape[0] != NUM_ROWS:
+            raise ValueError(
+                f"expected table with {NUM_ROWS} rows, got shape {table.shape}")
+        if table.shape[1] < 2:
+            raise ValueError("table must have at least two columns")
+        self.start = float(start)
+        self.step = float(step)
+        self.end = float(end)
+        self.table = table
+
+    @classmethod
+    def from_result(
+            cls,
+            result: npt.NDArray[np.float64],
+            step: float = 1.0,
+    ) -> "DistanceIndex":
+        """Build an index with a grid spacing of at most `step` [m]
+        from the result array of `simulate` (or any array with the
+        same rows, e.g. `RangeTable.data`). NaN columns are ignored.
+        """
+        distance = result[_DISTANCE]
+        valid = ~np.isnan(distance)
+        distance = distance[valid]
+        if distance.shape[0] < 2:
+            raise ValueError("result must have at least two samples")
+        if (np.diff(distance) < 0).any():
+            raise ValueError("distance must be non-decreasing")
+
+        start = distance[0]
+        end = distance[-1]
+        # Shrink the step so the last grid point is at the end.
+        num = max(int(np.ceil((end - start) / step)) + 1, 2)
+        step = (end - start) / (num - 1)
+        grid = np.linspace(start, end, num)
+        table = np.empty((NUM_ROWS, grid.shape[0]), dtype=np.float64)
+        for row, src in (
+                (DAMAGE, result[_DAMAGE]),
+                (VELOCITY, result[_VELOCITY]),
+                (DROP, -result[_Y]),
+                (TIME, result[_TIME]),
+        ):
+            table[row] = np.interp(grid, distance, src[valid])
+        return cls(start, step, end, table)
+
+    def _lookup_scalar(self, row: int, distance: float) -> float:
+        # Plain float math, the NumPy calls below cost
+        # microseconds each on scalars.
+        # Also true for NaN.
+        if not distance <= self.end:
+            return math.nan
+        last = self.table.shape[1] - 1
+        x = min(max((distance - self.start) / self.step, 0.0), float(last))
+        i = min(int(x), last - 1)
+        lo = float(self.table[row, i])
+        return lo + (x - i) * (float(self.table[row, i + 1]) - lo)
+
+    def _lookup(self, row: int, distance: npt.ArrayLike) -> ArrayOrFloat:
+        if isinstance(distance, (float, int)):
+            return self._lookup_scalar(row, distance)
+        d = np.asarray(distance, dtype=np.float64)
+        if d.ndim == 0:
+            return self._lookup_scalar(row, float(d))
+        values = self.table[row]
+        # Also true for NaN, which must not be cast to an index.
+        out_of_range = ~(d <= self.end)
+        x = np.clip(
+            (d - self.start) * (1.0 / self.step), 0.0, values.shape[0] - 1)
+        x[out_of_range] = 0.0
+        i = np.minimum(x.astype(np.intp), values.shape[0] - 2)
+        lo = values[i]
+        ret = lo + (x - i) * (values[i + 1] - lo)
+        ret[out_of_range] = np.nan
+        return ret
+
+    def damage(self, distance: npt.ArrayLike) -> ArrayOrFloat:
+        return self._lookup(DAMAGE, distance)
+
+    def velocity(self, distance: npt.ArrayLike) -> ArrayOrFloat:
+        """Velocity in m/s."""
+        return self._lookup(VELOCITY, distance)
+
+    def drop(self, distance: npt.ArrayLike) -> ArrayOrFloat:
+        """Drop (negative height) in meters."""
+        return self._lookup(DROP, distance)
+
+    def time(self, distance: npt.ArrayLike) -> ArrayOrFloat:
+        """Time of flight in seconds."""
+        return self._lookup(TIME, distance)
+
+    def save(self, path: Union[str, Path]):
+        np.savez(path, start=self.start, step=self.step, end=self.end,
+                 table=self.table)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DistanceIndex":
+        with np.load(path) as npz:
+            return cls(float(npz["start"]), float(npz["step"]),
+                       float(npz["end"]), npz["table"])
@@ -0,0 +1,25 @@
+from .store import StoreEntry
+from .store import TrajectoryStore
+from .store import TrajectoryStoreWriter
+from .sweep import NpyDirectoryWriter
+from .sweep import SweepJob
+from .sweep import SweepResult
+from .sweep import SweepSettings
+from .sweep import SweepSummary
+from .sweep import SweepWriter
+from .sweep import expand_jobs
+from .sweep import run_sweep
+
+__all__ = [
+    "NpyDirectoryWriter",
+    "StoreEntry",
+    "SweepJob",
+    "SweepResult",
+    "SweepSettings",
+    "SweepSummary",
+    "SweepWriter",
+    "TrajectoryStore",
+    "TrajectoryStoreWriter",
+    "expand_jobs",
+    "run_sweep",
+]
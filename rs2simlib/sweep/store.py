@@ -0,0 +1,296 @@
+"""Columnar on-disk store of sweep results.
+
+A store is a directory with one flat binary file per channel
+(`<channel>.bin`), holding the samples of all trajectories back
+to back, an index (`index.jsonl`) with one line per trajectory
+giving its key, offset and length in samples, and the store
+settings (`meta.json`).
+
+The channel files are opened with `np.memmap`, so reading one
+trajectory (or one channel of it) only touches the pages of that
+trajectory. Trajectories are appended by `TrajectoryStoreWriter`,
+which can be used directly as the writer of `run_sweep`.
+"""
+
+import json
+import os
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Self
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+from rs2simlib.fast.sim import Channel
+from rs2simlib.sweep.sweep import SweepResult
+
+STORE_VERSION = 1
+
+META_FILE = "meta.json"
+INDEX_FILE = "index.jsonl"
+
+ChannelLike = Union[Channel, str]
+
+
+@dataclass(frozen=True)
+class StoreEntry:
+    """Index entry of a trajectory. `offset` and `length` are in
+    samples (columns of the `simulate` result array).
+    """
+    key: str
+    weapon: str
+    loadout: int
+    slot: int
+    bullet: str
+    offset: int
+    length: int
+    stop_reason: int
+
+
+def _channel_names(channels: int) -> List[str]:
+    return [c.name.lower() for c in Channel
+            if c != Channel.ALL and channels & c]
+
+
+def _read_meta(directory: Path) -> dict:
+    with (directory / META_FILE).open() as f:
+        meta = json.load(f)
+    if meta.get("version") != STORE_VERSION:
+        raise ValueError(
+            f"unsupported trajectory store version: {meta.get('version')}")
+    return meta
+
+
+def _read_index(directory: Path) -> Dict[str, StoreEntry]:
+    entries: Dict[str, StoreEntry] = {}
+    try:
+        f = (directory / INDEX_FILE).open()
+    except FileNotFoundError:
+        return entries
+    with f:
+        for line in f:
+            # A line without the newline was cut short
+            # by an interrupted write and is ignored.
+            if not line.endswith("\n"):
+                break
+            entry = StoreEntry(**json.loads(line))
+            entries[entry.key] = entry
+    return entries
+
+
+def _repair_index(directory: Path):
+    # Drop a last line cut short by an interrupted write,
+    # so the next entry does not get appended to it.
+    path = directory / INDEX_FILE
+    if not path.exists():
+        return
+    with path.open("rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+class TrajectoryStoreWriter:
+    """Appends trajectories to the store in `directory`, creating
+    it with the given `channels` and `dtype` (default: all channels,
+    float64) if it does not exist. An existing store keeps its own,
+    and ValueError is raised if `channels` or `dtype` are given and
+    differ from them.
+
+    The channel data of a trajectory is written before its index
+    line, so an interrupted write never leaves an index entry
+    pointing to missing data. Data after the last index entry is
+    discarded when the store is opened for writing again. Only
+    one writer may append to a store at a time.
+    """
+
+    def __init__(
+            self,
+            directory: Union[str, Path],
+            channels: Optional[int] = None,
+            dtype: Optional[npt.DTypeLike] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if (self.directory / META_FILE).exists():
+            meta = _read_meta(self.directory)
+            if (channels is not None
+                    and _channel_names(channels) != meta["channels"]):
+                raise ValueError(
+                    f"store has channels {meta['channels']}, "
+                    f"got {_channel_names(channels)}")
+            if (dtype is not None
+                    and np.dtype(dtype) != np.dtype(meta["dtype"])):
+                raise ValueError(
+                    f"store has dtype {np.dtype(meta['dtype'])}, "
+                    f"got {np.dtype(dtype)}")
+        else:
+            meta = {
+                "version": STORE_VERSION,
+                "channels": _channel_names(
+                    Channel.ALL if channels is None else channels),
+                "dtype": np.dtype(
+                    np.float64 if dtype is None else dtype).str,
+            }
+            with (self.directory / META_FILE).open("w") as f:
+                json.dump(meta, f)
+        self.channels: List[str] = meta["channels"]
+        self.dtype = np.dtype(meta["dtype"])
+
+        _repair_index(self.directory)
+        entries = _read_index(self.directory)
+        self._end = max(
+            (e.offset + e.length for e in entries.values()), default=0)
+        self._files: Dict[str, BinaryIO] = {}
+        for name in self.channels:
+            out = (self.directory / f"{name}.bin").open("ab")
+            out.truncate(self._end * self.dtype.itemsize)
+            self._files[name] = out
+        self._index = (self.directory / INDEX_FILE).open("a")
+
+    def append(
+            self,
+            key: str,
+            data: npt.NDArray,
+            weapon: str = "",
+            loadout: int = -1,
+            slot: int = 0,
+            bullet: str = "",
+            stop_reason: int = 0,
+    ) -> StoreEntry:
+        """Append `data`, an array with one row per channel
+        of the store (e.g. the result of `simulate`).
+        """
+        if data.ndim != 2 or data.shape[0] != len(self.channels):
+            raise ValueError(
+                f"expected {len(self.channels)} rows, got shape {data.shape}")
+        entry = StoreEntry(
+            key=key,
+            weapon=weapon,
+            loadout=loadout,
+            slot=slot,
+            bullet=bullet,
+            offset=self._end,
+            length=data.shape[1],
+            stop_reason=stop_reason,
+        )
+        for name, row in zip(self.channels, data):
+            out = self._files[name]
+            out.write(np.ascontiguousarray(row, dtype=self.dtype).tobytes())
+            out.flush()
+        self._index.write(json.dumps(asdict(entry)) + "\n")
+        self._index.flush()
+        self._end += entry.length
+        return entry
+
+    def __call__(self, result: SweepResult):
+        """Sweep writer, failed results are skipped."""
+        if result.data is None:
+            return
+        job = result.job
+        self.append(
+            key=job.key,
+            data=result.data,
+            weapon=job.weapon,
+            loadout=job.loadout,
+            slot=job.slot,
+            bullet=job.bullet,
+            stop_reason=result.stop_reason,
+        )
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._index.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryStore:
+    """Read access to the store in `directory`.
+
+    Trajectories are looked up by their sweep job key, e.g.
+    `ROWeap_AK47/0` (see `SweepJob.key`). The returned arrays
+    are views into the memory-mapped channel files.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        meta = _read_meta(self.directory)
+        self.channels: List[str] = meta["channels"]
+        self.dtype = np.dtype(meta["dtype"])
+        self.entries: Dict[str, StoreEntry] = {}
+        self._maps: Dict[str, npt.NDArray] = {}
+        self.refresh()
+
+    def refresh(self):
+        """Pick up trajectories appended since the store was opened."""
+        self.entries = _read_index(self.directory)
+        end = max(
+            (e.offset + e.length for e in self.entries.values()), default=0)
+        for name in self.channels:
+            m = self._maps.get(name)
+            if m is not None and m.shape[0] >= end:
+                continue
+            if end == 0:
+                # np.memmap cannot map empty files.
+                self._maps[name] = np.empty(0, dtype=self.dtype)
+                continue
+            self._maps[name] = np.memmap(
+                self.directory / f"{name}.bin", dtype=self.dtype,
+                mode="r", shape=(end,))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def keys(self) -> List[str]:
+        return list(self.entries)
+
+    def weapon_entries(self, weapon: str) -> List[StoreEntry]:
+        """Entries of all bullet slots and alt ammo loadouts of
+        `weapon`.
+        """
+        return [e for e in self.entries.values() if e.weapon == weapon]
+
+    def channel(self, key: str, channel: ChannelLike) -> npt.NDArray:
+        """Samples of one channel of the trajectory `key`, e.g.
+        `store.channel("ROWeap_AK47/0", Channel.DAMAGE)`.
+        """
+        name = (channel.name if isinstance(channel, Channel)
+                else channel).lower()
+        if name not in self.channels:
+            raise KeyError(f"channel not in store: {name}")
+        entry = self._entry(key)
+        return self._maps[name][entry.offset:entry.offset + entry.length]
+
+    def get(self, key: str) -> npt.NDArray:
+        """All channels of the trajectory `key`, one row per
+        channel. Unlike `channel`, this copies the data.
+        """
+        return np.stack([self.channel(key, name) for name in self.channels])
+
+    def _entry(self, key: str) -> StoreEntry:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.refresh()
+            entry = self.entries[key]
+        return entry
+
+    def size(self) -> int:
+        """Total size of the channel data in bytes."""
+        return sum(
+            os.path.getsize(self.directory / f"{name}.bin")
+            for name in self.channels)
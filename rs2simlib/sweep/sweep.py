@@ -0,0 +1,379 @@
+"""Process pool sweeps over all weapons of a class map.
+
+Every `Weapon` x bullet slot (and alt ammo loadout bullet slot)
+is expanded into a `SweepJob` that only holds the resolved
+simulation parameters, so the jobs are cheap to send to the
+worker processes. Results are handed to a writer in the parent
+process as soon as their chunk finishes.
+"""
+
+import copy
+import itertools
+import multiprocessing
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import MutableMapping
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+from numba.core.errors import NumbaError
+
+from rs2simlib.fast.sim import Channel
+from rs2simlib.fast.sim import simulate_until
+from rs2simlib.fast.sim import trigger_jit
+from rs2simlib.models import AltAmmoLoadout
+from rs2simlib.models import Bullet
+from rs2simlib.models import ClassLike
+from rs2simlib.models import Integrator
+from rs2simlib.models import Weapon
+from rs2simlib.models import freeze_class_map
+from rs2simlib.models import interp_dmg_falloff
+
+# Errors of the accessors of classes with missing or
+# inconsistent attributes, e.g. an unknown drag function.
+_CLASS_ERRORS = (AttributeError, IndexError, KeyError, TypeError, ValueError)
+# Errors of the simulation of invalid parameters.
+_SIM_ERRORS = (ArithmeticError, NumbaError, ValueError)
+
+@dataclass
+class SweepJob:
+    """A single shot to simulate. `loadout` is the alt ammo
+    loadout index, or -1 for the weapon's own bullets. `error`
+    is set, and the parameters are not, if the parameters could
+    not be resolved. `instant_damage` and `pre_fire_trace_len`
+    describe the weapon but are not used by the simulation, see
+    `fast.sim.simulate`.
+    """
+    weapon: str
+    loadout: int
+    slot: int
+    bullet: str = ""
+    drag_func: int = 0
+    ballistic_coeff: float = 0.0
+    muzzle_velocity: float = 0.0
+    falloff_x: npt.NDArray[np.float64] = field(
+        default_factory=lambda: np.zeros(0))
+    falloff_y: npt.NDArray[np.float64] = field(
+        default_factory=lambda: np.zeros(0))
+    bullet_damage: int = 0
+    instant_damage: int = 0
+    pre_fire_trace_len: int = 0
+    error: str = ""
+
+    @property
+    def key(self) -> str:
+        """Unique name of the job, e.g. `ROWeap_AK47/0` or
+        `ROWeap_AK47/alt1/0`.
+        """
+        if self.loadout < 0:
+            return f"{self.weapon}/{self.slot}"
+        return f"{self.weapon}/alt{self.loadout}/{self.slot}"
+
+
+@dataclass
+class SweepResult:
+    """Result of a `SweepJob`. `data` is the result array of
+    `simulate_until` (None if the job failed) and `error` the
+    formatted exception of a failed job.
+    """
+    job: SweepJob
+    data: Optional[npt.NDArray] = None
+    stop_reason: int = 0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+@dataclass
+class SweepSettings:
+    """Simulation settings shared by all jobs of a sweep."""
+    sim_time: float = 5.0
+    time_step: float = 1 / 500
+    channels: int = Channel.ALL
+    dtype: type = np.float64
+    integrator: Integrator = Integrator.EULER
+    min_y: float = -np.inf
+    max_distance: float = np.inf
+
+
+@dataclass
+class SweepSummary:
+    num_jobs: int = 0
+    failures: List[SweepResult] = field(default_factory=list)
+
+    @property
+    def num_failed(self) -> int:
+        return len(self.failures)
+
+
+SweepWriter = Callable[[SweepResult], None]
+
+
+def _make_job(
+        weapon: Weapon,
+        loadout: int,
+        slot: int,
+        bullet: Bullet,
+        instant_damages: List[int],
+) -> SweepJob:
+    job = SweepJob(weapon=weapon.name, loadout=loadout, slot=slot)
+    try:
+        fo_x, fo_y = interp_dmg_falloff(bullet.get_damage_falloff())
+        job.bullet = bullet.name
+        job.drag_func = bullet.get_drag_func_int()
+        job.ballistic_coeff = float(bullet.get_ballistic_coeff())
+        job.muzzle_velocity = float(bullet.get_speed_uu())
+        job.falloff_x = np.ascontiguousarray(fo_x, dtype=np.float64)
+        job.falloff_y = np.ascontiguousarray(fo_y, dtype=np.float64)
+        job.bullet_damage = int(bullet.get_damage())
+        job.instant_damage = int(
+            instant_damages[slot] if slot < len(instant_damages) else 0)
+        job.pre_fire_trace_len = int(weapon.get_pre_fire_length()) * 50
+    except _CLASS_ERRORS as e:
+        job.error = f"{type(e).__name__}: {e}"
+    return job
+
+
+def _bullet_jobs(
+        weapon: Weapon,
+        loadout: int,
+        bullets: List[Optional[Bullet]],
+        instant_damages: List[int],
+) -> Iterator[SweepJob]:
+    for slot, bullet in enumerate(bullets):
+        if bullet is not None:
+            yield _make_job(weapon, loadout, slot, bullet, instant_damages)
+
+
+def expand_jobs(
+        class_map: MutableMapping[str, ClassLike],
+) -> Iterator[SweepJob]:
+    """Expand every weapon x bullet slot x alt ammo loadout
+    of `class_map` into jobs.
+
+    The jobs are resolved from a frozen copy of `class_map` (see
+    `models.freeze_class_map`), so the caller's classes are left
+    as they are.
+    """
+    class_map = copy.deepcopy(class_map)
+    freeze_class_map(class_map)
+    for obj in class_map.values():
+        if not isinstance(obj, Weapon):
+            continue
+        try:
+            bullets = obj.get_bullets()
+            instant_damages = obj.get_instant_damages()
+            loadouts: List[Optional[AltAmmoLoadout]] = (
+                obj.get_alt_ammo_loadouts() or [])
+        except _CLASS_ERRORS as e:
+            yield SweepJob(
+                weapon=obj.name, loadout=-1, slot=-1,
+                error=f"{type(e).__name__}: {e}")
+            continue
+
+        yield from _bullet_jobs(obj, -1, bullets, instant_damages)
+        for idx, loadout in enumerate(loadouts):
+            if loadout is not None:
+                yield from _bullet_jobs(
+                    obj, idx, loadout.bullets, loadout.instant_damages)
+
+
+def _init_worker():
+    # Load the compiled functions from the on-disk
+    # JIT cache before the first chunk arrives.
+    trigger_jit()
+
+
+def _run_job(job: SweepJob, settings: SweepSettings) -> SweepResult:
+    try:
+        data, reason = simulate_until(
+            sim_time=np.float64(settings.sim_time),
+            time_step=np.float64(settings.time_step),
+            drag_func=np.int64(job.drag_func),
+            ballistic_coeff=np.float64(job.ballistic_coeff),
+            aim_dir_x=np.float64(1.0),
+            aim_dir_y=np.float64(0.0),
+            muzzle_velocity=np.float64(job.muzzle_velocity),
+            falloff_x=job.falloff_x,
+            falloff_y=job.falloff_y,
+            bullet_damage=np.int64(job.bullet_damage),
+            instant_damage=np.int64(job.instant_damage),
+            pre_fire_trace_len=np.int64(job.pre_fire_trace_len),
+            min_y=np.float64(settings.min_y),
+            max_distance=np.float64(settings.max_distance),
+            channels=np.int64(settings.channels),
+            dtype=settings.dtype,
+            integrator=np.int64(settings.integrator),
+        )
+    except _SIM_ERRORS:
+        return SweepResult(job=job, error=traceback.format_exc())
+    return SweepResult(job=job, data=data, stop_reason=int(reason))
+
+
+def _run_chunk(
+        jobs: List[SweepJob],
+        settings: SweepSettings,
+) -> List[SweepResult]:
+    return [_run_job(job, settings) for job in jobs]
+
+
+def _chunks(jobs: Iterable[SweepJob], size: int) -> Iterator[List[SweepJob]]:
+    it = iter(jobs)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+def run_sweep(
+        class_map: MutableMapping[str, ClassLike],
+        writer: SweepWriter,
+        settings: Optional[SweepSettings] = None,
+        processes: Optional[int] = None,
+        chunk_size: int = 8,
+        max_pending: Optional[int] = None,
+        prewarm: bool = True,
+) -> SweepSummary:
+    """Simulate every job of `class_map` (see `expand_jobs`) in a
+    process pool of `processes` workers and pass each result to
+    `writer` as soon as its chunk of `chunk_size` jobs finishes.
+
+    At most `max_pending` chunks (default: twice the number of
+    processes) are in flight, which bounds the memory used by
+    results that are not written yet. Failed jobs are written as
+    results with `error` set instead of aborting the sweep.
+
+    A worker that crashes, e.g. in native code, breaks the pool.
+    The jobs in flight are then run again in a new pool, one at a
+    time, and a job that breaks the pool on its own is failed.
+
+    With `prewarm`, the JIT cache is populated in this process
+    before the workers start, so each worker only loads it.
+    """
+    if settings is None:
+        settings = SweepSettings()
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if max_pending is None:
+        max_pending = 2 * processes
+    if chunk_size < 1 or max_pending < 1:
+        raise ValueError("chunk_size and max_pending must be positive")
+
+    if prewarm:
+        _init_worker()
+
+    summary = SweepSummary()
+
+    def emit(result: SweepResult):
+        summary.num_jobs += 1
+        if not result.ok:
+            # Failures are kept without data for the summary.
+            summary.failures.append(result)
+        writer(result)
+
+    def runnable() -> Iterator[SweepJob]:
+        for job in expand_jobs(class_map):
+            if job.error:
+                emit(SweepResult(job=job, error=job.error))
+            else:
+                yield job
+
+    chunks = _chunks(runnable(), chunk_size)
+    # Spawned workers do not inherit the threading state of the
+    # JIT runtime of this process, which is not fork safe.
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(
+        max_workers=processes, mp_context=context, initializer=_init_worker)
+    pending: Dict[Future, List[SweepJob]] = {}
+    # Jobs lost to a broken pool, and the one of them in flight.
+    retry: Deque[SweepJob] = deque()
+    retrying: Optional[Future] = None
+    try:
+        exhausted = False
+        while pending or retry or not exhausted:
+            if retry:
+                if not pending:
+                    chunk = [retry.popleft()]
+                    retrying = executor.submit(_run_chunk, chunk, settings)
+                    pending[retrying] = chunk
+            else:
+                while not exhausted and len(pending) < max_pending:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    pending[executor.submit(
+                        _run_chunk, chunk, settings)] = chunk
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except BrokenProcessPool as e:
+                    broken = True
+                    if future is not retrying:
+                        # Not necessarily the job that broke the pool.
+                        retry.extend(chunk)
+                        continue
+                    error = f"{type(e).__name__}: {e}"
+                    results = [SweepResult(job=job, error=error)
+                               for job in chunk]
+                for result in results:
+                    emit(result)
+            if broken:
+                # The other chunks in flight fail as well.
+                executor.shutdown(wait=True, cancel_futures=True)
+                for future, chunk in pending.items():
+                    if (not future.cancelled()
+                            and future.exception() is None):
+                        for result in future.result():
+                            emit(result)
+                    else:
+                        retry.extend(chunk)
+                pending.clear()
+                executor = ProcessPoolExecutor(
+                    max_workers=processes, mp_context=context,
+                    initializer=_init_worker)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return summary
+
+
+class NpyDirectoryWriter:
+    """Sweep writer that saves the data of each successful job to
+    `<directory>/<key>.npy` (with `/` in the key replaced by `__`)
+    and appends failed jobs to `<directory>/failures.txt`.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, job: SweepJob) -> Path:
+        return self.directory / f"{job.key.replace('/', '__')}.npy"
+
+    def __call__(self, result: SweepResult):
+        if result.data is not None:
+            np.save(self.path(result.job), result.data)
+        if not result.ok:
+            with (self.directory / "failures.txt").open("a") as f:
+                f.write(f"{result.job.key}: {result.error.strip()}\n")
@@ -0,0 +1,59 @@
+"""Measure `simulate_batch` throughput with 1 to N threads."""
+
+import argparse
+import time
+
+import numpy as np
+
+from rs2simlib.fast.sim import max_num_threads
+from rs2simlib.fast.sim import set_num_threads
+from rs2simlib.fast.sim import simulate_batch
+
+
+def make_batch(n_shots: int) -> dict:
+    rng = np.random.default_rng(0)
+    angles = rng.uniform(-0.1, 0.3, n_shots)
+    return {
+        "sim_time": np.float64(3.0),
+        "time_step": np.float64(1 / 500),
+        "drag_func": rng.choice([1, 7], n_shots).astype(np.int64),
+        "ballistic_coeff": rng.uniform(0.1, 0.4, n_shots),
+        "aim_dir_x": np.cos(angles),
+        "aim_dir_y": np.sin(angles),
+        "muzzle_velocity": rng.uniform(300.0, 900.0, n_shots) * 50,
+        "falloff_x": np.tile([241491600.0, 1509322500.0], (n_shots, 1)),
+        "falloff_y": np.tile([0.85, 0.2], (n_shots, 1)),
+        "bullet_damage": np.full(n_shots, 115, dtype=np.int64),
+        "instant_damage": np.full(n_shots, 120, dtype=np.int64),
+        "pre_fire_trace_len": np.full(n_shots, 25 * 50, dtype=np.int64),
+        "start_loc_x": np.zeros(n_shots),
+        "start_loc_y": np.zeros(n_shots),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--shots", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    batch = make_batch(args.shots)
+    # Compile (or load from cache) before timing anything.
+    simulate_batch(**make_batch(2))
+
+    base = None
+    print(f"{'threads':>7} {'best [s]':>10} {'shots/s':>12} {'speedup':>8}")
+    for n in range(1, max_num_threads() + 1):
+        set_num_threads(n)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            simulate_batch(**batch)
+            best = min(best, time.perf_counter() - start)
+        base = base or best
+        print(f"{n:>7} {best:>10.4f} {args.shots / best:>12.0f}"
+              f" {base / best:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Measure the time to the first `simulate` result in a new
+interpreter with an empty JIT cache, with a JIT cache bundle
+installed (see `rs2simlib.jitcache`) and with a warm cache.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from rs2simlib.jitcache import build_bundle
+from rs2simlib.jitcache import install_bundle
+
+FIRST_RESULT = """
+import time
+start = time.perf_counter()
+import numpy as np
+from rs2simlib.fast.sim import simulate
+simulate(
+    sim_time=np.float64(1.0),
+    time_step=np.float64(1 / 500),
+    drag_func=np.int64(7),
+    ballistic_coeff=np.float64(0.24),
+    aim_dir_x=np.float64(1.0),
+    aim_dir_y=np.float64(0.0),
+    muzzle_velocity=np.float64(850.0 * 50),
+    falloff_x=np.array([241491600.0, 1509322500.0]),
+    falloff_y=np.array([0.85, 0.2]),
+    bullet_damage=np.int64(115),
+    instant_damage=np.int64(0),
+    pre_fire_trace_len=np.int64(0),
+)
+print(time.perf_counter() - start)
+"""
+
+
+def first_result_time(cache_dir: Path) -> float:
+    env = {**os.environ, "NUMBA_CACHE_DIR": str(cache_dir)}
+    out = subprocess.run(
+        [sys.executable, "-c", FIRST_RESULT],
+        check=True, capture_output=True, text=True, env=env).stdout
+    return float(out.split()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument(
+        "--bundle", help="existing bundle to use instead of building one")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = args.bundle
+        if bundle is None:
+            bundle = os.path.join(tmp, "bundle.zip")
+            print(f"built bundle with {build_bundle(bundle)} files")
+
+        cold = Path(tmp) / "cold"
+        print(f"empty cache:      {first_result_time(cold):.2f} s")
+        print(f"warm cache:       {first_result_time(cold):.2f} s")
+
+        installed = Path(tmp) / "installed"
+        install_bundle(bundle, installed)
+        print(f"bundle installed: {first_result_time(installed):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
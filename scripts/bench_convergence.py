@@ -0,0 +1,167 @@
+"""Compare accuracy against cost of the integrators.
+
+The reference solution is an adaptive run with a very tight
+tolerance. Errors are the maximum absolute deviation of the
+trajectory (x, y) in meters at the sample times. Runs on the
+reference bullets of tests/test_sim.py.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rs2simlib.fast.sim import simulate
+from rs2simlib.fast.sim import simulate_adaptive
+from rs2simlib.models import Integrator
+
+# noinspection DuplicatedCode
+sim_params_1 = {
+    "time_step": np.float64(1 / 500),
+    "sim_time": np.float64(2.0),
+    "ballistic_coeff": np.float64(0.24),
+    "aim_dir_x": np.float64(1.0),
+    "aim_dir_y": np.float64(0.0),
+    "muzzle_velocity": np.float64(340.0 * 50),
+    "falloff_x": np.array([241491600.0, 1509322500.0]),
+    "falloff_y": np.array([0.85, 0.2]),
+    "bullet_damage": np.int64(147),
+    "instant_damage": np.int64(160),
+    "pre_fire_trace_len": np.int64(25 * 50),
+    "start_loc_x": np.float64(0.0),
+    "start_loc_y": np.float64(0.0),
+    "drag_func": np.int64(7),
+}
+
+# noinspection DuplicatedCode
+sim_params_2 = {
+    "time_step": np.float64(1 / 99),
+    "sim_time": np.float64(2.0),
+    "ballistic_coeff": np.float64(0.111185),
+    "aim_dir_x": np.float64(1.555),
+    "aim_dir_y": np.float64(-2.32334234),
+    "muzzle_velocity": np.float64(999.5599 * 50),
+    "falloff_x": np.array([241491611.0, 1504422500.0]),
+    "falloff_y": np.array([0.55, 0.32]),
+    "bullet_damage": np.int64(85),
+    "instant_damage": np.int64(101),
+    "pre_fire_trace_len": np.int64(50 * 50),
+    "start_loc_x": np.float64(-5.0),
+    "start_loc_y": np.float64(9.6845),
+    "drag_func": np.int64(1),
+}
+
+SAMPLE_TIMES = np.linspace(0.1, 1.9, 19)
+TIME_STEPS = (1 / 100, 1 / 500, 1 / 2500, 1 / 12500)
+RTOLS = (1e-4, 1e-6, 1e-8, 1e-10)
+
+
+def adaptive_params(sim_params: dict) -> dict:
+    return {
+        k: v for k, v in sim_params.items()
+        if k not in ("time_step", "instant_damage", "pre_fire_trace_len")
+    }
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def error(res: np.ndarray, ref: np.ndarray) -> float:
+    return max(np.max(np.abs(res[0] - ref[0])), np.max(np.abs(res[1] - ref[1])))
+
+
+def fixed_run(sim_params: dict, integrator: Integrator, time_step: float):
+    res = simulate(**{
+        **sim_params,
+        "time_step": np.float64(time_step),
+        "integrator": np.int64(integrator),
+    })
+    sampled = np.vstack([
+        np.interp(SAMPLE_TIMES, res[4], res[0]),
+        np.interp(SAMPLE_TIMES, res[4], res[1]),
+    ])
+    return sampled, res.shape[1]
+
+
+def adaptive_run(sim_params: dict, rtol: float):
+    res, steps = simulate_adaptive(
+        SAMPLE_TIMES, **adaptive_params(sim_params),
+        rtol=np.float64(rtol), atol=np.float64(rtol * 100))
+    return res, steps
+
+
+def measure(sim_params: dict, repeat: int) -> dict[str, list]:
+    """Return {method: [(wall-clock, error), ...]}."""
+    ref, _ = adaptive_run(sim_params, 1e-13)
+    points: dict[str, list] = {}
+
+    for integrator in Integrator:
+        name = integrator.name.lower()
+        for time_step in TIME_STEPS:
+            t, (res, steps) = timed(
+                lambda integrator=integrator, time_step=time_step: fixed_run(
+                    sim_params, integrator, time_step),
+                repeat)
+            err = error(res, ref)
+            points.setdefault(name, []).append((t, err))
+            print(f"{name:>10} {time_step:>10.2e} {steps:>9}"
+                  f" {t:>10.2e} {err:>12.2e}")
+    for rtol in RTOLS:
+        t, (res, steps) = timed(
+            lambda rtol=rtol: adaptive_run(sim_params, rtol), repeat)
+        err = error(res, ref)
+        points.setdefault("adaptive", []).append((t, err))
+        print(f"{'adaptive':>10} {rtol:>10.0e} {steps:>9}"
+              f" {t:>10.2e} {err:>12.2e}")
+
+    return points
+
+
+def plot(all_points: list[dict[str, list]], path: str):
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, len(all_points), figsize=(12, 5))
+    for i, (ax, points) in enumerate(zip(axes, all_points)):
+        for name, values in points.items():
+            t, err = zip(*values)
+            ax.loglog(t, err, marker="o", label=name)
+        ax.set_title(f"bullet {i + 1}")
+        ax.set_xlabel("wall-clock [s]")
+        ax.set_ylabel("max error [m]")
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"saved plot to '{path}'")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument(
+        "--plot",
+        metavar="PATH",
+        help="save an error vs wall-clock plot (requires matplotlib)",
+    )
+    args = ap.parse_args()
+
+    all_points = []
+    for i, sim_params in enumerate((sim_params_1, sim_params_2)):
+        print(f"bullet {i + 1}:")
+        print(f"{'method':>10} {'setting':>10} {'steps':>9}"
+              f" {'time [s]':>10} {'max err [m]':>12}")
+        all_points.append(measure(sim_params, args.repeat))
+
+    if args.plot:
+        plot(all_points, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Measure the throughput of the Monte Carlo dispersion engine
+(`simulate_dispersion`) for a shotgun-like and a rifle-like
+projectile.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rs2simlib.fast.sim import get_num_threads
+from rs2simlib.fast.sim import simulate_dispersion
+
+RANGES = np.array([10.0, 25.0, 50.0, 100.0, 200.0])
+
+CASES = {
+    "buckshot (9 pellets)": {
+        "num_projectiles": 9,
+        "spread": 0.0375,
+        "drag_func": 1,
+        "ballistic_coeff": 0.05,
+        "muzzle_velocity": 400.0 * 50,
+        "bullet_damage": 40,
+    },
+    "rifle": {
+        "num_projectiles": 1,
+        "spread": 0.0007,
+        "drag_func": 7,
+        "ballistic_coeff": 0.24,
+        "muzzle_velocity": 850.0 * 50,
+        "bullet_damage": 115,
+    },
+}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--num-shots", type=int, default=100_000)
+    ap.add_argument("--time-step", type=float, default=1 / 500)
+    args = ap.parse_args()
+
+    print(f"{args.num_shots:,} shots, {get_num_threads()} threads")
+    for name, case in CASES.items():
+        kwargs = {
+            "ranges": RANGES,
+            "sim_time": 2.0,
+            "time_step": args.time_step,
+            "falloff_x": np.array([241491600.0, 1509322500.0]),
+            "falloff_y": np.array([0.85, 0.2]),
+            **case,
+        }
+        simulate_dispersion(num_shots=1, **kwargs)
+        start = time.perf_counter()
+        res = simulate_dispersion(num_shots=args.num_shots, **kwargs)
+        t = time.perf_counter() - start
+        projectiles = args.num_shots * case["num_projectiles"]
+        print(f"{name}: {t:.2f} s, {projectiles / t:,.0f} projectiles/s")
+        for r, p, d in zip(res.ranges, res.hit_probability, res.mean_damage):
+            print(f"  {r:>6.0f} m: hit {p:>6.3f}, mean damage {d:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare damage at distance queries with `query.DistanceIndex`
+against searching the full `simulate` trajectory with `np.interp`.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rs2simlib.fast.sim import simulate
+from rs2simlib.query import DistanceIndex
+
+PARAMS = {
+    "sim_time": np.float64(5.0),
+    "time_step": np.float64(1 / 500),
+    "drag_func": np.int64(7),
+    "ballistic_coeff": np.float64(0.24),
+    "aim_dir_x": np.float64(1.0),
+    "aim_dir_y": np.float64(0.0),
+    "muzzle_velocity": np.float64(340.0 * 50),
+    "falloff_x": np.array([241491600.0, 1509322500.0]),
+    "falloff_y": np.array([0.85, 0.2]),
+    "bullet_damage": np.int64(147),
+    "instant_damage": np.int64(160),
+    "pre_fire_trace_len": np.int64(25 * 50),
+}
+NUM_SCALAR = 10_000
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--size", type=int, default=1_000_000)
+    ap.add_argument("--step", type=float, default=1.0)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    res = simulate(**PARAMS)
+    index = DistanceIndex.from_result(res, step=args.step)
+    distance = np.random.default_rng(0).uniform(0.0, index.end, args.size)
+
+    print(f"trajectory: {res.shape[1]} samples ({res.nbytes:,} bytes),"
+          f" index: {index.table.shape[1]} points"
+          f" ({index.table.nbytes:,} bytes)")
+    for name, func in (
+            ("np.interp", lambda: np.interp(distance, res[3], res[2])),
+            ("DistanceIndex", lambda: index.damage(distance)),
+            ("DistanceIndex scalar",
+             lambda: [index.damage(137.0) for _ in range(NUM_SCALAR)]),
+    ):
+        n = NUM_SCALAR if "scalar" in name else args.size
+        t = best_time(func, args.repeat)
+        print(f"{name:>20}: {t / n * 1e9:>10.1f} ns/query")
+
+
+if __name__ == "__main__":
+    main()
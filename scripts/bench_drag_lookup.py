@@ -0,0 +1,90 @@
+"""Compare the cost of a drag coefficient lookup: the if/elif
+trees (`drag_g1`, `drag_g7`) against the table registry with
+the uniform grid index (`drag_coeff`) and the branch-free binary
+search (`drag_coeff_bsearch`).
+
+Random Mach numbers defeat the branch predictor. Sorted Mach
+numbers are closer to a trajectory, where Mach changes slowly.
+"""
+
+import argparse
+import time
+
+import numba as nb
+import numpy as np
+
+from rs2simlib.fast.drag import STANDARD_DRAG_TABLES
+from rs2simlib.fast.drag import drag_coeff
+from rs2simlib.fast.drag import drag_coeff_bsearch
+from rs2simlib.fast.drag import drag_g1
+from rs2simlib.fast.drag import drag_g7
+
+
+@nb.njit(cache=True)
+def sum_tree(drag_func, mach):
+    s = 0.0
+    for m in mach:
+        s += drag_g1(m) if drag_func == 1 else drag_g7(m)
+    return s
+
+
+@nb.njit(cache=True)
+def sum_grid(tables, drag_func, mach):
+    s = 0.0
+    for m in mach:
+        s += drag_coeff(tables, drag_func, m)
+    return s
+
+
+@nb.njit(cache=True)
+def sum_bsearch(tables, drag_func, mach):
+    s = 0.0
+    for m in mach:
+        s += drag_coeff_bsearch(tables, drag_func, m)
+    return s
+
+
+def best_time(func, repeat: int) -> float:
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--size", type=int, default=5_000_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    tables = STANDARD_DRAG_TABLES
+    random_mach = np.random.default_rng(0).uniform(0.0, 5.5, args.size)
+    sorted_mach = np.sort(random_mach)[::-1].copy()
+
+    print(f"{'curve':>5} {'order':>7} {'tree':>10} {'grid':>10}"
+          f" {'bsearch':>10}  [ns/lookup]")
+    for drag_func in (1, 7):
+        for order, mach in (("random", random_mach), ("sorted", sorted_mach)):
+            t_tree = best_time(
+                lambda drag_func=drag_func, mach=mach: sum_tree(
+                    drag_func, mach),
+                args.repeat)
+            t_grid = best_time(
+                lambda drag_func=drag_func, mach=mach: sum_grid(
+                    tables, drag_func, mach),
+                args.repeat)
+            t_bsearch = best_time(
+                lambda drag_func=drag_func, mach=mach: sum_bsearch(
+                    tables, drag_func, mach),
+                args.repeat)
+            ns = 1e9 / args.size
+            print(f"{'G' + str(drag_func):>5} {order:>7}"
+                  f" {t_tree * ns:>10.2f} {t_grid * ns:>10.2f}"
+                  f" {t_bsearch * ns:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare drag coefficient evaluation over an array of Mach
+numbers: Python loops over the scalar functions against the
+ufunc versions in `rs2simlib.fast.drag`.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rs2simlib import drag
+from rs2simlib.fast import drag as fastdrag
+from rs2simlib.fast.sim import get_num_threads
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--size", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    mach = np.random.default_rng(0).uniform(0.0, 5.0, args.size)
+    loop_size = min(args.size, 100_000)
+    loop_mach = mach[:loop_size]
+    rows = mach[:args.size - args.size % 100].reshape(100, -1)
+
+    print(f"{args.size:,} Mach numbers, {get_num_threads()} threads")
+    for name, func, n in (
+            ("drag.drag_g7 loop",
+             lambda: [drag.drag_g7(x) for x in loop_mach], loop_size),
+            ("fast.drag.drag_g7 loop",
+             lambda: [fastdrag.drag_g7(x) for x in loop_mach], loop_size),
+            ("drag_g7_ufunc",
+             lambda: fastdrag.drag_g7_ufunc(mach), args.size),
+            ("drag_g7_ufunc_parallel",
+             lambda: fastdrag.drag_g7_ufunc_parallel(mach), args.size),
+            ("drag_coeffs",
+             lambda: fastdrag.drag_coeffs(rows, 7), rows.size),
+    ):
+        func()
+        t = best_time(func, args.repeat)
+        print(f"{name:>24}: {n / t:>16,.0f} evals/s")
+
+
+if __name__ == "__main__":
+    main()
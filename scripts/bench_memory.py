@@ -0,0 +1,174 @@
+"""Memory footprint of parse results and a fully loaded class map.
+
+Writes `--num-weapons` weapon files, each with a bullet and a child
+bullet that only overrides the damage (like most game and mod
+content), parses them with `dataio.process_file`, builds the
+`Weapon` and `Bullet` class map and reports the traced memory per
+object. The class map is also pickled with `pdumps_class_map` to
+check that it round trips.
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Union
+
+from rs2simlib.dataio import pdumps_class_map
+from rs2simlib.dataio import ploads_class_map
+from rs2simlib.dataio import process_file
+from rs2simlib.models import Bullet
+from rs2simlib.models import BulletParseResult
+from rs2simlib.models import ClassBase
+from rs2simlib.models import PROJECTILE
+from rs2simlib.models import WEAPON
+from rs2simlib.models import Weapon
+from rs2simlib.models import WeaponParseResult
+
+BULLET_TEMPLATE = """\
+class {name}Bullet extends ROBullet;
+
+defaultproperties
+{{
+    BallisticCoefficient=0.138
+    Damage=489
+    Speed=36750
+    VelocityDamageFalloffCurve=(Points=((InVal=302760000,OutVal=0.46),\
+(InVal=1560250000,OutVal=0.12)))
+    DragFunction=RODF_G7
+}}
+"""
+
+CHILD_BULLET_TEMPLATE = """\
+class {name}Bullet_AP extends {name}Bullet;
+
+defaultproperties
+{{
+    Damage=520
+}}
+"""
+
+WEAPON_TEMPLATE = """\
+class ROWeap_{name} extends ROWeap_BaseRifle;
+
+defaultproperties
+{{
+    WeaponProjectiles(0)=class'{name}Bullet'
+    WeaponProjectiles(ALTERNATE_FIREMODE)=class'{name}Bullet_AP'
+    InstantHitDamage(0)=40
+    InstantHitDamage(ALTERNATE_FIREMODE)=45
+    Spread(0)=0.0004
+    Spread(ALTERNATE_FIREMODE)=0.0006
+    PreFireTraceLength=1250
+    AltAmmoLoadouts.Empty
+}}
+"""
+
+ParseResultLike = Union[BulletParseResult, WeaponParseResult]
+
+
+def write_files(directory: Path, num_weapons: int) -> List[Path]:
+    paths = []
+    for i in range(num_weapons):
+        name = f"Type{i}"
+        for file_name, template in (
+                (f"{name}Bullet.uc", BULLET_TEMPLATE),
+                (f"{name}Bullet_AP.uc", CHILD_BULLET_TEMPLATE),
+                (f"ROWeap_{name}.uc", WEAPON_TEMPLATE),
+        ):
+            path = directory / file_name
+            path.write_text(template.format(name=name))
+            paths.append(path)
+    return paths
+
+
+def build_class_map(
+        parse_map: Dict[str, ParseResultLike],
+) -> Dict[str, ClassBase]:
+    bullets: Dict[str, Bullet] = {}
+    for result in parse_map.values():
+        if isinstance(result, BulletParseResult):
+            bullets[result.class_name] = Bullet(
+                name=result.class_name,
+                parent=PROJECTILE,
+                speed=result.speed,
+                damage=result.damage,
+                damage_falloff=result.damage_falloff,
+                drag_func=result.drag_func,
+                ballistic_coeff=result.ballistic_coeff,
+            )
+    for bullet in bullets.values():
+        parent = bullets.get(parse_map[bullet.name].parent_name)
+        if parent is not None:
+            bullet.parent = parent
+
+    class_map: Dict[str, ClassBase] = dict(bullets)
+    for result in parse_map.values():
+        if isinstance(result, WeaponParseResult):
+            num = max(result.bullet_names, default=-1) + 1
+            class_map[result.class_name] = Weapon(
+                name=result.class_name,
+                parent=WEAPON,
+                bullets=[
+                    bullets.get(result.bullet_names.get(i, ""))
+                    for i in range(num)
+                ],
+                instant_damages=[
+                    result.instant_damages.get(i, 0) for i in range(num)],
+                num_projectiles=[
+                    result.num_projectiles.get(i, 0) for i in range(num)],
+                spreads=[result.spreads.get(i, 0.0) for i in range(num)],
+                pre_fire_length=result.pre_fire_length,
+                alt_ammo_loadouts=[],
+            )
+    return class_map
+
+
+def traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--num-weapons", type=int, default=5000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_files(Path(tmp), args.num_weapons)
+
+        tracemalloc.start()
+        start = traced()
+        parse_map: Dict[str, ParseResultLike] = {}
+        for path in paths:
+            result = process_file(path)
+            if result is not None:
+                parse_map[result.class_name] = result
+        parsed = traced()
+
+    class_map = build_class_map(parse_map)
+    built = traced()
+    tracemalloc.stop()
+
+    start_time = time.perf_counter()
+    pickled = pdumps_class_map(class_map)
+    loaded = ploads_class_map(pickled)
+    pickle_time = time.perf_counter() - start_time
+    assert loaded.keys() == class_map.keys()
+
+    num_results = len(parse_map)
+    num_classes = len(class_map)
+    print(f"parse results: {num_results:>8,} "
+          f"{(parsed - start) / num_results:>10,.1f} bytes/object")
+    print(f"class map:     {num_classes:>8,} "
+          f"{(built - parsed) / num_classes:>10,.1f} bytes/object")
+    print(f"pickled class map: {len(pickled) / num_classes:,.1f} bytes/object, "
+          f"round trip {pickle_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
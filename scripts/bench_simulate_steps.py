@@ -0,0 +1,134 @@
+"""Compare steps per second of the scalar `simulate` kernel
+against the previous array based kernel.
+"""
+
+import argparse
+import math
+import time
+
+import numba as nb
+import numpy as np
+
+from rs2simlib.fast.drag import drag_g1
+from rs2simlib.fast.drag import drag_g7
+from rs2simlib.fast.sim import simulate
+from rs2simlib.fast.sim.fastsim import GRAVITY
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR
+from rs2simlib.fast.sim.fastsim import SCALE_FACTOR_INVERSE
+from rs2simlib.fast.sim.fastsim import X1
+from rs2simlib.fast.sim.fastsim import X2
+
+# noinspection DuplicatedCode
+sim_params = {
+    "time_step": np.float64(1 / 500),
+    "sim_time": np.float64(5.0),
+    "ballistic_coeff": np.float64(0.24),
+    "aim_dir_x": np.float64(1.0),
+    "aim_dir_y": np.float64(0.0),
+    "muzzle_velocity": np.float64(340.0 * 50),
+    "falloff_x": np.array([241491600.0, 1509322500.0]),
+    "falloff_y": np.array([0.85, 0.2]),
+    "bullet_damage": np.int64(147),
+    "instant_damage": np.int64(160),
+    "pre_fire_trace_len": np.int64(25 * 50),
+    "start_loc_x": np.float64(0.0),
+    "start_loc_y": np.float64(0.0),
+    "drag_func": np.int64(7),
+}
+
+
+# Frozen copy of the array based kernel, kept for comparison.
+@nb.njit(cache=True)
+def simulate_array_state(
+        sim_time,
+        time_step,
+        drag_func,
+        ballistic_coeff,
+        aim_dir_x,
+        aim_dir_y,
+        muzzle_velocity,
+        falloff_x,
+        falloff_y,
+        bullet_damage,
+        instant_damage,
+        pre_fire_trace_len,
+        start_loc_x,
+        start_loc_y,
+):
+    d_accumulated = np.float64(0.0)
+    flight_time = np.float64(0.0)
+    location = np.array([start_loc_x, start_loc_y], dtype=np.float64)
+    bc_inverse = 1.0 / ballistic_coeff
+    velocity = np.array([aim_dir_x, aim_dir_y], dtype=np.float64)
+    velocity /= np.linalg.norm(velocity)
+    velocity *= muzzle_velocity
+
+    arr_len = math.ceil(sim_time / time_step) - 1
+    out = np.empty((8, arr_len), dtype=np.float64)
+
+    i = 0
+    while (flight_time < sim_time) and (i < arr_len):
+        flight_time += time_step
+        v_size = np.linalg.norm(velocity)
+        v = v_size * SCALE_FACTOR_INVERSE
+        mach = v * X1
+        if drag_func == 1:
+            cd = drag_g1(mach)
+        else:
+            cd = drag_g7(mach)
+        velocity += (
+                X2 * (cd * bc_inverse) * np.square(v)
+                * SCALE_FACTOR
+                * (-1 * ((velocity / v_size) * time_step)))
+        velocity[1] -= (GRAVITY * time_step)
+        loc_change = velocity * time_step
+        prev_loc = location.copy()
+        location += loc_change
+        d_accumulated += abs(np.linalg.norm(prev_loc - location))
+
+        v_size_sq = np.linalg.norm(velocity) ** 2
+        energy_transfer = np.interp(v_size_sq, falloff_x, falloff_y)
+        power_left = v_size_sq / (muzzle_velocity ** 2)
+        out[0, i] = location[0] / 50
+        out[1, i] = location[1] / 50
+        out[2, i] = bullet_damage * power_left * energy_transfer
+        out[3, i] = d_accumulated / 50
+        out[4, i] = flight_time
+        out[5, i] = np.linalg.norm(velocity) / 50
+        out[6, i] = energy_transfer
+        out[7, i] = power_left
+        i += 1
+    return out
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(**sim_params)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    before = simulate_array_state(**sim_params)
+    after = simulate(**sim_params)
+    max_rel_err = np.max(
+        np.abs(after - before) / np.maximum(np.abs(before), 1e-300))
+    print(f"max relative deviation: {max_rel_err:.3e}")
+
+    steps = before.shape[1]
+    for name, func in (
+            ("array state", simulate_array_state),
+            ("scalar state", simulate),
+    ):
+        t = best_time(func, args.repeat)
+        print(f"{name:>12}: {steps / t:>14,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare peak memory and time of `simulate` and `simulate_stream`
+for a long flight, reducing the stream to the maximum height.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from rs2simlib.fast.sim import Channel
+from rs2simlib.fast.sim import simulate
+from rs2simlib.fast.sim import simulate_stream
+
+PARAMS = {
+    "time_step": 1 / 500,
+    "drag_func": 1,
+    "ballistic_coeff": 0.1,
+    "aim_dir_x": 1.0,
+    "aim_dir_y": 1.0,
+    "muzzle_velocity": 200.0 * 50,
+    "falloff_x": np.array([241491600.0, 1509322500.0]),
+    "falloff_y": np.array([0.85, 0.2]),
+    "bullet_damage": 500,
+}
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = func()
+    t = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, t, peak
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sim-time", type=float, default=600.0)
+    ap.add_argument("--chunk-size", type=int, default=4096)
+    args = ap.parse_args()
+
+    def full():
+        return simulate(
+            sim_time=args.sim_time, instant_damage=0, pre_fire_trace_len=0,
+            **PARAMS)[1].max()
+
+    def stream():
+        return max(
+            chunk[0].max() for chunk in simulate_stream(
+                sim_time=args.sim_time, channels=Channel.Y,
+                chunk_size=args.chunk_size, **PARAMS))
+
+    # Compile outside of the measurements.
+    simulate(sim_time=0.1, instant_damage=0, pre_fire_trace_len=0, **PARAMS)
+    for _ in simulate_stream(sim_time=0.1, **PARAMS):
+        pass
+
+    for name, func in (("simulate", full), ("simulate_stream", stream)):
+        value, t, peak = measure(func)
+        print(f"{name:>16}: max height {value:.2f} m, {t:.2f} s, "
+              f"peak memory {peak / 2 ** 20:.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Benchmark suite for the simulation kernels, drag functions,
+models and parsing, with regression thresholds.
+
+Each benchmark reports the median time per operation (a simulation
+step, a drag lookup, a parsed file, ...). Results are compared to
+the thresholds in `bench_thresholds.json`, and the exit status is 1
+if any benchmark is slower than its threshold. Use `--output` to
+write the results as JSON, e.g. to track them across releases, and
+`--update-thresholds` to set the thresholds from the current run.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Tuple
+
+import numpy as np
+
+import rs2simlib
+from rs2simlib import dataio
+from rs2simlib import drag
+from rs2simlib.fast import drag as fastdrag
+from rs2simlib.fast.sim import simulate
+from rs2simlib.models import Bullet
+from rs2simlib.models import BulletSimulation
+from rs2simlib.models import DragFunction
+from rs2simlib.models import PROJECTILE
+from rs2simlib.models import freeze_class_map
+
+THRESHOLDS_FILE = Path(__file__).parent / "bench_thresholds.json"
+DATA_DIR = Path(__file__).parent.parent / "tests" / "data" / "UnrealScript"
+
+# Multiplier for --update-thresholds, leaves room for noise
+# and slower machines.
+THRESHOLD_MARGIN = 3.0
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Returns the function to time and the number of
+    # operations it performs per call.
+    setup: Callable[[], Tuple[Callable[[], object], int]]
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+
+    return register
+
+
+def make_bullet(parent: Bullet = PROJECTILE, name: str = "Bullet") -> Bullet:
+    return Bullet(
+        name=name,
+        parent=parent,
+        speed=850.0,
+        damage=115,
+        damage_falloff=np.array([[0.0, 1.0], [1509322500.0, 0.2]]),
+        drag_func=DragFunction.G7,
+        ballistic_coeff=0.24,
+    )
+
+
+def _simulate_setup(sim_time: float, time_step: float):
+    def setup():
+        kwargs = {
+            "sim_time": np.float64(sim_time),
+            "time_step": np.float64(time_step),
+            "drag_func": np.int64(7),
+            "ballistic_coeff": np.float64(0.24),
+            "aim_dir_x": np.float64(1.0),
+            "aim_dir_y": np.float64(0.0),
+            "muzzle_velocity": np.float64(850.0 * 50),
+            "falloff_x": np.array([241491600.0, 1509322500.0]),
+            "falloff_y": np.array([0.85, 0.2]),
+            "bullet_damage": np.int64(115),
+            "instant_damage": np.int64(0),
+            "pre_fire_trace_len": np.int64(0),
+        }
+        steps = simulate(**kwargs).shape[1]
+        return (lambda: simulate(**kwargs)), steps
+
+    return setup
+
+
+for _sim_time, _time_step in ((1.0, 1 / 500), (5.0, 1 / 500), (5.0, 1 / 5000)):
+    benchmark(
+        f"fast.sim.simulate[sim_time={_sim_time:g},time_step={_time_step:g}]"
+    )(_simulate_setup(_sim_time, _time_step))
+
+MACHS = np.random.default_rng(0).uniform(0.0, 5.0, 10_000)
+
+
+@benchmark("drag.drag_g7")
+def _drag_python():
+    machs = MACHS.tolist()
+
+    def run():
+        for mach in machs:
+            drag.drag_g7(mach)
+
+    return run, len(machs)
+
+
+@benchmark("fast.drag.drag_coeffs[g7]")
+def _drag_fast():
+    out = np.empty_like(MACHS)
+    return (lambda: fastdrag.drag_coeffs(MACHS, np.int64(7), out)), len(MACHS)
+
+
+@benchmark("models.BulletSimulation.simulate")
+def _bullet_simulation():
+    bullet = make_bullet()
+    steps = 1000
+
+    def run():
+        sim = BulletSimulation(
+            bullet=bullet,
+            velocity=np.array([1.0, 0.0]),
+            location=np.array([0.0, 0.0]),
+        )
+        for _ in range(steps):
+            sim.simulate(1 / 500)
+
+    return run, steps
+
+
+def make_bullet_chain(depth: int) -> Bullet:
+    parent = make_bullet()
+    for i in range(depth - 1):
+        parent = Bullet(
+            name=f"Child{i}",
+            parent=parent,
+            speed=-1,
+            damage=-1,
+            damage_falloff=parent.damage_falloff,
+            drag_func=DragFunction.Invalid,
+            ballistic_coeff=-1,
+        )
+    return parent
+
+
+def _get_attr_setup(frozen: bool):
+    def setup():
+        bullet = make_bullet_chain(5)
+        if frozen:
+            freeze_class_map({bullet.name: bullet})
+        calls = 1000
+
+        def run():
+            for _ in range(calls):
+                bullet.get_speed()
+
+        return run, calls
+
+    return setup
+
+
+benchmark("models.ClassBase.get_attr[depth=5]")(_get_attr_setup(False))
+benchmark("models.ClassBase.get_attr[depth=5,frozen]")(_get_attr_setup(True))
+
+
+@benchmark("dataio.process_file")
+def _process_file():
+    paths = [
+        DATA_DIR / "TypeXXBullet.uc",
+        DATA_DIR / "ROWeap_TypeXX_Shotgun.uc",
+    ]
+
+    def run():
+        for path in paths:
+            dataio.process_file(path)
+
+    return run, len(paths)
+
+
+def time_per_op(func: Callable[[], object], ops: int,
+                min_time: float, repeat: int) -> float:
+    """Median time per operation [s] over `repeat` runs of
+    at least `min_time` seconds each.
+    """
+    func()  # Warmup, e.g. JIT compilation.
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        t = time.perf_counter() - start
+        if t >= min_time:
+            break
+        number *= 2
+    times = [t]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) / (number * ops)
+
+
+def environment() -> Dict[str, str]:
+    import numba
+
+    return {
+        "rs2simlib": rs2simlib.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--filter", default="",
+                    help="only run benchmarks whose name contains this")
+    ap.add_argument("--min-time", type=float, default=0.2,
+                    help="minimum duration of a single run [s]")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--output", type=Path,
+                    help="write the results to this JSON file")
+    ap.add_argument("--thresholds", type=Path, default=THRESHOLDS_FILE)
+    ap.add_argument("--update-thresholds", action="store_true",
+                    help=f"set the thresholds to {THRESHOLD_MARGIN}x "
+                         "the measured times")
+    args = ap.parse_args()
+
+    thresholds: Dict[str, float] = {}
+    if args.thresholds.exists():
+        thresholds = json.loads(args.thresholds.read_text())
+
+    results = []
+    failed = False
+    for bench in BENCHMARKS:
+        if args.filter not in bench.name:
+            continue
+        func, ops = bench.setup()
+        t = time_per_op(func, ops, args.min_time, args.repeat)
+        threshold = thresholds.get(bench.name)
+        passed = threshold is None or t * 1e9 <= threshold
+        failed |= not passed
+        results.append({
+            "name": bench.name,
+            "ns_per_op": t * 1e9,
+            "ops_per_s": 1.0 / t,
+            "threshold_ns_per_op": threshold,
+            "passed": passed,
+        })
+        status = "" if passed else "  REGRESSION"
+        limit = "-" if threshold is None else f"{threshold:,.1f}"
+        print(f"{bench.name:<58} {t * 1e9:>14,.1f} ns/op "
+              f"(threshold {limit}){status}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            "timestamp": datetime.now(UTC).isoformat(),
+            "environment": environment(),
+            "results": results,
+        }, indent=2))
+
+    if args.update_thresholds:
+        for r in results:
+            thresholds[r["name"]] = round(r["ns_per_op"] * THRESHOLD_MARGIN, 1)
+        args.thresholds.write_text(
+            json.dumps(thresholds, indent=2, sort_keys=True) + "\n")
+        return
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measure the throughput of `run_sweep` over a synthetic class
+map with different numbers of worker processes.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rs2simlib.models import Bullet
+from rs2simlib.models import DragFunction
+from rs2simlib.models import PROJECTILE
+from rs2simlib.models import WEAPON
+from rs2simlib.models import Weapon
+from rs2simlib.sweep import SweepSettings
+from rs2simlib.sweep import run_sweep
+
+
+def make_class_map(num_weapons: int) -> dict:
+    rng = np.random.default_rng(0)
+    class_map = {}
+    for i in range(num_weapons):
+        bullet = Bullet(
+            name=f"Bullet{i}",
+            parent=PROJECTILE,
+            speed=float(rng.uniform(300, 900)),
+            damage=int(rng.integers(50, 150)),
+            damage_falloff=np.array([[0.0, 1.0], [1509322500.0, 0.2]]),
+            drag_func=DragFunction.G7,
+            ballistic_coeff=float(rng.uniform(0.1, 0.4)),
+        )
+        weapon = Weapon(
+            name=f"Weapon{i}",
+            parent=WEAPON,
+            bullets=[bullet],
+            instant_damages=[0],
+            pre_fire_length=25,
+            alt_ammo_loadouts=[],
+        )
+        class_map[bullet.name] = bullet
+        class_map[weapon.name] = weapon
+    return class_map
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--num-weapons", type=int, default=200)
+    ap.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--chunk-size", type=int, default=8)
+    args = ap.parse_args()
+
+    class_map = make_class_map(args.num_weapons)
+    settings = SweepSettings(sim_time=2.0, time_step=1 / 500)
+    for processes in args.processes:
+        start = time.perf_counter()
+        summary = run_sweep(
+            class_map, writer=lambda r: None, settings=settings,
+            processes=processes, chunk_size=args.chunk_size)
+        t = time.perf_counter() - start
+        print(f"{processes} processes: {summary.num_jobs} jobs in "
+              f"{t:.2f} s ({summary.num_jobs / t:.1f} jobs/s, "
+              f"{summary.num_failed} failed)")
+
+
+if __name__ == "__main__":
+    main()
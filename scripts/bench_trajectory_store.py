@@ -0,0 +1,62 @@
+"""Measure random access reads from a `TrajectoryStore` compared
+to loading a pickle of all trajectories.
+"""
+
+import argparse
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from rs2simlib.fast.sim import Channel
+from rs2simlib.sweep import TrajectoryStore
+from rs2simlib.sweep import TrajectoryStoreWriter
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--num-trajectories", type=int, default=2000)
+    ap.add_argument("--length", type=int, default=2500)
+    ap.add_argument("--num-reads", type=int, default=1000)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    data = rng.random((8, args.length))
+    keys = [f"Weapon{i}/0" for i in range(args.num_trajectories)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "store"
+        start = time.perf_counter()
+        with TrajectoryStoreWriter(directory) as writer:
+            for key in keys:
+                writer.append(key, data)
+        t = time.perf_counter() - start
+        store = TrajectoryStore(directory)
+        print(f"wrote {len(store)} trajectories, "
+              f"{store.size() / 2 ** 20:.0f} MiB in {t:.2f} s")
+
+        start = time.perf_counter()
+        store = TrajectoryStore(directory)
+        print(f"open: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+        picks = rng.choice(keys, args.num_reads)
+        start = time.perf_counter()
+        for key in picks:
+            np.asarray(store.channel(key, Channel.DAMAGE)).sum()
+        t = time.perf_counter() - start
+        print(f"damage curve read: {t / args.num_reads * 1e3:.3f} ms")
+
+        pickle_path = Path(tmp) / "results.pickle"
+        with pickle_path.open("wb") as f:
+            pickle.dump({key: data.copy() for key in keys}, f)
+        start = time.perf_counter()
+        with pickle_path.open("rb") as f:
+            pickle.load(f)[picks[0]][2].sum()
+        t = time.perf_counter() - start
+        print(f"pickle load for one read: {t * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
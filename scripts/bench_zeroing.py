@@ -0,0 +1,69 @@
+"""Compare solving sight table aim angles with `solve_aim_angles`
+against brute forcing `simulate` over a grid of aim angles and
+scanning each result for the target crossing.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rs2simlib.fast.sim import simulate
+from rs2simlib.fast.sim import solve_aim_angles
+
+PARAMS = {
+    "sim_time": np.float64(5.0),
+    "time_step": np.float64(1 / 500),
+    "drag_func": np.int64(7),
+    "ballistic_coeff": np.float64(0.24),
+    "muzzle_velocity": np.float64(340.0 * 50),
+}
+
+
+def brute_force(target_x: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    """Height [m] at each target range for each aim angle."""
+    heights = np.empty((len(angles), len(target_x)))
+    for i, angle in enumerate(angles):
+        res = simulate(
+            **PARAMS,
+            aim_dir_x=np.float64(np.cos(angle)),
+            aim_dir_y=np.float64(np.sin(angle)),
+            falloff_x=np.array([1.0, 2.0]),
+            falloff_y=np.array([1.0, 1.0]),
+            bullet_damage=np.int64(100),
+            instant_damage=np.int64(100),
+            pre_fire_trace_len=np.int64(0),
+        )
+        heights[i] = np.interp(target_x, res[0], res[1])
+    return heights
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--num-angles", type=int, default=1000)
+    args = ap.parse_args()
+
+    target_x = np.arange(50.0, 1050.0, 50.0)
+    target_y = np.zeros_like(target_x)
+    solve_aim_angles(target_x, target_y, **PARAMS)
+
+    start = time.perf_counter()
+    solved = solve_aim_angles(target_x, target_y, **PARAMS)
+    t_solve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    angles = np.linspace(0.0, np.max(solved) * 1.1, args.num_angles)
+    heights = brute_force(target_x, angles)
+    brute = np.array([
+        np.interp(0.0, heights[:, j], angles) for j in range(len(target_x))
+    ])
+    t_brute = time.perf_counter() - start
+
+    print(f"{len(target_x)} targets")
+    print(f"solve_aim_angles: {t_solve * 1e3:>10.2f} ms")
+    print(f"brute force ({args.num_angles} angles): {t_brute * 1e3:>10.2f} ms,"
+          f" max angle difference {np.max(np.abs(brute - solved)):.2e} rad")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure the deviation of float32 simulations from the
+float64 reference at standard ranges.
+
+For a grid of muzzle velocities, ballistic coefficients and
+drag functions, prints the maximum absolute deviation of
+drop (y) and damage at each range.
+"""
+
+import argparse
+import itertools
+
+import numpy as np
+
+from rs2simlib.fast.sim import Channel
+from rs2simlib.fast.sim import simulate_until
+
+RANGES = (100.0, 300.0, 1000.0)
+CHANNELS = Channel.Y | Channel.DAMAGE | Channel.DISTANCE
+
+
+def at_ranges(res: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    y, damage, distance = res.astype(np.float64)
+    return (
+        np.interp(RANGES, distance, y, right=np.nan),
+        np.interp(RANGES, distance, damage, right=np.nan),
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--time-step", type=float, default=1 / 500)
+    ap.add_argument("--sim-time", type=float, default=5.0)
+    args = ap.parse_args()
+
+    max_drop_err = np.zeros(len(RANGES))
+    max_dmg_err = np.zeros(len(RANGES))
+
+    for speed, bc, drag_func in itertools.product(
+            (300.0, 500.0, 700.0, 900.0),
+            (0.1, 0.2, 0.3, 0.4),
+            (1, 7),
+    ):
+        params = {
+            "sim_time": np.float64(args.sim_time),
+            "time_step": np.float64(args.time_step),
+            "drag_func": np.int64(drag_func),
+            "ballistic_coeff": np.float64(bc),
+            "aim_dir_x": np.float64(1.0),
+            "aim_dir_y": np.float64(0.0),
+            "muzzle_velocity": np.float64(speed * 50),
+            "falloff_x": np.array([241491600.0, 1509322500.0]),
+            "falloff_y": np.array([0.85, 0.2]),
+            "bullet_damage": np.int64(147),
+            "instant_damage": np.int64(160),
+            "pre_fire_trace_len": np.int64(25 * 50),
+            "start_loc_x": np.float64(0.0),
+            "start_loc_y": np.float64(0.0),
+            "channels": np.int64(CHANNELS),
+        }
+        ref, _ = simulate_until(**params, dtype=np.float64)
+        res, _ = simulate_until(**params, dtype=np.float32)
+        ref_y, ref_dmg = at_ranges(ref)
+        y, dmg = at_ranges(res)
+        max_drop_err = np.fmax(max_drop_err, np.abs(y - ref_y))
+        max_dmg_err = np.fmax(max_dmg_err, np.abs(dmg - ref_dmg))
+
+    print(f"{'range [m]':>10} {'max drop err [m]':>18} {'max dmg err':>12}")
+    for r, drop_err, dmg_err in zip(RANGES, max_drop_err, max_dmg_err):
+        print(f"{r:>10.0f} {drop_err:>18.2e} {dmg_err:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
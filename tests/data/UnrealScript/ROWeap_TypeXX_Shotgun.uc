@@ -0,0 +1,26 @@
+//=============================================================================
+// ROWeap_TypeXX_Shotgun
+//=============================================================================
+// Test Data for rs2simlib
+//=============================================================================
+class ROWeap_TypeXX_Shotgun extends ROWeap_BaseShotgun;
+
+defaultproperties
+{
+	WeaponProjectiles(0)=class'TypeXXBuckshot'
+	WeaponProjectiles(ALTERNATE_FIREMODE)=class'TypeXXSlug'
+
+	InstantHitDamage(0)=40
+	InstantHitDamage(ALTERNATE_FIREMODE)=140
+
+	NumProjectiles(DEFAULT_FIREMODE)=9
+	NumProjectiles(ALTERNATE_FIREMODE)=1 // Slug.
+
+	// Spread(0)=0.05
+	Spread(0)=0.0375
+	Spread(ALTERNATE_FIREMODE)=0.0015
+
+	PreFireTraceLength=1250 //25 Meters
+
+	AltAmmoLoadouts.Empty
+}
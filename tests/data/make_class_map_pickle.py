@@ -0,0 +1,66 @@
+"""Writes `class_map.pickle` for tests/test_pickling.py.
+
+The fixture must be pickled by the regular (dict backed) model
+dataclasses of the baseline release, which have no `num_projectiles`
+or `spreads` fields, so run this with that version importable:
+
+    git worktree add /tmp/rs2simlib-base f00777d
+    cp rs2simlib/_version.py /tmp/rs2simlib-base/rs2simlib/
+    PYTHONPATH=/tmp/rs2simlib-base python tests/data/make_class_map_pickle.py
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from rs2simlib.dataio import pdumps_class_map
+from rs2simlib.models import AltAmmoLoadout
+from rs2simlib.models import Bullet
+from rs2simlib.models import DragFunction
+from rs2simlib.models import PROJECTILE
+from rs2simlib.models import WEAPON
+from rs2simlib.models import Weapon
+
+
+def main():
+    bullet = Bullet(
+        name="TypeXXBullet",
+        parent=PROJECTILE,
+        speed=735.0,
+        damage=489,
+        damage_falloff=np.array([[302760000.0, 0.46], [1560250000.0, 0.12]]),
+        drag_func=DragFunction.G7,
+        ballistic_coeff=0.138,
+    )
+    ap_bullet = Bullet(
+        name="TypeXXBullet_AP",
+        parent=bullet,
+        speed=-1,
+        damage=520,
+        damage_falloff=np.array([0.0, 0.0]),
+        drag_func=DragFunction.Invalid,
+        ballistic_coeff=-1,
+    )
+    weapon = Weapon(
+        name="ROWeap_TypeXX",
+        parent=WEAPON,
+        bullets=[bullet, ap_bullet],
+        instant_damages=[40, 45],
+        pre_fire_length=25,
+        alt_ammo_loadouts=[
+            None,
+            AltAmmoLoadout(
+                name="ROWeap_TypeXX_AltAmmoLoadouts",
+                parent=None,
+                bullets=[ap_bullet],
+                instant_damages=[45],
+            ),
+        ],
+    )
+    class_map = {obj.name: obj for obj in (bullet, ap_bullet, weapon)}
+    path = Path(__file__).parent / "class_map.pickle"
+    path.write_bytes(pdumps_class_map(class_map))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+
+def adaptive_params(sim_params) -> dict:
+    return {
+        "sim_time": sim_params["sim_time"],
+        "drag_func": sim_params["drag_func"],
+        "ballistic_coeff": sim_params["ballistic_coeff"],
+        "aim_dir_x": sim_params["aim_dir_x"],
+        "aim_dir_y": sim_params["aim_dir_y"],
+        "muzzle_velocity": sim_params["muzzle_velocity"],
+        "falloff_x": sim_params["falloff_x"],
+        "falloff_y": sim_params["falloff_y"],
+        "bullet_damage": sim_params["bullet_damage"],
+        "start_loc_x": sim_params["start_loc_x"],
+        "start_loc_y": sim_params["start_loc_y"],
+    }
+
+
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_simulate_adaptive_matches_fine_euler(sim_params):
+    times = np.array([0.25, 0.5, 1.0, 1.5])
+    res, steps = fastsim.simulate_adaptive(
+        times, **adaptive_params(sim_params))
+
+    fine = fastsim.simulate(**{
+        **sim_params,
+        "sim_time": np.float64(1.6),
+        "time_step": np.float64(1 / 200_000),
+    })
+
+    # Each drag table discontinuity crossed costs a step.
+    assert steps < 200
+    np.testing.assert_allclose(res[4], times)
+    for row in (0, 1, 3, 5):
+        expected = np.interp(times, fine[4], fine[row])
+        np.testing.assert_allclose(res[row], expected, rtol=1e-5, atol=1e-3)
+    np.testing.assert_allclose(
+        res[2], np.interp(times, fine[4], fine[2]), rtol=1e-4)
+
+
+def test_simulate_adaptive_by_distance():
+    distances = np.arange(0.0, 5000.0, 1.0)
+    res, _ = fastsim.simulate_adaptive(
+        distances,
+        **{**adaptive_params(sim_params_1), "sim_time": np.float64(2.0)},
+        by_distance=True,
+    )
+    reached = ~np.isnan(res[3])
+    assert reached[0]
+    assert not reached[-1]
+    np.testing.assert_allclose(res[3, reached], distances[reached], atol=1e-9)
+    assert (np.diff(res[4, reached]) > 0).all()
+
+
+def test_simulate_adaptive_invalid_samples():
+    with pytest.raises(ValueError):
+        fastsim.simulate_adaptive(
+            np.array([1.0, 0.5]), **adaptive_params(sim_params_1))
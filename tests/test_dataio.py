@@ -2,7 +2,10 @@ import numpy as np
 import pytest
 
 from rs2simlib.dataio import handle_bullet_file
+from rs2simlib.dataio import handle_weapon_file
+from rs2simlib.dataio import process_file
 from rs2simlib.dataio import strip_comments
+from rs2simlib.models import BulletParseResult
 from rs2simlib.models import DragFunction
 from . import data_dir
 
@@ -55,6 +58,23 @@ def test_handle_bullet_file() -> None:
         )
 
 
+def test_parse_results_are_compact() -> None:
+    path = uscript_dir / "ROWeap_TypeXX_Shotgun.uc"
+    weapon = process_file(path)
+    other = process_file(path)
+    assert weapon and other
+    assert not hasattr(weapon, "__dict__")
+    # Interned, so every reference to a class name is the same string.
+    assert weapon.class_name is other.class_name
+    assert weapon.parent_name is other.parent_name
+    assert weapon.bullet_names[0] is other.bullet_names[0]
+
+    # Parse results without a falloff curve share one read-only default.
+    default_falloff = BulletParseResult().damage_falloff
+    assert BulletParseResult().damage_falloff is default_falloff
+    assert not default_falloff.flags.writeable
+
+
 strip_comments_test_data = [
     (
         "",
@@ -126,3 +146,19 @@ strip_comments_test_data = [
 def test_strip_comments(src: str, stripped: str) -> None:
     result = strip_comments(src)
     assert result == stripped
+
+
+def test_handle_weapon_file() -> None:
+    result = handle_weapon_file(
+        path=uscript_dir / "ROWeap_TypeXX_Shotgun.uc",
+        base_class_name="Weapon",
+    )
+    assert result
+    assert result.class_name == "ROWeap_TypeXX_Shotgun"
+    assert result.parent_name == "ROWeap_BaseShotgun"
+    assert result.bullet_names == {0: "TypeXXBuckshot", 1: "TypeXXSlug"}
+    assert result.instant_damages == {0: 40, 1: 140}
+    assert result.num_projectiles == {0: 9, 1: 1}
+    assert result.spreads == {0: 0.0375, 1: 0.0015}
+    assert result.pre_fire_length == 25
+    assert not result.alt_ammo_loadouts
@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from rs2simlib.models import PROJECTILE
+from rs2simlib.models import WEAPON
+from rs2simlib.models import Weapon
+from .test_sim import make_bullet
+from .test_sim import sim_params_1
+
+RANGES = np.array([10.0, 25.0, 50.0, 100.0])
+
+
+def dispersion_params(sim_params) -> dict:
+    return {
+        "sim_time": sim_params["sim_time"],
+        "time_step": sim_params["time_step"],
+        "drag_func": sim_params["drag_func"],
+        "ballistic_coeff": sim_params["ballistic_coeff"],
+        "muzzle_velocity": sim_params["muzzle_velocity"],
+        "falloff_x": sim_params["falloff_x"],
+        "falloff_y": sim_params["falloff_y"],
+        "bullet_damage": sim_params["bullet_damage"],
+    }
+
+
+def test_dispersion_without_spread():
+    res = fastsim.simulate_dispersion(
+        RANGES, num_shots=10, num_projectiles=3, spread=0.0,
+        **dispersion_params(sim_params_1))
+
+    expected = fastsim.simulate(**sim_params_1)
+    np.testing.assert_array_equal(res.hit_probability, 1.0)
+    np.testing.assert_array_equal(res.shot_hit_probability, 1.0)
+    np.testing.assert_allclose(
+        res.mean_damage, 3 * np.interp(RANGES, expected[0], expected[2]),
+        rtol=1e-4)
+    np.testing.assert_array_equal(res.damage_counts.sum(axis=1), 10)
+
+
+def test_dispersion_hit_probability():
+    spread = 0.03
+    width = 0.5
+    res = fastsim.simulate_dispersion(
+        RANGES[:1], num_shots=20_000, num_projectiles=1, spread=spread,
+        target_width=width, target_height=10.0,
+        **dispersion_params(sim_params_1))
+
+    # Small cone: directions are uniform on a disk of radius r
+    # and the target is a vertical strip through its center.
+    r = RANGES[0] * math.tan(spread)
+    z = width / 2
+    strip = 2 * (z * math.sqrt(r * r - z * z) + r * r * math.asin(z / r))
+    assert res.hit_probability[0] == pytest.approx(
+        strip / (math.pi * r * r), abs=0.02)
+    assert (np.diff(res.hit_probability) <= 0).all()
+
+
+def test_dispersion_reproducible():
+    kwargs = {
+        "ranges": RANGES,
+        "num_shots": 1000,
+        "num_projectiles": 9,
+        "spread": 0.04,
+        **dispersion_params(sim_params_1),
+    }
+    res = fastsim.simulate_dispersion(**kwargs, seed=1)
+    num_threads = fastsim.get_num_threads()
+    try:
+        fastsim.set_num_threads(1)
+        single = fastsim.simulate_dispersion(**kwargs, seed=1)
+    finally:
+        fastsim.set_num_threads(num_threads)
+    for a, b in zip(res, single):
+        np.testing.assert_array_equal(a, b)
+
+    other = fastsim.simulate_dispersion(**kwargs, seed=2)
+    assert not np.array_equal(res.damage_counts, other.damage_counts)
+    np.testing.assert_allclose(
+        res.hit_probability, other.hit_probability, atol=0.02)
+
+
+def test_weapon_dispersion():
+    bullet = make_bullet(sim_params_1)
+    weapon = Weapon(
+        name="TestShotgun",
+        parent=WEAPON,
+        bullets=[bullet],
+        instant_damages=[0],
+        pre_fire_length=50,
+        alt_ammo_loadouts=[],
+        num_projectiles=[9],
+        spreads=[0.04],
+    )
+    res = fastsim.simulate_weapon_dispersion(
+        weapon, RANGES, num_shots=100, sim_time=2.0, time_step=1 / 500)
+    expected = fastsim.simulate_dispersion(
+        RANGES, num_shots=100, num_projectiles=9, spread=0.04,
+        **{**dispersion_params(sim_params_1), "sim_time": 2.0})
+    for a, b in zip(res, expected):
+        np.testing.assert_array_equal(a, b)
+
+    rifle = Weapon(
+        name="TestRifle",
+        parent=WEAPON,
+        bullets=[PROJECTILE],
+        instant_damages=[0],
+        pre_fire_length=50,
+        alt_ammo_loadouts=[],
+    )
+    assert rifle.get_num_projectiles(0) == 1
+    assert rifle.get_spread(0) == 0.0
+
+
+def test_dispersion_invalid():
+    with pytest.raises(ValueError):
+        fastsim.simulate_dispersion(
+            RANGES[::-1], num_shots=1, num_projectiles=1, spread=0.0,
+            **dispersion_params(sim_params_1))
+    with pytest.raises(ValueError):
+        fastsim.simulate_dispersion(
+            RANGES, num_shots=0, num_projectiles=1, spread=0.0,
+            **dispersion_params(sim_params_1))
+    with pytest.raises(ValueError):
+        fastsim.simulate_dispersion(
+            RANGES, num_shots=1, num_projectiles=1, spread=0.0,
+            **{**dispersion_params(sim_params_1), "drag_func": 3})
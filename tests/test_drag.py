@@ -29,3 +29,114 @@ def test_drag_g1():
 def test_drag_g7():
     assert drag.drag_g7(0.0) == pytest.approx(0.1198)
     assert drag.drag_g7(5.1) == pytest.approx(0.1618)
+
+
+def test_fast_drag_funcs_float32():
+    for x in np.arange(start=-3.0, stop=10.0, step=0.1, dtype=np.float32):
+        assert fastdrag.drag_g1(x) == pytest.approx(
+            fastdrag.drag_g1(np.float64(x)), rel=1e-6)
+        assert fastdrag.drag_g7(x) == pytest.approx(
+            fastdrag.drag_g7(np.float64(x)), rel=1e-6)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize(
+    "scalar_func, ufuncs",
+    [
+        (fastdrag.drag_g1,
+         (fastdrag.drag_g1_ufunc, fastdrag.drag_g1_ufunc_parallel)),
+        (fastdrag.drag_g7,
+         (fastdrag.drag_g7_ufunc, fastdrag.drag_g7_ufunc_parallel)),
+    ],
+)
+def test_fast_drag_ufuncs(scalar_func, ufuncs, dtype):
+    mach = np.arange(start=-3.0, stop=10.0, step=0.01, dtype=dtype)
+    expected = np.array([scalar_func(x) for x in mach], dtype=dtype)
+    for ufunc in ufuncs:
+        res = ufunc(mach)
+        assert res.dtype == dtype
+        np.testing.assert_array_equal(res, expected)
+        np.testing.assert_array_equal(
+            ufunc(mach.reshape(-1, 10)), expected.reshape(-1, 10))
+
+
+def test_fast_drag_coeffs():
+    mach = np.linspace(0.0, 5.0, 3000).reshape(3, 1000)
+    res = fastdrag.drag_coeffs(mach, np.array([1, 7, 0]))
+    np.testing.assert_array_equal(res[0], fastdrag.drag_g1_ufunc(mach[0]))
+    np.testing.assert_array_equal(res[1], fastdrag.drag_g7_ufunc(mach[1]))
+    assert np.isnan(res[2]).all()
+    res32 = fastdrag.drag_coeffs(mach.astype(np.float32), 7)
+    assert res32.dtype == np.float32
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize(
+    "drag_func, tree_func",
+    [(1, fastdrag.drag_g1), (7, fastdrag.drag_g7)],
+)
+def test_fast_drag_tables_match_trees(drag_func, tree_func, dtype):
+    tables = fastdrag.STANDARD_DRAG_TABLES
+    mach = np.concatenate([
+        np.arange(start=-1.0, stop=7.0, step=0.001),
+        # Breakpoints and their neighbours.
+        tables.mach,
+        np.nextafter(tables.mach, -np.inf),
+        np.nextafter(tables.mach, np.inf),
+        [np.nan, np.inf, -np.inf],
+    ]).astype(dtype)
+    for x in mach:
+        expected = tree_func(x)
+        assert fastdrag.drag_coeff(tables, drag_func, x) == expected
+        assert fastdrag.drag_coeff_bsearch(tables, drag_func, x) == expected
+
+
+@pytest.mark.parametrize(
+    "drag_func, py_func",
+    [
+        (2, drag.drag_g2),
+        (5, drag.drag_g5),
+        (6, drag.drag_g6),
+        (8, drag.drag_g8),
+    ],
+)
+def test_fast_drag_tables_standard_curves(drag_func, py_func):
+    tables = fastdrag.STANDARD_DRAG_TABLES
+    for x in np.arange(start=-1.0, stop=7.0, step=0.001):
+        expected = py_func(x)
+        assert fastdrag.drag_coeff(tables, drag_func, x) == expected
+        assert fastdrag.drag_coeff_bsearch(tables, drag_func, x) == expected
+    # Transonic drag rise.
+    assert py_func(1.1) > 1.5 * py_func(0.5)
+
+
+def test_fast_drag_tables_custom_curve():
+    mach = np.linspace(0.0, 2.0, 100_001)
+    cd = 0.1 + mach
+    fastdrag.register_drag_curve(100, mach, cd)
+    try:
+        tables = fastdrag.drag_tables()
+        # Too fine for a full grid, the lookup is still exact.
+        assert tables.grid.size < mach.size + fastdrag.STANDARD_DRAG_TABLES.grid.size
+        rng = np.random.default_rng(0)
+        for x in np.concatenate([rng.uniform(-0.5, 2.5, 1000), mach[::997]]):
+            k = max(np.searchsorted(mach, x, side="right") - 1, 0)
+            assert fastdrag.drag_coeff(tables, 100, x) == cd[k]
+            assert fastdrag.drag_coeff_bsearch(tables, 100, x) == cd[k]
+        assert fastdrag.drag_coeff(tables, 7, 1.0) == fastdrag.drag_g7(1.0)
+    finally:
+        fastdrag.unregister_drag_curve(100)
+    assert fastdrag.drag_tables() is fastdrag.STANDARD_DRAG_TABLES
+
+
+def test_fast_drag_tables_invalid():
+    with pytest.raises(ValueError):
+        fastdrag.register_drag_curve(7, [0.0, 1.0], [0.1, 0.2])
+    with pytest.raises(ValueError):
+        fastdrag.register_drag_curve(100, [0.0, 0.0], [0.1, 0.2])
+    with pytest.raises(ValueError):
+        fastdrag.register_drag_curve(100, [0.0, 1.0], [0.1])
+    with pytest.raises(ValueError):
+        fastdrag.drag_coeff(fastdrag.STANDARD_DRAG_TABLES, 3, 1.0)
+    with pytest.raises(ValueError):
+        fastdrag.drag_coeff(fastdrag.STANDARD_DRAG_TABLES, 1000, 1.0)
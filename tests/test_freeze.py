@@ -0,0 +1,119 @@
+import pickle
+
+import numpy as np
+
+from rs2simlib.models import Bullet
+from rs2simlib.models import DragFunction
+from rs2simlib.models import PROJECTILE
+from rs2simlib.models import WEAPON
+from rs2simlib.models import Weapon
+from rs2simlib.models import freeze_class_map
+
+
+def make_chain(depth: int) -> list:
+    base = Bullet(
+        name="BaseBullet",
+        parent=PROJECTILE,
+        speed=850.0,
+        damage=115,
+        damage_falloff=np.array([[0.0, 1.0], [1509322500.0, 0.2]]),
+        drag_func=DragFunction.G7,
+        ballistic_coeff=0.24,
+    )
+    chain = [base]
+    for i in range(depth):
+        chain.append(Bullet(
+            name=f"Child{i}",
+            parent=chain[-1],
+            speed=-1,
+            damage=-1,
+            damage_falloff=np.array([0.0, 0.0]),
+            drag_func=DragFunction.Invalid,
+            ballistic_coeff=-1,
+        ))
+    return chain
+
+
+def accessors(bullet: Bullet) -> tuple:
+    return (
+        bullet.get_speed(),
+        bullet.get_damage(),
+        bullet.get_damage_falloff().tolist(),
+        bullet.get_drag_func(),
+        bullet.get_ballistic_coeff(),
+    )
+
+
+def test_freeze_matches_walk():
+    chain = make_chain(5)
+    class_map = {b.name: b for b in chain}
+    expected = {name: accessors(b) for name, b in class_map.items()}
+    freeze_class_map(class_map)
+    assert all(b._frozen is not None for b in chain)
+    assert {name: accessors(b) for name, b in class_map.items()} == expected
+
+
+def test_parent_change_invalidates_children():
+    chain = make_chain(3)
+    freeze_class_map({b.name: b for b in chain})
+    chain[0].speed = 700.0
+    assert all(b._frozen is None for b in chain)
+    assert chain[-1].get_speed() == 700.0
+
+    freeze_class_map({b.name: b for b in chain})
+    other = make_chain(0)[0]
+    other.name = "OtherBullet"
+    other.drag_func = DragFunction.G1
+    chain[2].parent = other
+    assert chain[2]._frozen is None and chain[3]._frozen is None
+    assert chain[1]._frozen is not None
+    assert chain[3].get_drag_func() == DragFunction.G1
+
+
+def test_freeze_weapon():
+    bullet = make_chain(0)[0]
+    parent = Weapon(
+        name="Rifle", parent=WEAPON, bullets=[bullet], instant_damages=[10],
+        pre_fire_length=25, alt_ammo_loadouts=[])
+    child = Weapon(
+        name="RifleChild", parent=parent, bullets=[], instant_damages=[],
+        pre_fire_length=-1, alt_ammo_loadouts=[])
+    freeze_class_map({"RifleChild": child})
+    assert parent._frozen is not None
+    assert child.get_bullets() == [bullet]
+    assert child.get_pre_fire_length() == 25
+    assert child.get_num_projectiles(0) == 1
+    assert child.get_spread(0) == 0.0
+
+
+def test_get_attr_other_invalid_value():
+    chain = make_chain(2)
+    chain[1].speed = 0.0
+    walked = [
+        [b.get_attr("speed", invalid_value=value) for b in chain]
+        for value in (0.0, None)
+    ]
+    assert walked == [[850.0, 850.0, -1], [850.0, 850.0, -1]]
+    freeze_class_map({b.name: b for b in chain})
+    assert [b.get_speed() for b in chain] == [850.0, 0.0, 0.0]
+    assert [
+        [b.get_attr("speed", invalid_value=value) for b in chain]
+        for value in (0.0, None)
+    ] == walked
+
+
+def test_unresolvable_attributes_are_not_frozen():
+    broken = make_chain(1)[1]
+    broken.parent = None
+    broken.speed = 800.0
+    broken.freeze()
+    assert broken.get_speed() == 800.0
+    assert "damage" not in broken._frozen
+
+
+def test_pickle_frozen():
+    chain = make_chain(2)
+    freeze_class_map({b.name: b for b in chain})
+    leaf = pickle.loads(pickle.dumps(chain[-1]))
+    assert leaf._frozen is None
+    assert accessors(leaf) == accessors(chain[-1])
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import rs2simlib
+
+# Generous, importing numba alone takes several times longer.
+IMPORT_TIME_BUDGET = 1.0
+
+
+def run_python(code: str) -> str:
+    # Numba debug output (e.g. set by test_caching) goes to stdout.
+    env = {k: v for k, v in os.environ.items()
+           if not k.startswith("NUMBA_DEBUG")}
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+
+
+def test_import_does_not_load_numba():
+    out = run_python(
+        "import sys\n"
+        "import rs2simlib\n"
+        "import rs2simlib.dataio\n"
+        "import rs2simlib.query\n"
+        "rs2simlib.models.WEAPON\n"
+        "print('numba' in sys.modules, 'matplotlib' in sys.modules)\n"
+        "rs2simlib.fast\n"
+        "print('numba' in sys.modules)\n"
+    )
+    assert out.split() == ["False", "False", "True"]
+
+
+def test_import_time():
+    out = run_python(
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import rs2simlib.dataio\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    assert float(out) < IMPORT_TIME_BUDGET
+
+
+def test_lazy_attributes():
+    assert set(rs2simlib.__all__) <= set(dir(rs2simlib))
+    assert rs2simlib.version == rs2simlib.__version__
+    assert rs2simlib.fast.sim.simulate is not None
+    with pytest.raises(AttributeError):
+        _ = rs2simlib.does_not_exist
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from rs2simlib.models import Integrator
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+DRAG_EVALUATIONS_PER_STEP = {
+    Integrator.EULER: 1,
+    Integrator.RK4: 4,
+    Integrator.VERLET: 2,
+}
+
+
+@pytest.mark.parametrize("integrator", list(Integrator))
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_simulate_instrumented(sim_params, integrator):
+    expected = fastsim.simulate(**sim_params, integrator=np.int64(integrator))
+    result, counters = fastsim.simulate_instrumented(
+        **sim_params, integrator=integrator)
+    np.testing.assert_array_equal(result, expected)
+
+    steps = expected.shape[1]
+    assert counters.steps == steps
+    assert counters.interp_calls == steps
+    assert counters.supersonic_steps + counters.subsonic_steps == steps
+    assert counters.drag_evaluations == (
+            steps * DRAG_EVALUATIONS_PER_STEP[integrator])
+    assert counters.drag_evaluations_by_mach.sum() == (
+        counters.drag_evaluations)
+    assert counters.drag_evaluations_by_mach.shape[0] == (
+            counters.mach_region_edges.shape[0] + 1)
+
+
+def test_simulate_instrumented_mach_regions():
+    # sim_params_2 starts at about Mach 2.9 and slows down through
+    # all lower regions, sim_params_1 stays just below Mach 1.
+    _, fast = fastsim.simulate_instrumented(**sim_params_2)
+    assert fast.supersonic_steps > 0
+    assert fast.drag_evaluations_by_mach[-1] == 0
+    assert fast.drag_evaluations_by_mach[-2] > 0
+
+    _, slow = fastsim.simulate_instrumented(**sim_params_1)
+    assert slow.supersonic_steps == 0
+    assert slow.drag_evaluations_by_mach[2:].sum() == 0
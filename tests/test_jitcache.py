@@ -0,0 +1,279 @@
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from rs2simlib import jitcache
+from rs2simlib.jitcache.jitcache import BUNDLE_VERSION
+from rs2simlib.jitcache.jitcache import JIT_DEPENDENCIES
+from rs2simlib.jitcache.jitcache import JIT_PACKAGES
+from rs2simlib.jitcache.jitcache import PACKAGE_DIR
+from rs2simlib.jitcache.jitcache import _build_bundle
+from rs2simlib.jitcache.jitcache import _cache_subpath
+from rs2simlib.jitcache.jitcache import _install_bundle
+from rs2simlib.jitcache.jitcache import _jit_sources
+from rs2simlib.jitcache.jitcache import _numba_version
+from rs2simlib.jitcache.jitcache import _source_stamp
+
+MODULE_SOURCE = """\
+import numba as nb
+
+
+@nb.njit(cache=True)
+def add_one(x):
+    return x + 1
+"""
+
+
+def make_index(stamp) -> bytes:
+    return (pickle.dumps(_numba_version(), protocol=-1)
+            + pickle.dumps((stamp, {}), protocol=-1))
+
+
+def read_stamp(index: bytes):
+    return pickle.loads(index[len(pickle.dumps(_numba_version(), -1)):])[0]
+
+
+CURVES_SOURCE = "SCALE = {scale}\n"
+
+CURVE_MODULE_SOURCE = """\
+import numba as nb
+import numpy as np
+
+from curvepkg.curves import SCALE
+
+TABLE = np.array([SCALE])
+
+
+@nb.njit(cache=True)
+def scaled(x):
+    return x * TABLE[0]
+"""
+
+
+def make_bundle(path, sources: dict, **manifest):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("manifest.json", json.dumps({
+            "version": BUNDLE_VERSION,
+            "numba": _numba_version(),
+            "python": list(sys.version_info[:2]),
+            "packages": ["fast/sim"],
+            "sources": sources,
+            **manifest,
+        }))
+        zf.writestr(
+            "fast/sim/fastsim.simulate-1.py311.nbi", make_index(b"build"))
+        zf.writestr("fast/sim/fastsim.simulate-1.py311.1.nbc", b"data")
+        zf.writestr(
+            "fast/sim/guf-fastsim.simulate-2.py311.nbi", make_index(b"build"))
+        zf.writestr(
+            "fast/sim/zeroing.solve-1.py311.nbi", make_index(b"stale"))
+        zf.writestr(
+            "fast/sim/guf-zeroing.solve-2.py311.nbi", make_index(b"stale"))
+
+
+def test_install_bundle(tmp_path):
+    sources = _jit_sources(PACKAGE_DIR, ["fast/sim"], JIT_DEPENDENCIES)
+    bundle = tmp_path / "bundle.zip"
+    make_bundle(bundle, sources)
+
+    cache_dir = tmp_path / "cache"
+    assert jitcache.install_bundle(bundle, cache_dir) == 5
+    target = cache_dir / _cache_subpath(PACKAGE_DIR / "fast/sim")
+    assert sorted(p.name for p in target.iterdir()) == [
+        "fastsim.simulate-1.py311.1.nbc", "fastsim.simulate-1.py311.nbi",
+        "guf-fastsim.simulate-2.py311.nbi", "guf-zeroing.solve-2.py311.nbi",
+        "zeroing.solve-1.py311.nbi"]
+    assert (target / "fastsim.simulate-1.py311.1.nbc").read_bytes() == b"data"
+    index = (target / "fastsim.simulate-1.py311.nbi").read_bytes()
+    assert read_stamp(index) == _source_stamp(
+        PACKAGE_DIR / "fast/sim/fastsim.py")
+
+
+@pytest.mark.parametrize("changed", ["fast/sim/zeroing.py", "drag/tables.py"])
+def test_install_bundle_changed_sources(tmp_path, changed):
+    # The compiled functions inline code and data from other modules,
+    # so a change in any source file invalidates the whole bundle.
+    sources = _jit_sources(PACKAGE_DIR, ["fast/sim"], JIT_DEPENDENCIES)
+    sources[changed] = "changed"
+    bundle = tmp_path / "bundle.zip"
+    make_bundle(bundle, sources)
+    cache_dir = tmp_path / "cache"
+    assert jitcache.install_bundle(bundle, cache_dir) == 0
+    assert not cache_dir.exists()
+
+
+def test_install_bundle_unsupported_index(tmp_path, monkeypatch):
+    # Indexes that can not be restamped, e.g. with changed numba
+    # caching internals, are left out instead of failing the install.
+    sources = _jit_sources(PACKAGE_DIR, ["fast/sim"], JIT_DEPENDENCIES)
+    bundle = tmp_path / "bundle.zip"
+    make_bundle(bundle, sources)
+    with zipfile.ZipFile(bundle, "a") as zf:
+        zf.writestr("fast/sim/stream.stream-1.py311.nbi", b"garbage")
+
+    cache_dir = tmp_path / "cache"
+    assert jitcache.install_bundle(bundle, cache_dir) == 5
+    target = cache_dir / _cache_subpath(PACKAGE_DIR / "fast/sim")
+    assert not (target / "stream.stream-1.py311.nbi").exists()
+
+    def unsupported(source):
+        raise ImportError("unsupported numba caching internals")
+
+    monkeypatch.setattr(jitcache.jitcache, "_source_stamp", unsupported)
+    cache_dir = tmp_path / "cache2"
+    assert jitcache.install_bundle(bundle, cache_dir) == 1
+    target = cache_dir / _cache_subpath(PACKAGE_DIR / "fast/sim")
+    assert [p.name for p in target.iterdir()] == [
+        "fastsim.simulate-1.py311.1.nbc"]
+
+
+def test_install_relocated_bundle(tmp_path):
+    build_dir = tmp_path / "build"
+    (build_dir / "bundlepkg").mkdir(parents=True)
+    (build_dir / "bundlepkg" / "funcs.py").write_text(MODULE_SOURCE)
+    import_code = (
+        "import sys\n"
+        "sys.path.insert(0, {path!r})\n"
+        "from bundlepkg.funcs import add_one\n"
+        "add_one(1)\n"
+    )
+    bundle = tmp_path / "bundle.zip"
+    assert _build_bundle(
+        bundle, build_dir, ["bundlepkg"], [],
+        import_code.format(path=str(build_dir))) == 2
+
+    # A fresh checkout elsewhere, with a new source mtime.
+    install_dir = tmp_path / "install"
+    shutil.copytree(build_dir / "bundlepkg", install_dir / "bundlepkg")
+    source = install_dir / "bundlepkg" / "funcs.py"
+    st = source.stat()
+    os.utime(source, (st.st_atime + 3600, st.st_mtime + 3600))
+    cache_dir = tmp_path / "cache"
+    assert _install_bundle(bundle, cache_dir, install_dir, []) == 2
+
+    env = {k: v for k, v in os.environ.items()
+           if not k.startswith("NUMBA_DEBUG")}
+    env["NUMBA_CACHE_DIR"] = str(cache_dir)
+    out = subprocess.run(
+        [sys.executable, "-c",
+         import_code.format(path=str(install_dir))
+         + ("print(sum(add_one.stats.cache_hits.values()),"
+            " sum(add_one.stats.cache_misses.values()))\n")],
+        check=True, capture_output=True, text=True, env=env,
+    ).stdout
+    hits, misses = map(int, out.split()[-2:])
+    assert hits == 1
+    assert misses == 0
+
+
+def test_locator_stamps_dependencies(tmp_path):
+    # A function that freezes a table built from another module into
+    # its compiled code, like the fast functions and the drag curves.
+    (tmp_path / "curvepkg" / "fast").mkdir(parents=True)
+    (tmp_path / "curvepkg" / "__init__.py").write_text("")
+    curves = tmp_path / "curvepkg" / "curves.py"
+    curves.write_text(CURVES_SOURCE.format(scale=2.0))
+    (tmp_path / "curvepkg" / "fast" / "funcs.py").write_text(
+        CURVE_MODULE_SOURCE)
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        f"sys.path.insert(0, {str(tmp_path)!r})\n"
+        "from rs2simlib.jitcache.locator import register_source_set\n"
+        f"register_source_set(Path({str(tmp_path)!r}),"
+        " ['curvepkg/fast'], ['curvepkg/curves.py'])\n"
+        "from curvepkg.fast.funcs import scaled\n"
+        "print(scaled(1.0), sum(scaled.stats.cache_hits.values()))\n"
+    )
+    env = {k: v for k, v in os.environ.items()
+           if not k.startswith("NUMBA_DEBUG")}
+    env["NUMBA_CACHE_DIR"] = str(tmp_path / "cache")
+
+    def run() -> tuple:
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True, capture_output=True, text=True, env=env,
+        ).stdout
+        value, hits = out.split()[-2:]
+        return float(value), int(hits)
+
+    assert run() == (2.0, 0)
+    assert run() == (2.0, 1)
+    curves.write_text(CURVES_SOURCE.format(scale=3.0))
+    assert run() == (3.0, 0)
+
+
+def test_locator_unsupported_numba():
+    # Without the private caching classes, e.g. in a numba version
+    # outside the pin, the locator is not registered.
+    code = (
+        "from numba.core import caching\n"
+        "del caching._SourceFileBackedLocatorMixin\n"
+        "from rs2simlib.jitcache import locator\n"
+        "print(locator.SourceSetLocator in caching.CacheImpl._locator_classes)\n"
+        "try:\n"
+        "    locator.source_stamp(locator.PACKAGE_DIR / 'fast/sim/fastsim.py')\n"
+        "except ImportError:\n"
+        "    print('ImportError')\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    assert out.split() == ["False", "ImportError"]
+
+
+def test_fast_functions_stamp_dependencies():
+    from rs2simlib.fast.sim import fastsim
+
+    stamp = _source_stamp(PACKAGE_DIR / "fast/sim/fastsim.py")
+    assert fastsim.simulate._cache._impl.locator.get_source_stamp() == stamp
+    assert "drag/tables.py" in _jit_sources(
+        PACKAGE_DIR, JIT_PACKAGES, JIT_DEPENDENCIES)
+
+
+def test_install_bundle_version_mismatch(tmp_path):
+    bundle = tmp_path / "bundle.zip"
+    make_bundle(bundle, {}, numba="0.0.1")
+    with pytest.raises(ValueError, match="numba"):
+        jitcache.install_bundle(bundle, tmp_path)
+
+
+def test_cache_subpath_matches_numba():
+    from numba.core.caching import _CacheLocator
+
+    source_dir = PACKAGE_DIR / "fast/sim"
+    assert _cache_subpath(source_dir) == (
+        _CacheLocator.get_suitable_cache_subpath(
+            str(source_dir / "fastsim.py")))
+
+
+def test_set_cache_dir(tmp_path):
+    import rs2simlib.fast  # noqa: F401
+
+    with pytest.raises(RuntimeError):
+        jitcache.set_cache_dir(tmp_path)
+
+    out = subprocess.run(
+        [sys.executable, "-c",
+         ("import sys\n"
+          "from rs2simlib import jitcache\n"
+          f"jitcache.set_cache_dir({str(tmp_path)!r})\n"
+          "import numba\n"
+          "print(numba.config.CACHE_DIR)\n")],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    assert out.split()[-1] == str(tmp_path.resolve())
+
+
+def test_warmup():
+    thread = jitcache.warmup()
+    thread.join()
+    assert not thread.is_alive()
+    assert jitcache.warmup(background=False) is None
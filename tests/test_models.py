@@ -0,0 +1,62 @@
+import numpy as np
+
+from rs2simlib.models import Bullet
+from rs2simlib.models import DragFunction
+from rs2simlib.models import PROJECTILE
+from rs2simlib.models import WEAPON
+from rs2simlib.models import Weapon
+
+
+def make_bullet(name: str, parent: Bullet, **attrs) -> Bullet:
+    return Bullet(**{
+        "name": name,
+        "parent": parent,
+        "speed": -1,
+        "damage": -1,
+        "damage_falloff": np.array([0.0, 0.0]),
+        "drag_func": DragFunction.Invalid,
+        "ballistic_coeff": -1,
+        **attrs,
+    })
+
+
+def test_bullet_inherits_from_closest_parent():
+    # child -> parent -> PROJECTILE, the values set in parent
+    # must win over the ones of the root.
+    falloff = np.array([[0.0, 1.0], [1509322500.0, 0.2]])
+    parent = make_bullet(
+        "ParentBullet", PROJECTILE, speed=850.0, damage=115,
+        damage_falloff=falloff, drag_func=DragFunction.G7,
+        ballistic_coeff=0.24)
+    child = make_bullet("ChildBullet", parent, damage=120)
+    assert child.get_speed() == 850.0
+    assert child.get_damage() == 120
+    assert child.get_damage_falloff() is falloff
+    assert child.get_drag_func() == DragFunction.G7
+    assert child.get_ballistic_coeff() == 0.24
+
+    # Deeper chains resolve to the closest class that sets a value.
+    grandchild = make_bullet("GrandchildBullet", child)
+    assert grandchild.get_speed() == 850.0
+    assert grandchild.get_damage() == 120
+
+    # Values set nowhere in the chain come from the root.
+    orphan = make_bullet("OrphanBullet", PROJECTILE)
+    assert orphan.get_speed() == PROJECTILE.speed
+    assert orphan.get_damage_falloff() is PROJECTILE.damage_falloff
+    assert orphan.get_drag_func() == PROJECTILE.drag_func
+
+
+def test_weapon_inherits_from_closest_parent():
+    bullet = make_bullet("Bullet", PROJECTILE, speed=850.0)
+    parent = Weapon(
+        name="Rifle", parent=WEAPON, bullets=[bullet], instant_damages=[10],
+        pre_fire_length=25, alt_ammo_loadouts=[], num_projectiles=[3])
+    child = Weapon(
+        name="RifleChild", parent=parent, bullets=[], instant_damages=[],
+        pre_fire_length=-1, alt_ammo_loadouts=[])
+    assert child.get_bullets() == [bullet]
+    assert child.get_instant_damages() == [10]
+    assert child.get_pre_fire_length() == 25
+    assert child.get_num_projectiles(0) == 3
+    assert child.get_spread(0) == 0.0
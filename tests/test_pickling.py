@@ -1,7 +1,14 @@
 import pickle
 
+from rs2simlib import sweep
+from rs2simlib.dataio import pdumps_class_map
+from rs2simlib.dataio import ploads_class_map
 from rs2simlib.fast import drag as fastdrag
 from rs2simlib.fast import sim as fastsim
+from rs2simlib.models import BulletParseResult
+from rs2simlib.models import WeaponParseResult
+from rs2simlib.models import freeze_class_map
+from . import data_dir
 
 
 def test_pickle_jitted_functions():
@@ -19,3 +26,47 @@ def test_pickle_jitted_functions():
 
     assert obj_g1(1.0) > 0.0
     assert obj_g7(1.0) > 0.0
+
+
+def test_load_class_map_pickled_before_slots():
+    # Pickled by the regular (dict backed) model dataclasses of the
+    # baseline release, see data/make_class_map_pickle.py.
+    class_map = ploads_class_map((data_dir / "class_map.pickle").read_bytes())
+    bullet = class_map["TypeXXBullet_AP"]
+    weapon = class_map["ROWeap_TypeXX"]
+    assert not hasattr(bullet, "__dict__")
+    assert bullet.parent is class_map["TypeXXBullet"]
+    assert bullet.get_speed() == 735.0
+    assert bullet.get_damage() == 520
+    assert weapon.get_bullets()[1] is bullet
+    assert weapon.get_pre_fire_length() == 25
+    assert weapon.alt_ammo_loadouts[1].bullets == [bullet]
+
+    # Fields added after the baseline release get their defaults.
+    assert weapon.num_projectiles == [] and weapon.spreads == []
+    assert weapon.alt_ammo_loadouts[1].num_projectiles == []
+    assert weapon.get_num_projectiles(0) == 1
+    assert weapon.get_spread(1) == 0.0
+    assert "num_projectiles=[]" in repr(weapon)
+    jobs = list(sweep.expand_jobs(class_map))
+    assert [job.key for job in jobs] == [
+        "ROWeap_TypeXX/0", "ROWeap_TypeXX/1", "ROWeap_TypeXX/alt1/0"]
+    assert not any(job.error for job in jobs)
+
+    freeze_class_map(class_map)
+    loaded = ploads_class_map(pdumps_class_map(class_map))
+    assert loaded["TypeXXBullet_AP"]._frozen is None
+    assert loaded["TypeXXBullet_AP"].get_speed() == 735.0
+
+
+def test_pickle_parse_results():
+    result = WeaponParseResult(
+        class_name="ROWeap_TypeXX", parent_name="ROWeap_BaseRifle",
+        bullet_names={0: "TypeXXBullet"}, pre_fire_length=25)
+    loaded = pickle.loads(pickle.dumps(result))
+    assert loaded == result
+    assert loaded.bullet_names == result.bullet_names
+    assert loaded.pre_fire_length == 25
+
+    bullet_result = pickle.loads(pickle.dumps(BulletParseResult()))
+    assert not bullet_result.damage_falloff.any()
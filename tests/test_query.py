@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from rs2simlib.query import DistanceIndex
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_distance_index_matches_interp(sim_params):
+    res = fastsim.simulate(**sim_params)
+    index = DistanceIndex.from_result(res, step=0.25)
+
+    distance = np.linspace(res[3, 0], res[3, -1], 1001)
+    # The grid resamples the piecewise linear trajectory,
+    # which only differs from it between the grid points.
+    for query, row, sign, atol in (
+            (index.damage, 2, 1, 1e-2),
+            (index.velocity, 5, 1, 1e-2),
+            (index.drop, 1, -1, 1e-3),
+            (index.time, 4, 1, 1e-5),
+    ):
+        expected = sign * np.interp(distance, res[3], res[row])
+        np.testing.assert_allclose(query(distance), expected, atol=atol)
+
+
+def test_distance_index_scalar_and_out_of_range():
+    res = fastsim.simulate(**sim_params_1)
+    index = DistanceIndex.from_result(res)
+
+    damage = index.damage(137.0)
+    assert isinstance(damage, float)
+    assert damage == pytest.approx(
+        np.interp(137.0, res[3], res[2]), rel=1e-4)
+    assert index.damage(0.0) == index.damage(res[3, 0])
+    assert np.isnan(index.damage(res[3, -1] + 10.0))
+    assert index.time(np.array([[10.0, 20.0]])).shape == (1, 2)
+
+
+def test_distance_index_nan_distance():
+    res = fastsim.simulate(**sim_params_1)
+    index = DistanceIndex.from_result(res)
+
+    assert np.isnan(index.damage(np.nan))
+    assert np.isnan(index.velocity(np.float64(np.nan)))
+    with np.errstate(invalid="raise"):
+        drop = index.drop(np.array([np.nan, 100.0, np.nan]))
+    assert np.isnan(drop[[0, 2]]).all()
+    assert drop[1] == index.drop(100.0)
+
+
+def test_distance_index_from_checkpoints(tmp_path):
+    checkpoints = np.arange(0.0, 5000.0, 10.0)
+    res, _ = fastsim.simulate_checkpoints(
+        checkpoints,
+        sim_time=sim_params_1["sim_time"],
+        time_step=sim_params_1["time_step"],
+        drag_func=sim_params_1["drag_func"],
+        ballistic_coeff=sim_params_1["ballistic_coeff"],
+        aim_dir_x=sim_params_1["aim_dir_x"],
+        aim_dir_y=sim_params_1["aim_dir_y"],
+        muzzle_velocity=sim_params_1["muzzle_velocity"],
+        falloff_x=sim_params_1["falloff_x"],
+        falloff_y=sim_params_1["falloff_y"],
+        bullet_damage=sim_params_1["bullet_damage"],
+        by_distance=True,
+    )
+    reached = ~np.isnan(res[3])
+    assert not reached.all()
+    index = DistanceIndex.from_result(res, step=10.0)
+    np.testing.assert_allclose(
+        index.velocity(checkpoints[reached]), res[5, reached])
+
+    path = tmp_path / "index.npz"
+    index.save(path)
+    loaded = DistanceIndex.load(path)
+    np.testing.assert_array_equal(loaded.table, index.table)
+    assert (loaded.start, loaded.step, loaded.end) == (
+        index.start, index.step, index.end)
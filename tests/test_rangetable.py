@@ -0,0 +1,86 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from .test_sim import make_bullet
+from .test_sim import sim_params_1
+
+RANGES = np.arange(0.0, 1000.0, 50.0)
+
+
+def test_range_table_matches_checkpoints(tmp_path):
+    builder = fastsim.RangeTableBuilder(RANGES, cache_dir=tmp_path)
+    table = builder.build(make_bullet(sim_params_1))
+
+    expected, _ = fastsim.simulate_checkpoints(
+        RANGES,
+        sim_time=sim_params_1["sim_time"],
+        time_step=sim_params_1["time_step"],
+        drag_func=sim_params_1["drag_func"],
+        ballistic_coeff=sim_params_1["ballistic_coeff"],
+        aim_dir_x=np.float64(1.0),
+        aim_dir_y=np.float64(0.0),
+        muzzle_velocity=sim_params_1["muzzle_velocity"],
+        falloff_x=sim_params_1["falloff_x"],
+        falloff_y=sim_params_1["falloff_y"],
+        bullet_damage=sim_params_1["bullet_damage"],
+        by_distance=True,
+    )
+    np.testing.assert_array_equal(table.data, expected)
+    np.testing.assert_array_equal(table.drop, -expected[1])
+    np.testing.assert_array_equal(table.time, expected[4])
+    np.testing.assert_array_equal(table.velocity, expected[5])
+    np.testing.assert_array_equal(table.damage, expected[2])
+
+
+def test_range_table_disk_cache(tmp_path, monkeypatch):
+    bullet = make_bullet(sim_params_1)
+    table = fastsim.RangeTableBuilder(RANGES, cache_dir=tmp_path).build(bullet)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    builder = fastsim.RangeTableBuilder(RANGES, cache_dir=tmp_path)
+
+    def fail(*_):
+        raise AssertionError("cached table recomputed")
+
+    monkeypatch.setattr(builder, "_compute", fail)
+    cached = builder.build(bullet)
+    assert cached.key == table.key
+    np.testing.assert_array_equal(cached.data, table.data)
+    assert builder.build(bullet) is cached
+
+
+def test_range_table_cache_invalidation(tmp_path):
+    builder = fastsim.RangeTableBuilder(RANGES, cache_dir=tmp_path)
+    bullet = make_bullet(sim_params_1)
+    table = builder.build(bullet)
+
+    faster = dataclasses.replace(bullet, speed=bullet.speed + 10)
+    assert builder.key(faster) != table.key
+    assert not np.array_equal(builder.build(faster).time, table.time)
+
+    other = fastsim.RangeTableBuilder(
+        RANGES, time_step=1 / 1000, cache_dir=tmp_path)
+    assert other.key(bullet) != table.key
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+
+
+def test_range_table_corrupt_entry(tmp_path):
+    builder = fastsim.RangeTableBuilder(RANGES, cache_dir=tmp_path)
+    bullet = make_bullet(sim_params_1)
+    builder._path(builder.key(bullet)).write_bytes(b"garbage")
+
+    table = builder.build(bullet)
+    assert not np.isnan(table.time[:10]).any()
+    reloaded = fastsim.RangeTableBuilder(RANGES, cache_dir=tmp_path)
+    np.testing.assert_array_equal(reloaded.build(bullet).data, table.data)
+
+    reloaded.clear()
+    assert not list(tmp_path.glob("*.npz"))
+
+
+def test_range_table_invalid_ranges():
+    with pytest.raises(ValueError):
+        fastsim.RangeTableBuilder([100.0, 50.0])
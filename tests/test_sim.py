@@ -3,7 +3,14 @@ import math
 import numpy as np
 import pytest
 
+from rs2simlib.drag import tables as drag_tables
+from rs2simlib.fast import drag as fastdrag
 from rs2simlib.fast import sim as fastsim
+from rs2simlib.models import Bullet
+from rs2simlib.models import BulletSimulation
+from rs2simlib.models import DragFunction
+from rs2simlib.models import Integrator
+from rs2simlib.models import PROJECTILE
 
 # noinspection DuplicatedCode
 sim_params_1 = {
@@ -70,3 +77,454 @@ def test_fast_simulate(sim_params, sim_results, arr_len):
     assert np.size(results) == arr_len * 8
     assert np.size(results, axis=0) == 8
     assert np.size(results, axis=1) == arr_len
+
+
+def test_fast_simulate_batch():
+    params = [sim_params_1, sim_params_2]
+    sim_time = sim_params_1["sim_time"]
+    time_step = sim_params_1["time_step"]
+
+    def per_shot(key, dtype=np.float64):
+        return np.array([p[key] for p in params], dtype=dtype)
+
+    results = fastsim.simulate_batch(
+        sim_time=sim_time,
+        time_step=time_step,
+        drag_func=per_shot("drag_func", np.int64),
+        ballistic_coeff=per_shot("ballistic_coeff"),
+        aim_dir_x=per_shot("aim_dir_x"),
+        aim_dir_y=per_shot("aim_dir_y"),
+        muzzle_velocity=per_shot("muzzle_velocity"),
+        falloff_x=np.vstack([p["falloff_x"] for p in params]),
+        falloff_y=np.vstack([p["falloff_y"] for p in params]),
+        bullet_damage=per_shot("bullet_damage", np.int64),
+        instant_damage=per_shot("instant_damage", np.int64),
+        pre_fire_trace_len=per_shot("pre_fire_trace_len", np.int64),
+        start_loc_x=per_shot("start_loc_x"),
+        start_loc_y=per_shot("start_loc_y"),
+    )
+
+    arr_len = math.ceil(sim_time / time_step) - 1
+    assert results.shape == (len(params), 8, arr_len)
+
+    for i, p in enumerate(params):
+        single = fastsim.simulate(**{
+            **p,
+            "sim_time": sim_time,
+            "time_step": time_step,
+        })
+        assert np.array_equal(results[i], single)
+
+
+def test_fast_simulate_batch_invalid_drag_func():
+    with pytest.raises(ValueError):
+        fastsim.simulate_batch(
+            sim_time=np.float64(0.21),
+            time_step=np.float64(0.1),
+            drag_func=np.array([3], dtype=np.int64),
+            ballistic_coeff=np.array([0.15]),
+            aim_dir_x=np.array([1.0]),
+            aim_dir_y=np.array([0.0]),
+            muzzle_velocity=np.array([15000.0]),
+            falloff_x=np.array([[1.0, 1.0]]),
+            falloff_y=np.array([[0.1, 0.1]]),
+            bullet_damage=np.array([100], dtype=np.int64),
+            instant_damage=np.array([101], dtype=np.int64),
+            pre_fire_trace_len=np.array([1], dtype=np.int64),
+            start_loc_x=np.array([0.0]),
+            start_loc_y=np.array([0.0]),
+        )
+
+
+def test_num_threads():
+    n = fastsim.get_num_threads()
+    assert 1 <= n <= fastsim.max_num_threads()
+    fastsim.set_num_threads(1)
+    assert fastsim.get_num_threads() == 1
+    fastsim.set_num_threads(n)
+
+
+def test_fast_simulate_until_no_stop_conditions():
+    results, reason = fastsim.simulate_until(**sim_params_1)
+    assert reason == fastsim.StopReason.SIM_TIME
+    assert np.array_equal(results, fastsim.simulate(**sim_params_1))
+
+
+@pytest.mark.parametrize(
+    "stop_kwargs,expected_reason,row,check", [
+        ({"min_y": np.float64(-1.0)},
+         fastsim.StopReason.MIN_Y, 1,
+         lambda x: x < -1.0),
+        ({"max_distance": np.float64(300.0)},
+         fastsim.StopReason.MAX_DISTANCE, 3,
+         lambda x: x > 300.0),
+        ({"min_speed": np.float64(250.0)},
+         fastsim.StopReason.MIN_SPEED, 5,
+         lambda x: x < 250.0),
+        ({"min_damage": np.float64(60.0)},
+         fastsim.StopReason.MIN_DAMAGE, 2,
+         lambda x: x < 60.0),
+    ])
+def test_fast_simulate_until(stop_kwargs, expected_reason, row, check):
+    full = fastsim.simulate(**sim_params_1)
+    results, reason = fastsim.simulate_until(**sim_params_1, **stop_kwargs)
+    n = results.shape[1]
+
+    assert reason == expected_reason
+    assert 0 < n < full.shape[1]
+    assert np.array_equal(results, full[:, :n])
+    # Only the last sample satisfies the stop condition.
+    assert check(results[row, -1])
+    assert not check(results[row, :-1]).any()
+
+
+@pytest.mark.parametrize(
+    "channels,expected_rows", [
+        (fastsim.Channel.X | fastsim.Channel.Y | fastsim.Channel.DISTANCE,
+         [0, 1, 3]),
+        (fastsim.Channel.DAMAGE | fastsim.Channel.POWER_LEFT,
+         [2, 7]),
+        (fastsim.Channel.TIME, [4]),
+        (fastsim.Channel.ALL, list(range(8))),
+    ])
+def test_fast_simulate_until_channels(channels, expected_rows):
+    full = fastsim.simulate(**sim_params_2)
+    results, _ = fastsim.simulate_until(
+        **sim_params_2,
+        channels=np.int64(channels),
+    )
+    assert results.shape == (len(expected_rows), full.shape[1])
+    assert np.array_equal(results, full[expected_rows])
+
+
+def test_channel_rows():
+    rows = fastsim.channel_rows(fastsim.Channel.Y | fastsim.Channel.TIME)
+    assert list(rows) == [-1, 0, -1, -1, 1, -1, -1, -1]
+    with pytest.raises(ValueError):
+        fastsim.channel_rows(0)
+
+
+def test_fast_simulate_into_sweep_matrix():
+    full = fastsim.simulate(**sim_params_1)
+    channels = fastsim.Channel.Y | fastsim.Channel.DAMAGE
+    sweep = np.zeros((6, full.shape[1] + 10))
+
+    # Write into every other row of a larger matrix.
+    n, reason = fastsim.simulate_into(
+        out=sweep[2:6:2],
+        **sim_params_1,
+        channels=np.int64(channels),
+    )
+    m = full.shape[1]
+    # simulate() always drops the sample at the end of sim_time,
+    # simulate_into() keeps it if there is room.
+    assert n >= m
+    assert reason == fastsim.StopReason.SIM_TIME
+    assert np.array_equal(sweep[2, :m], full[1])
+    assert np.array_equal(sweep[4, :m], full[2])
+    assert not sweep[[0, 1, 3, 5]].any()
+    assert not sweep[:, n:].any()
+
+    with pytest.raises(ValueError):
+        fastsim.simulate_into(out=sweep, **sim_params_1)
+
+
+def test_fast_simulate_into_memmap(tmp_path):
+    full = fastsim.simulate(**sim_params_2)
+    mm = np.memmap(
+        tmp_path / "sim.dat", dtype=np.float64, mode="w+", shape=full.shape)
+    n, _ = fastsim.simulate_into(out=mm, **sim_params_2)
+    mm.flush()
+    assert n == full.shape[1]
+    assert np.array_equal(np.fromfile(tmp_path / "sim.dat").reshape(
+        full.shape), full)
+
+
+def test_sim_result_views():
+    results, reason = fastsim.simulate_until(
+        **sim_params_1,
+        min_y=np.float64(-1.0),
+    )
+    res = fastsim.SimResult(results, stop_reason=reason)
+    assert res.stop_reason == fastsim.StopReason.MIN_Y
+    assert len(res) == results.shape[1]
+    assert np.shares_memory(res.x, results)
+    assert np.array_equal(res.y, results[1])
+    assert np.array_equal(res.damage, results[2])
+    assert np.array_equal(res.power_left, results[7])
+
+    out = np.empty((2, 100))
+    n, reason = fastsim.simulate_into(
+        out, **sim_params_1,
+        channels=np.int64(fastsim.Channel.X | fastsim.Channel.DISTANCE),
+    )
+    res = fastsim.SimResult(
+        out,
+        channels=fastsim.Channel.X | fastsim.Channel.DISTANCE,
+        n=n,
+        stop_reason=reason,
+    )
+    assert len(res.distance) == n
+    assert fastsim.Channel.DISTANCE in res
+    assert fastsim.Channel.DAMAGE not in res
+    with pytest.raises(KeyError):
+        _ = res.damage
+    # Masks of several channels are not a single row.
+    with pytest.raises(KeyError):
+        _ = res[fastsim.Channel.X | fastsim.Channel.DISTANCE]
+    with pytest.raises(KeyError):
+        _ = res[0]
+    with pytest.raises(ValueError):
+        fastsim.SimResult(out, channels=fastsim.Channel.ALL)
+
+
+def test_fast_simulate_batch_into():
+    out = np.empty((2, 8, 50))
+    params = [sim_params_1, sim_params_2]
+
+    def per_shot(key, dtype=np.float64):
+        return np.array([p[key] for p in params], dtype=dtype)
+
+    filled = fastsim.simulate_batch_into(
+        out,
+        np.float64(1.0),
+        np.float64(1 / 500),
+        per_shot("drag_func", np.int64),
+        per_shot("ballistic_coeff"),
+        per_shot("aim_dir_x"),
+        per_shot("aim_dir_y"),
+        per_shot("muzzle_velocity"),
+        np.vstack([p["falloff_x"] for p in params]),
+        np.vstack([p["falloff_y"] for p in params]),
+        per_shot("bullet_damage", np.int64),
+        per_shot("instant_damage", np.int64),
+        per_shot("pre_fire_trace_len", np.int64),
+        per_shot("start_loc_x"),
+        per_shot("start_loc_y"),
+    )
+    assert list(filled) == [50, 50]
+    single = fastsim.simulate(**{
+        **sim_params_2,
+        "sim_time": np.float64(1.0),
+        "time_step": np.float64(1 / 500),
+    })
+    assert np.array_equal(out[1], single[:, :50])
+
+
+def make_bullet(sim_params) -> Bullet:
+    return Bullet(
+        name="TestBullet",
+        parent=PROJECTILE,
+        speed=sim_params["muzzle_velocity"] / 50,
+        damage=int(sim_params["bullet_damage"]),
+        damage_falloff=np.column_stack(
+            [sim_params["falloff_x"], sim_params["falloff_y"]]),
+        drag_func={
+            1: DragFunction.G1,
+            2: DragFunction.G2,
+            5: DragFunction.G5,
+            6: DragFunction.G6,
+            7: DragFunction.G7,
+            8: DragFunction.G8,
+        }[int(sim_params["drag_func"])],
+        ballistic_coeff=sim_params["ballistic_coeff"],
+    )
+
+
+@pytest.mark.parametrize("integrator", list(Integrator))
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_fast_simulate_matches_bullet_simulation(sim_params, integrator):
+    results = fastsim.simulate(**sim_params, integrator=np.int64(integrator))
+    sim = BulletSimulation(
+        bullet=make_bullet(sim_params),
+        velocity=np.array(
+            [sim_params["aim_dir_x"], sim_params["aim_dir_y"]]),
+        location=np.array(
+            [sim_params["start_loc_x"], sim_params["start_loc_y"]]),
+        integrator=integrator,
+    )
+
+    expected = np.empty((6, results.shape[1]))
+    for i in range(results.shape[1]):
+        sim.simulate(sim_params["time_step"])
+        expected[0, i] = sim.location[0] / 50
+        expected[1, i] = sim.location[1] / 50
+        expected[2, i] = sim.calc_damage()
+        expected[3, i] = sim.distance_traveled_uu / 50
+        expected[4, i] = sim.flight_time
+        expected[5, i] = np.linalg.norm(sim.velocity) / 50
+
+    np.testing.assert_allclose(results[:6], expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_fast_simulate_float32(sim_params):
+    ref, _ = fastsim.simulate_until(**sim_params)
+    res, _ = fastsim.simulate_until(**sim_params, dtype=np.float32)
+    assert res.dtype == np.float32
+    assert res.shape == ref.shape
+    np.testing.assert_allclose(res[1], ref[1], rtol=1e-5, atol=1e-3)
+    np.testing.assert_allclose(res[2], ref[2], rtol=1e-5, atol=1e-3)
+    np.testing.assert_allclose(res[3], ref[3], rtol=1e-5)
+
+    out = np.empty(ref.shape, dtype=np.float32)
+    fastsim.simulate_into(out, **sim_params)
+    assert np.array_equal(out, res)
+
+
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_fast_simulate_integrators_accuracy(sim_params):
+    times = np.linspace(0.1, 1.9, 19)
+    ref, _ = fastsim.simulate_adaptive(
+        times,
+        sim_time=np.float64(2.0),
+        drag_func=sim_params["drag_func"],
+        ballistic_coeff=sim_params["ballistic_coeff"],
+        aim_dir_x=sim_params["aim_dir_x"],
+        aim_dir_y=sim_params["aim_dir_y"],
+        muzzle_velocity=sim_params["muzzle_velocity"],
+        falloff_x=sim_params["falloff_x"],
+        falloff_y=sim_params["falloff_y"],
+        bullet_damage=sim_params["bullet_damage"],
+        start_loc_x=sim_params["start_loc_x"],
+        start_loc_y=sim_params["start_loc_y"],
+        rtol=np.float64(1e-12),
+        atol=np.float64(1e-10),
+    )
+
+    def max_err(integrator: Integrator) -> float:
+        res = fastsim.simulate(**sim_params, integrator=np.int64(integrator))
+        return max(
+            np.max(np.abs(np.interp(times, res[4], res[row]) - ref[row]))
+            for row in (0, 1)
+        )
+
+    euler_err = max_err(Integrator.EULER)
+    assert max_err(Integrator.RK4) < euler_err / 20
+    assert max_err(Integrator.VERLET) < euler_err / 5
+
+
+def test_fast_simulate_invalid_integrator():
+    with pytest.raises(ValueError):
+        fastsim.simulate(**sim_params_1, integrator=np.int64(3))
+
+
+@pytest.mark.parametrize("integrator", list(Integrator))
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_fast_simulate_checkpoints_by_distance(sim_params, integrator):
+    full = fastsim.simulate(**sim_params, integrator=np.int64(integrator))
+    distances = np.arange(0.0, 2.0 * full[3, -1], 1.0)
+    res, steps = fastsim.simulate_checkpoints(
+        distances,
+        sim_time=sim_params["sim_time"],
+        time_step=sim_params["time_step"],
+        drag_func=sim_params["drag_func"],
+        ballistic_coeff=sim_params["ballistic_coeff"],
+        aim_dir_x=sim_params["aim_dir_x"],
+        aim_dir_y=sim_params["aim_dir_y"],
+        muzzle_velocity=sim_params["muzzle_velocity"],
+        falloff_x=sim_params["falloff_x"],
+        falloff_y=sim_params["falloff_y"],
+        bullet_damage=sim_params["bullet_damage"],
+        start_loc_x=sim_params["start_loc_x"],
+        start_loc_y=sim_params["start_loc_y"],
+        by_distance=True,
+        integrator=np.int64(integrator),
+    )
+    assert res.shape == (8, distances.size)
+    assert steps >= full.shape[1]
+
+    reached = ~np.isnan(res[3])
+    assert reached[0]
+    assert not reached[-1]
+    np.testing.assert_allclose(res[3, reached], distances[reached], atol=1e-9)
+    # Same as resampling the full output, past the first step.
+    inside = reached & (distances >= full[3, 0]) & (distances <= full[3, -1])
+    for row in range(8):
+        expected = np.interp(distances[inside], full[3], full[row])
+        np.testing.assert_allclose(res[row, inside], expected, rtol=1e-9)
+
+
+def test_fast_simulate_checkpoints_by_time():
+    full = fastsim.simulate(**sim_params_1)
+    times = np.array([-1.0, 0.0, 0.01, 0.5, 1.2345, 4.5, 100.0])
+    res, _ = fastsim.simulate_checkpoints(
+        times,
+        sim_time=sim_params_1["sim_time"],
+        time_step=sim_params_1["time_step"],
+        drag_func=sim_params_1["drag_func"],
+        ballistic_coeff=sim_params_1["ballistic_coeff"],
+        aim_dir_x=sim_params_1["aim_dir_x"],
+        aim_dir_y=sim_params_1["aim_dir_y"],
+        muzzle_velocity=sim_params_1["muzzle_velocity"],
+        falloff_x=sim_params_1["falloff_x"],
+        falloff_y=sim_params_1["falloff_y"],
+        bullet_damage=sim_params_1["bullet_damage"],
+    )
+    # Checkpoints before the start are the initial state.
+    np.testing.assert_array_equal(res[:, 0], res[:, 1])
+    assert res[7, 0] == 1.0
+    np.testing.assert_allclose(res[4, :-1], [0.0, 0.0, 0.01, 0.5, 1.2345, 4.5])
+    assert np.isnan(res[:, -1]).all()
+    np.testing.assert_allclose(
+        res[0, 3:6], np.interp(times[3:6], full[4], full[0]), rtol=1e-9)
+
+    with pytest.raises(ValueError):
+        fastsim.simulate_checkpoints(
+            times[::-1],
+            sim_time=sim_params_1["sim_time"],
+            time_step=sim_params_1["time_step"],
+            drag_func=sim_params_1["drag_func"],
+            ballistic_coeff=sim_params_1["ballistic_coeff"],
+            aim_dir_x=sim_params_1["aim_dir_x"],
+            aim_dir_y=sim_params_1["aim_dir_y"],
+            muzzle_velocity=sim_params_1["muzzle_velocity"],
+            falloff_x=sim_params_1["falloff_x"],
+            falloff_y=sim_params_1["falloff_y"],
+            bullet_damage=sim_params_1["bullet_damage"],
+        )
+
+
+@pytest.mark.parametrize("drag_func", [2, 5, 6, 8])
+def test_fast_simulate_drag_curves(drag_func):
+    sim_params = {**sim_params_1, "drag_func": np.int64(drag_func)}
+    test_fast_simulate_matches_bullet_simulation(sim_params, Integrator.EULER)
+
+
+def test_fast_simulate_custom_drag_curve():
+    mach, cd = np.array(drag_tables.G7).T
+    fastdrag.register_drag_curve(107, mach, cd)
+    try:
+        tables = fastdrag.drag_tables()
+        expected = fastsim.simulate(**sim_params_1)
+        res = fastsim.simulate(
+            **{**sim_params_1, "drag_func": np.int64(107)},
+            drag_tables=tables,
+        )
+        np.testing.assert_array_equal(res, expected)
+
+        batch = fastsim.simulate_batch(
+            sim_time=sim_params_1["sim_time"],
+            time_step=sim_params_1["time_step"],
+            drag_func=np.array([7, 107], dtype=np.int64),
+            ballistic_coeff=np.full(2, sim_params_1["ballistic_coeff"]),
+            aim_dir_x=np.full(2, sim_params_1["aim_dir_x"]),
+            aim_dir_y=np.full(2, sim_params_1["aim_dir_y"]),
+            muzzle_velocity=np.full(2, sim_params_1["muzzle_velocity"]),
+            falloff_x=np.tile(sim_params_1["falloff_x"], (2, 1)),
+            falloff_y=np.tile(sim_params_1["falloff_y"], (2, 1)),
+            bullet_damage=np.full(2, sim_params_1["bullet_damage"]),
+            instant_damage=np.full(2, sim_params_1["instant_damage"]),
+            pre_fire_trace_len=np.full(2, sim_params_1["pre_fire_trace_len"]),
+            start_loc_x=np.zeros(2),
+            start_loc_y=np.zeros(2),
+            drag_tables=tables,
+        )
+        np.testing.assert_array_equal(batch[0], expected)
+        np.testing.assert_array_equal(batch[1], expected)
+
+        # Not in the default tables.
+        with pytest.raises(ValueError):
+            fastsim.simulate(**{**sim_params_1, "drag_func": np.int64(107)})
+    finally:
+        fastdrag.unregister_drag_curve(107)
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+
+def test_sim_cache_hit(tmp_path):
+    cache = fastsim.SimCache(tmp_path)
+    expected = fastsim.simulate(**sim_params_1)
+
+    first = cache.simulate(**sim_params_1)
+    second = cache.simulate(**sim_params_1)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, expected)
+    np.testing.assert_array_equal(second, expected)
+
+    # A new instance (e.g. another process) uses the same entry.
+    other = fastsim.SimCache(tmp_path, mmap=False)
+    np.testing.assert_array_equal(other.simulate(**sim_params_1), expected)
+    assert other.hits == 1
+
+
+def test_sim_cache_key(tmp_path):
+    cache = fastsim.SimCache(tmp_path)
+    key = cache.key(fastsim.simulate, **sim_params_1)
+
+    # Defaults are part of the key.
+    params = {k: v for k, v in sim_params_1.items()
+              if k not in ("start_loc_x", "start_loc_y")}
+    assert key == cache.key(fastsim.simulate, **params)
+    assert key != cache.key(
+        fastsim.simulate, **{**sim_params_1, "start_loc_x": np.float64(1.0)})
+
+    falloff_y = sim_params_1["falloff_y"].copy()
+    falloff_y[-1] += 0.01
+    assert key != cache.key(
+        fastsim.simulate, **{**sim_params_1, "falloff_y": falloff_y})
+    assert key != cache.key(fastsim.simulate_until, **sim_params_1)
+
+
+def test_sim_cache_eviction(tmp_path):
+    cache = fastsim.SimCache(tmp_path)
+    cache.simulate(**sim_params_1)
+    size = cache.size()
+    old, = tmp_path.glob("*.npy")
+    os.utime(old, (0, 0))
+
+    cache.max_bytes = size + size // 2
+    cache.simulate(**{**sim_params_1, "instant_damage": np.int64(1)})
+    assert not old.exists()
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_sim_cache_corrupt_entry(tmp_path):
+    cache = fastsim.SimCache(tmp_path)
+    key = cache.key(fastsim.simulate, **sim_params_2)
+    tmp_path.joinpath(f"{key}.npy").write_bytes(b"garbage")
+    np.testing.assert_array_equal(
+        cache.simulate(**sim_params_2), fastsim.simulate(**sim_params_2))
+    assert cache.misses == 1
+
+
+def test_sim_cache_not_an_array(tmp_path):
+    cache = fastsim.SimCache(tmp_path)
+    with pytest.raises(TypeError):
+        cache.call(fastsim.simulate_until, **sim_params_1)
+    assert not list(tmp_path.glob("*"))
+
+
+def test_sim_cache_concurrent(tmp_path):
+    expected = fastsim.simulate(**sim_params_1)
+
+    def run(_):
+        return fastsim.SimCache(tmp_path).simulate(**sim_params_1)
+
+    with ThreadPoolExecutor(8) as ex:
+        for result in ex.map(run, range(32)):
+            np.testing.assert_array_equal(result, expected)
+    assert len(list(tmp_path.glob("*"))) == 1
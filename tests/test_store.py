@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from rs2simlib import sweep
+from rs2simlib.fast import sim as fastsim
+from rs2simlib.fast.sim import Channel
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+
+def test_store_roundtrip(tmp_path):
+    data_1 = fastsim.simulate(**sim_params_1)
+    data_2 = fastsim.simulate(**sim_params_2)
+
+    with sweep.TrajectoryStoreWriter(tmp_path) as writer:
+        writer.append("Rifle/0", data_1, weapon="Rifle", slot=0)
+        writer.append("Rifle/alt1/0", data_2, weapon="Rifle", loadout=1)
+        writer.append("Pistol/0", data_2[:, :10], weapon="Pistol")
+
+    store = sweep.TrajectoryStore(tmp_path)
+    assert len(store) == 3
+    assert "Rifle/0" in store
+    np.testing.assert_array_equal(store.get("Rifle/0"), data_1)
+    np.testing.assert_array_equal(store.get("Rifle/alt1/0"), data_2)
+    damage = store.channel("Pistol/0", Channel.DAMAGE)
+    assert isinstance(damage, np.memmap)
+    np.testing.assert_array_equal(damage, data_2[2, :10])
+    np.testing.assert_array_equal(
+        store.channel("Pistol/0", "velocity"), data_2[5, :10])
+    assert sorted(e.key for e in store.weapon_entries("Rifle")) == [
+        "Rifle/0", "Rifle/alt1/0"]
+
+
+def test_store_append_and_refresh(tmp_path):
+    data = fastsim.simulate(**sim_params_1)
+    rows = data[[2, 5]]
+    channels = Channel.DAMAGE | Channel.VELOCITY
+    with sweep.TrajectoryStoreWriter(
+            tmp_path, channels=channels, dtype=np.float32) as writer:
+        writer.append("A/0", rows)
+        store = sweep.TrajectoryStore(tmp_path)
+        assert store.channels == ["damage", "velocity"]
+        assert store.keys() == ["A/0"]
+
+        writer.append("B/0", rows[:, ::-1])
+        # Unknown keys refresh the index.
+        np.testing.assert_array_equal(
+            store.get("B/0"), rows[:, ::-1].astype(np.float32))
+
+        with pytest.raises(ValueError):
+            writer.append("C/0", data)
+        with pytest.raises(KeyError):
+            store.channel("A/0", Channel.X)
+
+
+def test_store_reopen_settings(tmp_path):
+    rows = fastsim.simulate(**sim_params_1)[[2, 5]]
+    channels = Channel.DAMAGE | Channel.VELOCITY
+    with sweep.TrajectoryStoreWriter(
+            tmp_path, channels=channels, dtype=np.float32) as writer:
+        writer.append("A/0", rows)
+
+    # The stored settings are used if none are given.
+    with sweep.TrajectoryStoreWriter(tmp_path) as writer:
+        assert writer.channels == ["damage", "velocity"]
+        assert writer.dtype == np.float32
+    with sweep.TrajectoryStoreWriter(
+            tmp_path, channels=channels, dtype="f4") as writer:
+        writer.append("B/0", rows)
+
+    with pytest.raises(ValueError, match="channels"):
+        sweep.TrajectoryStoreWriter(tmp_path, channels=Channel.ALL)
+    with pytest.raises(ValueError, match="dtype"):
+        sweep.TrajectoryStoreWriter(tmp_path, dtype=np.float64)
+    assert sweep.TrajectoryStore(tmp_path).keys() == ["A/0", "B/0"]
+
+
+def test_store_interrupted_write(tmp_path):
+    data = fastsim.simulate(**sim_params_1)
+    with sweep.TrajectoryStoreWriter(tmp_path) as writer:
+        writer.append("A/0", data)
+    # Simulate a crash after writing some data of the next
+    # entry and a part of its index line.
+    with (tmp_path / "x.bin").open("ab") as f:
+        f.write(b"\0" * 64)
+    with (tmp_path / "index.jsonl").open("a") as f:
+        f.write('{"key": "B/0", "wea')
+    assert sweep.TrajectoryStore(tmp_path).keys() == ["A/0"]
+
+    with sweep.TrajectoryStoreWriter(tmp_path) as writer:
+        writer.append("C/0", data)
+    store = sweep.TrajectoryStore(tmp_path)
+    assert store.keys() == ["A/0", "C/0"]
+    np.testing.assert_array_equal(store.get("C/0"), data)
+
+
+def test_store_sweep_writer(tmp_path):
+    job = sweep.SweepJob(weapon="Rifle", loadout=-1, slot=2, bullet="B")
+    data = fastsim.simulate(**sim_params_1)
+    with sweep.TrajectoryStoreWriter(tmp_path) as writer:
+        writer(sweep.SweepResult(job=job, data=data, stop_reason=1))
+        writer(sweep.SweepResult(job=job, error="failed"))
+    store = sweep.TrajectoryStore(tmp_path)
+    entry = store.entries["Rifle/2"]
+    assert (entry.weapon, entry.slot, entry.bullet, entry.stop_reason) == (
+        "Rifle", 2, "B", 1)
+    np.testing.assert_array_equal(store.get("Rifle/2"), data)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from rs2simlib.fast.sim import Channel
+from rs2simlib.fast.sim import StopReason
+from rs2simlib.models import Integrator
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+STREAM_PARAMS = [
+    "sim_time", "time_step", "drag_func", "ballistic_coeff", "aim_dir_x",
+    "aim_dir_y", "muzzle_velocity", "falloff_x", "falloff_y",
+    "bullet_damage", "start_loc_x", "start_loc_y",
+]
+
+
+def stream_params(sim_params: dict) -> dict:
+    return {k: sim_params[k] for k in STREAM_PARAMS}
+
+
+def collect(**kwargs):
+    chunks = []
+    gen = fastsim.simulate_stream(**kwargs)
+    try:
+        while True:
+            chunks.append(next(gen))
+    except StopIteration as e:
+        reason = e.value
+    return chunks, reason
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000, 10_000])
+@pytest.mark.parametrize("integrator", list(Integrator))
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_stream_matches_simulate(sim_params, integrator, chunk_size):
+    expected = fastsim.simulate(**sim_params, integrator=np.int64(integrator))
+    chunks, reason = collect(
+        **stream_params(sim_params), integrator=integrator,
+        chunk_size=chunk_size)
+    assert reason == StopReason.SIM_TIME
+    assert all(c.shape[1] <= chunk_size for c in chunks)
+    np.testing.assert_array_equal(np.concatenate(chunks, axis=1), expected)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_stream_stop_condition(dtype):
+    kwargs = dict(
+        **stream_params(sim_params_2),
+        min_y=np.float64(-1.0),
+        channels=np.int64(Channel.Y | Channel.DAMAGE),
+        dtype=dtype,
+    )
+    expected, expected_reason = fastsim.simulate_until(
+        **{**sim_params_2, **kwargs})
+    chunks, reason = collect(**kwargs, chunk_size=64)
+    assert reason == expected_reason == StopReason.MIN_Y
+    result = np.concatenate(chunks, axis=1)
+    assert result.dtype == dtype
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_stream_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        next(fastsim.simulate_stream(
+            **stream_params(sim_params_1), chunk_size=0))
@@ -0,0 +1,147 @@
+import os
+
+import numpy as np
+
+from rs2simlib import sweep
+from rs2simlib.fast import sim as fastsim
+from rs2simlib.models import AltAmmoLoadout
+from rs2simlib.models import DragFunction
+from rs2simlib.models import WEAPON
+from rs2simlib.models import Weapon
+from .test_sim import make_bullet
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+
+def make_class_map() -> dict:
+    bullet_1 = make_bullet(sim_params_1)
+    bullet_1.name = "Bullet1"
+    bullet_2 = make_bullet(sim_params_2)
+    bullet_2.name = "Bullet2"
+    broken = make_bullet(sim_params_1)
+    broken.name = "Broken"
+    broken.drag_func = DragFunction.Invalid
+    broken.parent = broken
+
+    rifle = Weapon(
+        name="Rifle",
+        parent=WEAPON,
+        bullets=[bullet_1, None, bullet_2],
+        instant_damages=[100, 0, 50],
+        pre_fire_length=25,
+        alt_ammo_loadouts=[
+            None,
+            AltAmmoLoadout(
+                name="Rifle_AltAmmoLoadouts",
+                parent=None,
+                bullets=[bullet_2],
+                instant_damages=[70],
+            ),
+        ],
+    )
+    broken_weapon = Weapon(
+        name="BrokenWeapon",
+        parent=WEAPON,
+        bullets=[broken],
+        instant_damages=[10],
+        pre_fire_length=25,
+        alt_ammo_loadouts=[],
+    )
+    return {
+        obj.name: obj
+        for obj in (bullet_1, bullet_2, broken, rifle, broken_weapon)
+    }
+
+
+def test_expand_jobs():
+    jobs = {job.key: job for job in sweep.expand_jobs(make_class_map())}
+    assert sorted(jobs) == [
+        "BrokenWeapon/0", "Rifle/0", "Rifle/2", "Rifle/alt1/0"]
+    assert jobs["BrokenWeapon/0"].error
+    assert jobs["Rifle/2"].bullet == "Bullet2"
+    assert jobs["Rifle/2"].instant_damage == 50
+    assert jobs["Rifle/alt1/0"].instant_damage == 70
+    assert jobs["Rifle/0"].pre_fire_trace_len == 25 * 50
+
+
+def test_expand_jobs_leaves_class_map():
+    class_map = make_class_map()
+    jobs = {job.key: job for job in sweep.expand_jobs(class_map)}
+    assert jobs["Rifle/0"].pre_fire_trace_len == 25 * 50
+    assert all(obj._frozen is None and obj._dependents is None
+               for obj in class_map.values())
+
+    class_map["Rifle"].pre_fire_length = 30
+    jobs = {job.key: job for job in sweep.expand_jobs(class_map)}
+    assert jobs["Rifle/0"].pre_fire_trace_len == 30 * 50
+
+
+def test_run_sweep(tmp_path):
+    results = {}
+    settings = sweep.SweepSettings(
+        sim_time=sim_params_1["sim_time"],
+        time_step=sim_params_1["time_step"],
+    )
+    summary = sweep.run_sweep(
+        make_class_map(),
+        writer=lambda r: results.setdefault(r.job.key, r),
+        settings=settings,
+        processes=2,
+        chunk_size=1,
+        max_pending=1,
+    )
+
+    assert summary.num_jobs == 4
+    assert [r.job.key for r in summary.failures] == ["BrokenWeapon/0"]
+    assert sorted(results) == [
+        "BrokenWeapon/0", "Rifle/0", "Rifle/2", "Rifle/alt1/0"]
+    expected = fastsim.simulate(**{
+        **sim_params_1, "aim_dir_x": 1.0, "aim_dir_y": 0.0})
+    np.testing.assert_array_equal(results["Rifle/0"].data, expected)
+
+    writer = sweep.NpyDirectoryWriter(tmp_path)
+    for result in results.values():
+        writer(result)
+    np.testing.assert_array_equal(
+        np.load(tmp_path / "Rifle__0.npy"), expected)
+    assert "BrokenWeapon/0" in (tmp_path / "failures.txt").read_text()
+
+
+def _crashing_chunk(jobs, settings):
+    # Runs in the spawned workers, which import this module.
+    if any(job.key == "Rifle/2" for job in jobs):
+        os._exit(1)
+    return sweep.sweep._run_chunk(jobs, settings)
+
+
+def test_run_sweep_broken_pool(monkeypatch):
+    monkeypatch.setattr(sweep.sweep, "_run_chunk", _crashing_chunk)
+    results = {}
+    settings = sweep.SweepSettings(
+        sim_time=sim_params_1["sim_time"],
+        time_step=sim_params_1["time_step"],
+    )
+    summary = sweep.run_sweep(
+        make_class_map(),
+        writer=lambda r: results.setdefault(r.job.key, r),
+        settings=settings,
+        processes=2,
+        chunk_size=1,
+        max_pending=3,
+        prewarm=False,
+    )
+
+    assert summary.num_jobs == 4
+    assert sorted(r.job.key for r in summary.failures) == [
+        "BrokenWeapon/0", "Rifle/2"]
+    assert "BrokenProcessPool" in results["Rifle/2"].error
+    assert results["Rifle/0"].ok
+    assert results["Rifle/alt1/0"].ok
+
+
+def test_run_job_failure():
+    job = next(sweep.expand_jobs(make_class_map()))
+    job.drag_func = 3
+    result = sweep.sweep._run_job(job, sweep.SweepSettings())
+    assert not result.ok
+    assert "invalid drag function" in result.error
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from rs2simlib.fast import sim as fastsim
+from rs2simlib.models import Integrator
+from .test_sim import make_bullet
+from .test_sim import sim_params_1
+from .test_sim import sim_params_2
+
+
+def zeroing_params(sim_params) -> dict:
+    return {
+        "sim_time": sim_params["sim_time"],
+        "time_step": sim_params["time_step"],
+        "drag_func": sim_params["drag_func"],
+        "ballistic_coeff": sim_params["ballistic_coeff"],
+        "muzzle_velocity": sim_params["muzzle_velocity"],
+        "start_loc_x": sim_params["start_loc_x"],
+        "start_loc_y": sim_params["start_loc_y"],
+    }
+
+
+def height_at(sim_params, angle, integrator, target_x):
+    res = fastsim.simulate(**{
+        **sim_params,
+        "aim_dir_x": np.float64(np.cos(angle)),
+        "aim_dir_y": np.float64(np.sin(angle)),
+        "integrator": np.int64(integrator),
+    })
+    x = np.concatenate([[sim_params["start_loc_x"] / 50], res[0]])
+    y = np.concatenate([[sim_params["start_loc_y"] / 50], res[1]])
+    return np.interp(target_x, x, y)
+
+
+@pytest.mark.parametrize("integrator", list(Integrator))
+@pytest.mark.parametrize("sim_params", [sim_params_1, sim_params_2])
+def test_solve_aim_angles_hits_targets(sim_params, integrator):
+    target_x = np.array([25.0, 100.0, 300.0, 500.0, 800.0])
+    target_y = np.array([0.0, 2.0, -5.0, 0.0, 20.0])
+    angles = fastsim.solve_aim_angles(
+        target_x, target_y, **zeroing_params(sim_params),
+        integrator=np.int64(integrator))
+
+    assert not np.isnan(angles).any()
+    for x, y, angle in zip(target_x, target_y, angles):
+        assert height_at(sim_params, angle, integrator, x) == pytest.approx(
+            y, abs=1e-4)
+
+
+def test_solve_aim_angles_out_of_range():
+    angles = fastsim.solve_aim_angles(
+        np.array([100.0, 50_000.0, 100.0, -10.0]),
+        np.array([0.0, 0.0, 5_000.0, 0.0]),
+        **zeroing_params(sim_params_1))
+    assert not np.isnan(angles[0])
+    assert np.isnan(angles[1:]).all()
+
+
+def test_solve_aim_angles_near_max_range():
+    # Almost no drag, so the maximum range is close to MAX_ANGLE.
+    sim_params = {
+        **sim_params_1,
+        "ballistic_coeff": np.float64(1000.0),
+        "sim_time": np.float64(200.0),
+        "time_step": np.float64(1 / 100),
+    }
+    start_y = sim_params["start_loc_y"] / 50
+    angle = np.radians(44.0)
+    res = fastsim.simulate(**{
+        **sim_params,
+        "aim_dir_x": np.float64(np.cos(angle)),
+        "aim_dir_y": np.float64(np.sin(angle)),
+    })
+    # Range at 44 degrees, the last point above the start height.
+    max_x = res[0][np.nonzero(res[1] >= start_y)[0][-1]]
+
+    angles = fastsim.solve_aim_angles(
+        np.array([max_x, 1.1 * max_x]), np.array([start_y, start_y]),
+        **zeroing_params(sim_params))
+    assert 0.0 < angles[0] <= np.pi / 4
+    assert height_at(
+        sim_params, angles[0], Integrator.EULER, max_x) == pytest.approx(
+        start_y, abs=1e-3)
+    assert np.isnan(angles[1])
+
+
+def test_solve_aim_angles_max_iter():
+    target_x = np.array([25.0, 100.0, 300.0, 500.0, 800.0])
+    target_y = np.array([0.0, 2.0, -5.0, 0.0, 20.0])
+    params = zeroing_params(sim_params_1)
+    angles = fastsim.solve_aim_angles(target_x, target_y, **params)
+    assert not np.isnan(angles).any()
+
+    # Targets not hit within tol after max_iter iterations are NaN.
+    assert np.isnan(fastsim.solve_aim_angles(
+        target_x, target_y, **params, max_iter=np.int64(0))).all()
+    # The first iteration is a secant step, which is enough for the
+    # nearer targets.
+    angles_1 = fastsim.solve_aim_angles(
+        target_x, target_y, **params, max_iter=np.int64(1))
+    np.testing.assert_allclose(angles_1[:4], angles[:4], rtol=1e-6)
+    assert np.isnan(angles_1[4])
+
+
+def test_solve_aim_angles_invalid():
+    with pytest.raises(ValueError):
+        fastsim.solve_aim_angles(
+            np.array([100.0]), np.array([0.0, 1.0]),
+            **zeroing_params(sim_params_1))
+    with pytest.raises(ValueError):
+        fastsim.solve_aim_angles(
+            np.array([100.0]), np.array([0.0]),
+            **{**zeroing_params(sim_params_1), "drag_func": np.int64(3)})
+
+
+def test_solve_bullet_aim_angles():
+    target_x = np.array([100.0, 200.0])
+    target_y = np.array([0.0, 0.0])
+    angles = fastsim.solve_bullet_aim_angles(
+        make_bullet(sim_params_1), target_x, target_y,
+        sim_time=5.0, time_step=1 / 500)
+    np.testing.assert_array_equal(angles, fastsim.solve_aim_angles(
+        target_x, target_y, **zeroing_params(sim_params_1)))
+    assert 0.0 < angles[0] < angles[1]